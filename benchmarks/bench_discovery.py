@@ -0,0 +1,276 @@
+"""
+Startup and capability discovery benchmarks.
+
+Generates a package of synthetic capability modules (functions, classes and
+Pydantic-parameter capabilities) in a temporary directory and measures:
+
+* cold `import uhp` time, in fresh interpreters, per discovery mode,
+  followed by importing and registering the synthetic package
+* scan throughput of `scan_for_capabilities` and `_initialize_capabilities`
+* peak memory of a full registration, via tracemalloc
+* registry lookup latency
+
+Results are written as JSON so they can be compared across releases:
+
+    python benchmarks/bench_discovery.py --modules 200 --output bench.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to sys.path so the benchmark runs from a checkout
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pydantic
+
+import uhp
+from uhp.capabilities.parallel import scan_modules_parallel
+from uhp.capabilities.registry import capability_registry
+from uhp.capabilities import scanner
+from uhp.capabilities.scanner import scan_for_capabilities
+
+PACKAGE_NAME = "uhp_bench_capabilities"
+
+MODULE_TEMPLATE = '''
+from typing import List, Optional
+from pydantic import BaseModel
+from uhp.capabilities.decorators import uhp_capability
+
+class Request{i}(BaseModel):
+    query: str
+    limit: Optional[int] = 10
+    tags: List[str] = []
+
+class Response{i}(BaseModel):
+    results: List[str]
+    count: int
+
+@uhp_capability(tags=["bench", "model"])
+def search_{i}(request: Request{i}) -> Response{i}:
+    """Searches with a Pydantic request model."""
+    return Response{i}(results=[request.query], count=1)
+
+@uhp_capability(tags=["bench"])
+def score_{i}(candidate_id: str, weight: float = 1.0, strict: bool = False) -> float:
+    """Scores a candidate."""
+    return weight
+
+@uhp_capability
+class Fetch{i}:
+    """Fetches a record."""
+    def __init__(self, record_id: str, version: int = 0):
+        self.record_id = record_id
+    def execute(self) -> dict:
+        return {{"id": self.record_id}}
+'''
+
+
+def generate_package(root: str, n_modules: int) -> List[str]:
+    """
+    Writes `n_modules` synthetic capability modules under `root` and returns their names.
+    """
+    package_dir = os.path.join(root, PACKAGE_NAME)
+    os.makedirs(package_dir, exist_ok=True)
+    with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+        f.write("")
+    names = []
+    for i in range(n_modules):
+        with open(os.path.join(package_dir, f"caps_{i}.py"), "w") as f:
+            f.write(MODULE_TEMPLATE.format(i=i))
+        names.append(f"{PACKAGE_NAME}.caps_{i}")
+    return names
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "max": ordered[-1],
+    }
+
+
+def bench_cold_import(root: str, repeats: int) -> Dict[str, Any]:
+    """
+    Times, in fresh interpreters for each discovery mode, `import uhp`, then
+    importing and registering the synthetic package generated under `root`,
+    then the first lookup.
+    """
+    script = (
+        "import importlib, pkgutil, time\n"
+        "start = time.perf_counter()\n"
+        "import uhp\n"
+        "from uhp.capabilities.registry import process_and_register_capabilities_from_module\n"
+        "imported = time.perf_counter()\n"
+        f"package = importlib.import_module({PACKAGE_NAME!r})\n"
+        "for info in pkgutil.iter_modules(package.__path__, package.__name__ + '.'):\n"
+        "    process_and_register_capabilities_from_module(importlib.import_module(info.name))\n"
+        "registered = time.perf_counter()\n"
+        "count = len(uhp.discover_capabilities())\n"
+        "print(imported - start, registered - start, time.perf_counter() - start, count)\n"
+    )
+    python_path = os.pathsep.join(p for p in (root, PROJECT_ROOT, os.environ.get("PYTHONPATH")) if p)
+    results = {}
+    for mode in ("lazy", "eager", "off"):
+        env = {**os.environ, "UHP_CAPABILITY_DISCOVERY": mode, "PYTHONPATH": python_path}
+        env.pop("UHP_CAPABILITY_MANIFEST", None)
+        import_times, registration_times, first_lookup_times = [], [], []
+        count = 0
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                                 text=True, cwd=PROJECT_ROOT, env=env).stdout.split()
+            import_times.append(float(out[0]))
+            registration_times.append(float(out[1]))
+            first_lookup_times.append(float(out[2]))
+            count = int(out[3])
+        results[mode] = {
+            "capabilities": count,
+            "import_seconds": _summary(import_times),
+            "import_and_registration_seconds": _summary(registration_times),
+            "import_and_first_lookup_seconds": _summary(first_lookup_times),
+        }
+    return results
+
+
+def bench_scan(module_names: List[str]) -> Dict[str, Any]:
+    """
+    Measures import, cold and warm scan throughput, and full registration paths.
+    """
+    start = time.perf_counter()
+    modules = [importlib.import_module(name) for name in module_names]
+    import_seconds = time.perf_counter() - start
+
+    def timed_scan() -> Tuple[float, int]:
+        start = time.perf_counter()
+        count = sum(len(scan_for_capabilities(module)) for module in modules)
+        return time.perf_counter() - start, count
+
+    cold_seconds, capability_count = timed_scan()
+    warm_seconds, _ = timed_scan()
+
+    start = time.perf_counter()
+    uhp._initialize_capabilities(modules_to_scan=modules)
+    initialize_seconds = time.perf_counter() - start
+
+    capability_registry.clear()
+    parallel = scan_modules_parallel(modules)
+
+    return {
+        "modules": len(modules),
+        "capabilities": capability_count,
+        "import_seconds": import_seconds,
+        "cold_scan_seconds": cold_seconds,
+        "cold_scan_capabilities_per_second": capability_count / cold_seconds,
+        "warm_scan_seconds": warm_seconds,
+        "warm_scan_capabilities_per_second": capability_count / warm_seconds,
+        "initialize_capabilities_seconds": initialize_seconds,
+        "parallel_thread_scan_seconds": parallel.total_seconds,
+    }
+
+
+def bench_memory(module_names: List[str]) -> Dict[str, Any]:
+    """
+    Measures peak traced memory of registering every synthetic module. The
+    model schema cache is emptied first, so the schemas generated by
+    `bench_scan` are regenerated and counted.
+    """
+    modules = [importlib.import_module(name) for name in module_names]
+    capability_registry.clear()
+    scanner._model_schema_cache.clear()
+    tracemalloc.start()
+    uhp._initialize_capabilities(modules_to_scan=modules)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"registered_bytes": current, "peak_bytes": peak}
+
+
+def bench_lookups(iterations: int) -> Dict[str, Any]:
+    """
+    Measures per-call latency of registry lookups, in nanoseconds.
+    """
+    ids = [cap.id for cap in capability_registry.describe_all()]
+
+    def per_call_ns(fn, args: List[Any]) -> Dict[str, float]:
+        samples = []
+        for i in range(iterations):
+            arg = args[i % len(args)]
+            start = time.perf_counter_ns()
+            fn(arg)
+            samples.append(float(time.perf_counter_ns() - start))
+        return _summary(samples)
+
+    return {
+        "get_ns": per_call_ns(capability_registry.get, ids),
+        "find_by_input_property_ns": per_call_ns(capability_registry.find_by_input_property, ["candidate_id"]),
+        "find_by_tag_ns": per_call_ns(capability_registry.find_by_tag, ["model"]),
+        "find_by_id_prefix_ns": per_call_ns(capability_registry.find_by_id_prefix, ["search_1"]),
+        "catalog_json_ns": per_call_ns(lambda _: capability_registry.catalog_json(), [None]),
+    }
+
+
+def run(n_modules: int, import_repeats: int, lookup_iterations: int) -> Dict[str, Any]:
+    """
+    Runs every benchmark and returns the results as a JSON-serializable dict.
+    """
+    with tempfile.TemporaryDirectory(prefix="uhp-bench-") as root:
+        module_names = generate_package(root, n_modules)
+        sys.path.insert(0, root)
+        try:
+            results = {
+                "cold_import": bench_cold_import(root, import_repeats),
+                "scan": bench_scan(module_names),
+                "memory": bench_memory(module_names),
+                "lookups": bench_lookups(lookup_iterations),
+            }
+        finally:
+            sys.path.remove(root)
+            for name in [m for m in sys.modules if m.startswith(PACKAGE_NAME)]:
+                del sys.modules[name]
+            capability_registry.clear()
+    return {
+        "meta": {
+            "uhp_version": uhp.__version__,
+            "pydantic_version": pydantic.VERSION,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "modules": n_modules,
+            "import_repeats": import_repeats,
+            "lookup_iterations": lookup_iterations,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark UHP startup and capability discovery.")
+    parser.add_argument("--modules", type=int, default=100, help="Number of synthetic capability modules.")
+    parser.add_argument("--import-repeats", type=int, default=5, help="Fresh interpreters per import benchmark.")
+    parser.add_argument("--lookup-iterations", type=int, default=10000, help="Calls per lookup benchmark.")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout.")
+    args = parser.parse_args(argv)
+
+    report = run(args.modules, args.import_repeats, args.lookup_iterations)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -68,7 +68,7 @@ if __name__ == "__main__":
     print("--- Demonstrating UHP Capability Discovery ---")
 
     # Ensure the registry is clear for this example run
-    capability_registry._registry.clear()
+    capability_registry.clear()
 
     # Get a reference to this module itself
     current_module = sys.modules[__name__]
@@ -92,21 +92,19 @@ if __name__ == "__main__":
     else:
         print("\nNo UHP capabilities discovered.")
 
-    # Example of using a discovered capability (conceptually)
-    print("\n--- Demonstrating conceptual usage of a discovered capability ---")
+    # Example of invoking a discovered capability
+    print("\n--- Demonstrating invocation of a discovered capability ---")
     search_cap_found = next((cap for cap in capabilities if cap.id == "search_documents"), None)
     if search_cap_found:
         print(f"Found search_documents capability. Input schema: {json.dumps(search_cap_found.input_schema, indent=2)}") # Use json.dumps
         # In a real agent, it would use this schema to construct a valid input
-        # and then dynamically call the underlying function/class.
-        # For this example, we just show constructing input based on the schema.
+        # and then invoke the capability through the registry by its ID.
         try:
             sample_input = SearchQuery(keyword="UHP", max_results=5)
             print(f"Sample input for search_documents: {sample_input.model_dump_json(indent=2)}")
-            # Conceptual call: result = search_cap_found.execute(sample_input)
-            # Actual execution requires reflection and is beyond this example's scope.
-            print("Conceptual execution of search_documents with sample input would occur here.")
+            result = capability_registry.invoke("search_documents", {"query": sample_input.model_dump()})
+            print(f"Result of search_documents: {result.model_dump_json(indent=2)}")
         except Exception as e:
-            print(f"Error creating sample input: {e}")
+            print(f"Error invoking search_documents: {e}")
     else:
         print("search_documents capability not found.")
\ No newline at end of file
@@ -25,14 +25,22 @@ def demonstrate_employer_agent():
     print("\n")
     print(f"Original Candidate Profile: {candidate_original.model_dump_json(indent=2)}")
 
-    # Anonymize profile for employer review (e.g., PRIVATE visibility)
-    # The filter_visible_fields function currently returns an empty dict for PRIVATE visibility
-    # In a more advanced implementation, it would selectively hide fields.
-    anonymized_profile = filter_visible_fields(candidate_original, VisibilityLevel.PRIVATE, None)
+    # PRIVATE visibility hides every field
+    private_profile = filter_visible_fields(candidate_original, VisibilityLevel.PRIVATE, None)
 
     print("\n")
-    print(f"Anonymized Profile for Employer Review (PRIVATE visibility): {anonymized_profile}")
-    assert "email" not in anonymized_profile # Assuming email is always private
+    print(f"Private Profile (PRIVATE visibility): {private_profile}")
+    assert "email" not in private_profile # Assuming email is always private
+
+    # ANONYMIZED visibility keeps what an employer needs to assess fit, without identity.
+    # candidate_id and email are replaced by stable pseudonyms, so records can still be correlated.
+    anonymized_profile = filter_visible_fields(candidate_original, VisibilityLevel.ANONYMIZED, None)
+
+    print("\n")
+    print(f"Anonymized Profile for Employer Review (ANONYMIZED visibility): {anonymized_profile}")
+    assert anonymized_profile["email"] != candidate_original.email
+    assert "first_name" not in anonymized_profile
+    assert "skills" in anonymized_profile
 
     # Simulate public visibility (all fields visible)
     public_profile = filter_visible_fields(candidate_original, VisibilityLevel.PUBLIC, None)
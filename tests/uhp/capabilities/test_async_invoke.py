@@ -0,0 +1,79 @@
+import pytest
+import asyncio
+import types
+
+from uhp.capabilities.decorators import uhp_capability
+from uhp.capabilities.registry import capability_registry, process_and_register_capabilities_from_module
+from uhp.errors import CapabilityExecutionError, CapabilityNotFound, InvalidCapabilityPayload
+
+
+@pytest.fixture
+def async_capabilities():
+    state = {"running": 0, "peak": 0}
+
+    @uhp_capability
+    async def slow_echo(value: int) -> int:
+        """Echoes a value after yielding to the event loop."""
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01 * (5 - value % 5))
+        state["running"] -= 1
+        return value
+
+    @uhp_capability
+    def double(value: int) -> int:
+        """Doubles a value."""
+        return value * 2
+
+    @uhp_capability
+    def explode() -> None:
+        """Always fails."""
+        raise RuntimeError("boom")
+
+    module = types.ModuleType("async_capabilities")
+    module.slow_echo, module.double, module.explode = slow_echo, double, explode
+
+    capability_registry.clear()
+    process_and_register_capabilities_from_module(module)
+    yield state
+    capability_registry.clear()
+
+
+def test_ainvoke_runs_coroutine_and_sync_targets(async_capabilities):
+    async def main():
+        return await capability_registry.ainvoke("slow_echo", {"value": 3}), \
+            await capability_registry.ainvoke("double", {"value": 3})
+
+    assert asyncio.run(main()) == (3, 6)
+
+
+def test_invoke_many_preserves_order_and_bounds_concurrency(async_capabilities):
+    requests = [("slow_echo", {"value": i}) for i in range(20)] + [("double", {"value": 21})]
+
+    results = capability_registry.invoke_many(requests, concurrency=4)
+
+    assert results == list(range(20)) + [42]
+    assert async_capabilities["peak"] <= 4
+
+
+def test_invoke_many_returns_structured_errors_without_aborting(async_capabilities):
+    results = capability_registry.invoke_many([
+        ("double", {"value": 1}),
+        ("explode", None),
+        ("double", {"value": "not a number"}),
+        ("missing", {}),
+        ("double", {"value": 2}),
+    ])
+
+    assert results[0] == 2
+    assert isinstance(results[1], CapabilityExecutionError)
+    assert results[1].error_type == "RuntimeError"
+    assert results[1].error_message == "boom"
+    assert isinstance(results[2], InvalidCapabilityPayload)
+    assert isinstance(results[3], CapabilityNotFound)
+    assert results[4] == 4
+
+
+def test_invoke_many_rejects_non_positive_concurrency(async_capabilities):
+    with pytest.raises(ValueError, match="concurrency"):
+        capability_registry.invoke_many([("double", {"value": 1})], concurrency=0)
@@ -12,7 +12,7 @@ from uhp.capabilities import uhp_capability # Import for decorator usage in test
 # Fixture to clear the registry for each test
 @pytest.fixture(autouse=True)
 def clear_capability_registry():
-    capability_registry._registry.clear()
+    capability_registry.clear()
     yield
 
 def test_capability_registry_register_and_get():
@@ -69,3 +69,148 @@ def test_public_discovery_api_function_returns_registered_capabilities():
     assert len(discovered) == 2
     assert cap1 in discovered
     assert cap2 in discovered
+
+def _indexed_capability(cap_id, properties=(), output_schema=None, tags=()):
+    return Capability(
+        id=cap_id,
+        description=f"Indexed {cap_id}",
+        input_schema={"type": "object", "properties": {name: {"type": "string"} for name in properties}},
+        output_schema=output_schema or {"type": "null"},
+        tags=list(tags),
+    )
+
+def test_capability_registry_secondary_indexes():
+    search = _indexed_capability("jobs.search", ["query", "limit"], {"title": "SearchResult", "type": "object"}, ["search"])
+    apply = _indexed_capability("jobs.apply", ["job_id"], {"type": "boolean"}, ["write"])
+    status = _indexed_capability("system.status", [], {"type": "string"}, ["search"])
+    for cap in (search, apply, status):
+        capability_registry.register(cap)
+
+    assert capability_registry.find_by_input_property("query") == [search]
+    assert capability_registry.find_by_input_property("missing") == []
+    assert capability_registry.find_by_output("SearchResult") == [search]
+    assert capability_registry.find_by_output("boolean") == [apply]
+    assert capability_registry.find_by_tag("search") == [search, status]
+    assert capability_registry.find_by_id_prefix("jobs.") == [apply, search]
+    assert capability_registry.find_by_id_prefix("") == [apply, search, status]
+    assert capability_registry.find_by_id_prefix("nope") == []
+
+def test_capability_registry_reregistration_updates_indexes():
+    capability_registry.register(_indexed_capability("cap1", ["old_field"], tags=["old"]))
+    replacement = _indexed_capability("cap1", ["new_field"], tags=["new"])
+    capability_registry.register(replacement)
+
+    assert capability_registry.find_by_input_property("old_field") == []
+    assert capability_registry.find_by_tag("old") == []
+    assert capability_registry.find_by_input_property("new_field") == [replacement]
+    assert capability_registry.find_by_id_prefix("cap") == [replacement]
+
+def test_capability_registry_clear_empties_indexes():
+    capability_registry.register(_indexed_capability("cap1", ["field"], tags=["tag"]))
+    capability_registry.clear()
+
+    assert capability_registry.describe_all() == []
+    assert capability_registry.find_by_input_property("field") == []
+    assert capability_registry.find_by_tag("tag") == []
+    assert capability_registry.find_by_id_prefix("cap") == []
+
+def test_capability_registry_lookups_run_alongside_registration():
+    import threading
+    errors = []
+    done = threading.Event()
+
+    def lookup():
+        try:
+            while not done.is_set():
+                capability_registry.find_by_tag("tag")
+                capability_registry.find_by_input_property("field")
+                capability_registry.find_by_id_prefix("cap")
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=lookup) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(2000):
+            capability_registry.register(_indexed_capability(f"cap{i % 50}", ["field", f"field{i}"], tags=["tag"]))
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert len(capability_registry.find_by_tag("tag")) == 50
+    assert len(capability_registry.find_by_id_prefix("cap")) == 50
+
+def test_capability_registry_bulk_registration_keeps_lookups_working():
+    capabilities = [_indexed_capability(f"bulk{i}", ["query"], output_schema={"type": "object"}, tags=["bulk"])
+                    for i in range(5000)]
+    for cap in capabilities:
+        capability_registry.register(cap)
+    capability_registry.register(_indexed_capability("bulk42", ["other"], tags=["moved"]))
+
+    assert len(capability_registry.find_by_output("object")) == 4999
+    assert len(capability_registry.find_by_input_property("query")) == 4999
+    assert capability_registry.find_by_tag("moved")[0].id == "bulk42"
+    assert capability_registry.find_by_id_prefix("bulk499")[-1] is capabilities[4999]
+
+def test_uhp_capability_decorator_tags_are_scanned():
+    import types
+    from uhp.capabilities.scanner import scan_for_capabilities
+
+    @uhp_capability(tags=["search", "jobs"])
+    def tagged_capability(query: str) -> str:
+        """A tagged capability."""
+        return query
+
+    module = types.ModuleType("tagged_module")
+    module.tagged_capability = tagged_capability
+    capabilities = scan_for_capabilities(module)
+
+    assert capabilities[0].tags == ["search", "jobs"]
+
+def test_capability_registry_catalog_is_cached_until_registration_changes():
+    import json
+    cap1 = Capability(id="cap1", description="Catalog Cap 1", input_schema={}, output_schema={})
+    capability_registry.clear()
+    capability_registry.register(cap1)
+
+    body = capability_registry.catalog_json()
+    etag = capability_registry.catalog_etag()
+    assert json.loads(body) == {"capabilities": [cap1.model_dump(mode="json")]}
+    assert capability_registry.catalog_json() is body
+    assert capability_registry.get_catalog(etag) == (etag, None)
+    assert capability_registry.get_catalog('"stale"') == (etag, body)
+
+    cap2 = Capability(id="cap2", description="Catalog Cap 2", input_schema={}, output_schema={})
+    capability_registry.register(cap2)
+    new_etag, new_body = capability_registry.get_catalog(etag)
+    assert new_etag != etag
+    assert [cap["id"] for cap in json.loads(new_body)["capabilities"]] == ["cap1", "cap2"]
+
+def test_capability_registry_streams_ndjson_catalog():
+    import json
+    capability_registry.clear()
+    caps = [Capability(id=f"cap{i}", description=f"Stream Cap {i}", input_schema={}, output_schema={}) for i in range(3)]
+    for cap in caps:
+        capability_registry.register(cap)
+
+    lines = list(capability_registry.iter_catalog_ndjson())
+
+    assert all(line.endswith(b"\n") for line in lines)
+    assert [Capability.model_validate(json.loads(line)) for line in lines] == caps
+
+def test_capability_registry_ndjson_catalog_leads_with_hoisted_defs():
+    import json
+    person = {"title": "Person", "type": "object", "properties": {"name": {"type": "string"}}}
+    capability_registry.hoist_schemas = True
+    try:
+        capability_registry.register(Capability(id="make_person", description="Makes a person", input_schema={}, output_schema=person))
+        lines = [json.loads(line) for line in capability_registry.iter_catalog_ndjson()]
+    finally:
+        capability_registry.hoist_schemas = False
+
+    assert lines[0] == {"$defs": {"Person": person}}
+    assert lines[1]["output_schema"] == {"$ref": "#/$defs/Person"}
+    assert len(lines) == 2
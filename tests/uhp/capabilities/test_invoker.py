@@ -0,0 +1,98 @@
+import pytest
+import sys
+import importlib.util
+
+from uhp.capabilities.registry import capability_registry, process_and_register_capabilities_from_module
+from uhp.errors import CapabilityNotFound, InvalidCapabilityPayload
+from uhp.models.capability import Capability
+
+
+@pytest.fixture
+def invocable_capability_module(tmp_path):
+    module_content = """
+from uhp.capabilities.decorators import uhp_capability
+from pydantic import BaseModel
+from typing import Optional
+
+class Query(BaseModel):
+    keyword: str
+    limit: Optional[int] = 10
+
+@uhp_capability
+def search(query: Query, exact: bool = False) -> str:
+    '''Searches.'''
+    return f"{query.keyword}:{query.limit}:{exact}"
+
+@uhp_capability
+class Greeter:
+    '''Greets.'''
+    def __init__(self, name: str):
+        self.name = name
+    def execute(self, greeting: str = "Hello") -> str:
+        return f"{greeting}, {self.name}"
+"""
+    module_path = tmp_path / "invocable_capabilities.py"
+    module_path.write_text(module_content)
+    sys.path.insert(0, str(tmp_path))
+
+    spec = importlib.util.spec_from_file_location("invocable_capabilities", module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    capability_registry.clear()
+    yield module
+
+    capability_registry.clear()
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop("invocable_capabilities", None)
+
+
+def test_invoke_function_validates_and_binds_payload(invocable_capability_module):
+    process_and_register_capabilities_from_module(invocable_capability_module)
+
+    assert capability_registry.invoke("search", {"query": {"keyword": "uhp"}}) == "uhp:10:False"
+    assert capability_registry.invoke("search", {"query": {"keyword": "uhp", "limit": "3"}, "exact": True}) == "uhp:3:True"
+
+
+def test_invoke_class_splits_payload_between_init_and_execute(invocable_capability_module):
+    process_and_register_capabilities_from_module(invocable_capability_module)
+
+    assert capability_registry.invoke("Greeter", {"name": "Ada"}) == "Hello, Ada"
+    assert capability_registry.invoke("Greeter", {"name": "Ada", "greeting": "Hi"}) == "Hi, Ada"
+
+
+def test_invoke_rejects_invalid_payload(invocable_capability_module):
+    process_and_register_capabilities_from_module(invocable_capability_module)
+
+    with pytest.raises(InvalidCapabilityPayload) as excinfo:
+        capability_registry.invoke("search", {"query": {"limit": 1}, "unexpected": 1})
+    assert excinfo.value.capability_id == "search"
+    assert {error["type"] for error in excinfo.value.errors} == {"missing", "extra_forbidden"}
+
+
+def test_invoke_compiles_once_per_registration(invocable_capability_module):
+    process_and_register_capabilities_from_module(invocable_capability_module)
+
+    invoker = capability_registry.get_invoker("search")
+    capability_registry.invoke("search", {"query": {"keyword": "a"}})
+    assert capability_registry.get_invoker("search") is invoker
+
+
+def test_invoke_resolves_target_for_descriptor_registered_without_one(invocable_capability_module):
+    from uhp.capabilities.scanner import scan_for_capabilities
+    for cap in scan_for_capabilities(invocable_capability_module):
+        capability_registry.register(cap, module_name="invocable_capabilities")
+
+    assert capability_registry.invoke("Greeter", {"name": "Bo"}) == "Hello, Bo"
+
+
+def test_invoke_unknown_or_descriptor_only_capability_raises():
+    capability_registry.clear()
+    capability_registry.register(Capability(id="described_only", description="No target", input_schema={}, output_schema={}))
+
+    with pytest.raises(CapabilityNotFound):
+        capability_registry.invoke("missing")
+    with pytest.raises(CapabilityNotFound):
+        capability_registry.invoke("described_only")
+    capability_registry.clear()
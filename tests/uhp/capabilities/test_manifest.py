@@ -0,0 +1,108 @@
+import pytest
+import os
+import sys
+import json
+
+from uhp.capabilities import manifest as manifest_module
+from uhp.capabilities.manifest import CapabilityManifest, load_module_capabilities, main
+
+MODULE_CONTENT = """
+from uhp.capabilities.decorators import uhp_capability
+
+@uhp_capability
+def cached_func(name: str) -> str:
+    '''A capability served from the manifest.'''
+    return name
+"""
+
+
+@pytest.fixture
+def cached_capability_module(tmp_path):
+    module_path = tmp_path / "manifest_capabilities_module.py"
+    module_path.write_text(MODULE_CONTENT)
+    sys.path.insert(0, str(tmp_path))
+
+    yield module_path
+
+    sys.path.remove(str(tmp_path))
+    if "manifest_capabilities_module" in sys.modules:
+        del sys.modules["manifest_capabilities_module"]
+
+
+@pytest.fixture
+def count_scans(monkeypatch):
+    calls = []
+    original = manifest_module.scan_for_capabilities
+
+    def counting_scan(module):
+        calls.append(module.__name__)
+        return original(module)
+
+    monkeypatch.setattr(manifest_module, "scan_for_capabilities", counting_scan)
+    return calls
+
+
+def test_manifest_hit_skips_scanning_and_import(tmp_path, cached_capability_module, count_scans):
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = CapabilityManifest.load(manifest_path)
+    first = load_module_capabilities("manifest_capabilities_module", manifest)
+    manifest.save()
+    assert count_scans == ["manifest_capabilities_module"]
+
+    del sys.modules["manifest_capabilities_module"]
+    warm = CapabilityManifest.load(manifest_path)
+    second = load_module_capabilities("manifest_capabilities_module", warm)
+
+    assert second == first
+    assert second[0].id == "cached_func"
+    assert count_scans == ["manifest_capabilities_module"]
+    assert "manifest_capabilities_module" not in sys.modules
+
+
+def test_manifest_entry_invalidated_when_module_changes(tmp_path, cached_capability_module, count_scans):
+    manifest = CapabilityManifest(str(tmp_path / "manifest.json"))
+    load_module_capabilities("manifest_capabilities_module", manifest)
+
+    cached_capability_module.write_text(MODULE_CONTENT.replace("cached_func", "renamed_func"))
+    del sys.modules["manifest_capabilities_module"]
+    capabilities = load_module_capabilities("manifest_capabilities_module", manifest)
+
+    assert [cap.id for cap in capabilities] == ["renamed_func"]
+    assert len(count_scans) == 2
+
+
+def test_manifest_touched_but_unchanged_module_is_still_a_hit(tmp_path, cached_capability_module, count_scans):
+    manifest = CapabilityManifest(str(tmp_path / "manifest.json"))
+    load_module_capabilities("manifest_capabilities_module", manifest)
+
+    stat = os.stat(cached_capability_module)
+    os.utime(cached_capability_module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_module_capabilities("manifest_capabilities_module", manifest)
+
+    assert len(count_scans) == 1
+
+
+def test_manifest_discarded_on_pydantic_version_change(tmp_path, cached_capability_module, monkeypatch):
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = CapabilityManifest(manifest_path)
+    load_module_capabilities("manifest_capabilities_module", manifest)
+    manifest.save()
+
+    monkeypatch.setattr(manifest_module.pydantic, "VERSION", "0.0.0")
+    reloaded = CapabilityManifest.load(manifest_path)
+
+    assert reloaded.module_names() == []
+
+
+def test_cli_rebuild_writes_manifest(tmp_path, cached_capability_module):
+    manifest_path = str(tmp_path / "cli_manifest.json")
+
+    assert main(["rebuild", "manifest_capabilities_module", "--path", manifest_path]) == 0
+
+    with open(manifest_path) as f:
+        data = json.load(f)
+    entry = data["modules"]["manifest_capabilities_module"]
+    assert entry["capabilities"][0]["id"] == "cached_func"
+
+    assert main(["clear", "--path", manifest_path]) == 0
+    assert not os.path.exists(manifest_path)
@@ -0,0 +1,77 @@
+import pytest
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from uhp.capabilities.registry import capability_registry
+from uhp.capabilities.parallel import scan_modules_parallel
+
+
+@pytest.fixture
+def parallel_capability_modules(tmp_path):
+    names = []
+    for i in range(3):
+        name = f"parallel_capabilities_{i}"
+        (tmp_path / f"{name}.py").write_text(f"""
+from uhp.capabilities.decorators import uhp_capability
+
+@uhp_capability
+def shared_func() -> int:
+    '''Defined in every module; the last module wins.'''
+    return {i}
+
+@uhp_capability
+def func_{i}(value: str) -> str:
+    '''Capability {i}.'''
+    return value
+""")
+        names.append(name)
+    sys.path.insert(0, str(tmp_path))
+
+    yield names
+
+    sys.path.remove(str(tmp_path))
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture(autouse=True)
+def clear_capability_registry():
+    capability_registry.clear()
+    yield
+    capability_registry.clear()
+
+
+def test_scan_modules_parallel_merges_in_input_order(parallel_capability_modules):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = scan_modules_parallel(
+            parallel_capability_modules + ["no_such_capability_module"],
+            executor=executor,
+        )
+
+    assert [r.module_name for r in result.modules] == parallel_capability_modules + ["no_such_capability_module"]
+    assert all(r.duration_seconds >= 0 for r in result.modules)
+
+    assert len(result.errors) == 1
+    error = result.errors[0]
+    assert error.module_name == "no_such_capability_module"
+    assert error.error_type == "ModuleNotFoundError"
+    assert error.capabilities == []
+
+    assert capability_registry.get("func_0") is not None
+    assert capability_registry.get("func_2") is not None
+    assert capability_registry.invoke("shared_func") == 2
+    assert [cap.id for cap in result.capabilities] == [
+        "func_0", "shared_func", "func_1", "shared_func", "func_2", "shared_func"
+    ]
+
+
+def test_scan_modules_parallel_accepts_module_objects_and_process_pool(parallel_capability_modules):
+    import importlib
+    modules = [importlib.import_module(name) for name in parallel_capability_modules]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = scan_modules_parallel(modules, executor=executor, register=False)
+
+    assert result.errors == []
+    assert [r.module_name for r in result.modules] == parallel_capability_modules
+    assert capability_registry._registry == {}
@@ -91,7 +91,7 @@ def test_registration_process_converts_and_registers_capabilities(dummy_capabili
     into Capability Pydantic models and register them in the global capability_registry.
     """
     # Ensure the registry is clean before the test
-    capability_registry._registry.clear()
+    capability_registry.clear()
 
     from uhp.capabilities.registry import process_and_register_capabilities_from_module
 
@@ -134,7 +134,7 @@ def test_pydantic_schema_generation_for_capabilities(pydantic_capability_module:
     Test that the scanner correctly generates Pydantic JSON schemas for capabilities
     that use Pydantic models as input/output types.
     """
-    capability_registry._registry.clear()
+    capability_registry.clear()
     from uhp.capabilities.registry import process_and_register_capabilities_from_module
 
     process_and_register_capabilities_from_module(pydantic_capability_module)
@@ -0,0 +1,103 @@
+import pytest
+import os
+import sys
+import importlib
+
+from uhp.capabilities.registry import capability_registry, process_and_register_capabilities_from_module
+from uhp.capabilities.reloader import CapabilityReloader
+
+MODULE_TEMPLATE = """
+from uhp.capabilities.decorators import uhp_capability
+
+@uhp_capability
+def {name}(value: str) -> str:
+    '''{doc}'''
+    return value
+"""
+
+
+def _write_module(path, name, doc):
+    stat = os.stat(path) if path.exists() else None
+    path.write_text(MODULE_TEMPLATE.format(name=name, doc=doc))
+    if stat is not None:
+        # Guarantee a visible mtime change even on coarse-grained filesystems.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def reloadable_modules(tmp_path):
+    paths = {}
+    for module_name, cap_name in (("reload_module_a", "cap_a"), ("reload_module_b", "cap_b")):
+        path = tmp_path / f"{module_name}.py"
+        _write_module(path, cap_name, "Original.")
+        paths[module_name] = path
+    sys.path.insert(0, str(tmp_path))
+
+    capability_registry.clear()
+    for module_name in paths:
+        process_and_register_capabilities_from_module(importlib.import_module(module_name))
+
+    yield paths
+
+    sys.path.remove(str(tmp_path))
+    for module_name in paths:
+        sys.modules.pop(module_name, None)
+    capability_registry.clear()
+
+
+def test_reloader_tracks_registered_modules_and_ignores_unchanged(reloadable_modules):
+    reloader = CapabilityReloader()
+
+    assert {"reload_module_a", "reload_module_b"} <= set(capability_registry.module_names())
+    assert reloader.changed_modules() == []
+    assert reloader.poll() == []
+
+
+def test_reloader_swaps_only_changed_module(reloadable_modules):
+    reloader = CapabilityReloader(["reload_module_a", "reload_module_b"])
+    cap_b = capability_registry.get("cap_b")
+    registry = capability_registry._registry
+
+    _write_module(reloadable_modules["reload_module_a"], "cap_a_renamed", "Edited.")
+    results = reloader.poll()
+
+    # Only the changed module's entries are swapped; the registry is not rebuilt.
+    assert capability_registry._registry is registry
+    assert capability_registry.find_by_input_property("value") == [cap_b, capability_registry.get("cap_a_renamed")]
+
+    assert [r.module_name for r in results] == ["reload_module_a"]
+    assert results[0].ok
+    assert capability_registry.get("cap_a") is None
+    assert capability_registry.get("cap_a_renamed").description == "Edited."
+    assert capability_registry.get("cap_b") is cap_b
+    assert capability_registry.find_by_id_prefix("cap_a") == [capability_registry.get("cap_a_renamed")]
+    assert reloader.poll() == []
+
+
+def test_reloader_keeps_previous_capabilities_when_module_breaks(reloadable_modules):
+    reloader = CapabilityReloader(["reload_module_a"])
+    path = reloadable_modules["reload_module_a"]
+    stat = os.stat(path)
+    path.write_text("def broken(:\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    results = reloader.poll()
+
+    assert len(results) == 1
+    assert results[0].error_type == "SyntaxError"
+    assert capability_registry.get("cap_a").description == "Original."
+    assert reloader.poll() == []
+
+
+def test_reloading_module_keeps_id_reregistered_by_another_module(reloadable_modules):
+    reloader = CapabilityReloader(["reload_module_a", "reload_module_b"])
+    _write_module(reloadable_modules["reload_module_b"], "cap_a", "From b.")
+    reloader.poll()
+    assert capability_registry.get("cap_a").description == "From b."
+
+    _write_module(reloadable_modules["reload_module_a"], "cap_a_renamed", "Edited.")
+    reloader.poll()
+
+    assert capability_registry.get("cap_a").description == "From b."
+    assert capability_registry.get("cap_a_renamed").description == "Edited."
+    assert "cap_a" not in capability_registry._module_ids["reload_module_a"]
@@ -118,3 +118,146 @@ def test_scanner_finds_all_decorated_capabilities(dummy_capability_module):
     }
     # For class, output schema is from its 'execute' method
     assert class_cap.output_schema == {'type': 'string'} # `execute` returns str
+
+
+@pytest.fixture
+def shared_model_capability_module(tmp_path):
+    module_content = """
+from uhp.capabilities.decorators import uhp_capability
+from pydantic import BaseModel
+
+class Address(BaseModel):
+    city: str
+
+class Person(BaseModel):
+    name: str
+    address: Address
+
+@uhp_capability
+def create_person(person: Person) -> Person:
+    '''Creates a person.'''
+    return person
+
+@uhp_capability
+def update_person(person: Person, note: str = "") -> Person:
+    '''Updates a person.'''
+    return person
+"""
+    module_path = tmp_path / "shared_model_capabilities.py"
+    module_path.write_text(module_content)
+    sys.path.insert(0, str(tmp_path))
+
+    spec = importlib.util.spec_from_file_location("shared_model_capabilities", module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    yield module
+
+    sys.path.remove(str(tmp_path))
+    if "shared_model_capabilities" in sys.modules:
+        del sys.modules["shared_model_capabilities"]
+
+
+def test_scanner_generates_each_model_schema_once(shared_model_capability_module, monkeypatch):
+    """
+    Test that a model shared by several capabilities has its schema generated once.
+    """
+    from uhp.capabilities.scanner import scan_for_capabilities
+
+    person = shared_model_capability_module.Person
+    calls = []
+    original = person.model_json_schema.__func__
+
+    def counting_schema(cls, *args, **kwargs):
+        calls.append(cls)
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(person, "model_json_schema", classmethod(counting_schema))
+
+    capabilities = scan_for_capabilities(shared_model_capability_module)
+
+    assert len(capabilities) == 2
+    assert calls == [person]
+    for cap in capabilities:
+        assert cap.input_schema["properties"]["person"]["title"] == "Person"
+        assert cap.output_schema["title"] == "Person"
+
+
+def test_scanner_hoists_shared_models_into_defs(shared_model_capability_module):
+    """
+    Test that with a schema_defs dict, model schemas (and their nested models)
+    are hoisted and referenced by $ref.
+    """
+    from uhp.capabilities.scanner import scan_for_capabilities
+
+    schema_defs = {}
+    capabilities = scan_for_capabilities(shared_model_capability_module, schema_defs)
+
+    for cap in capabilities:
+        assert cap.input_schema["properties"]["person"] == {"$ref": "#/$defs/Person"}
+        assert cap.output_schema == {"$ref": "#/$defs/Person"}
+
+    assert set(schema_defs) == {"Person", "Address"}
+    assert "$defs" not in schema_defs["Person"]
+    assert schema_defs["Person"]["properties"]["address"] == {"$ref": "#/$defs/Address"}
+    assert schema_defs["Address"]["properties"]["city"]["type"] == "string"
+
+
+def test_scanner_returns_independent_copies_of_cached_schemas(shared_model_capability_module):
+    """
+    Test that modifying a scanned capability's schema does not leak into later scans.
+    """
+    from uhp.capabilities.scanner import scan_for_capabilities
+
+    first = scan_for_capabilities(shared_model_capability_module)
+    first[0].output_schema["properties"]["name"]["type"] = "integer"
+    first[0].input_schema["properties"]["person"]["title"] = "Changed"
+
+    second = scan_for_capabilities(shared_model_capability_module)
+    for cap in second:
+        assert cap.output_schema["properties"]["name"]["type"] == "string"
+        assert cap.input_schema["properties"]["person"]["title"] == "Person"
+
+
+def test_registry_hoists_schemas_on_every_discovery_path(shared_model_capability_module):
+    """
+    Test that with hoisting enabled, capabilities registered from inline scans
+    (as the manifest does) or a parallel scan get the same $ref schemas and
+    $defs as ones registered with process_and_register_capabilities_from_module.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from uhp.capabilities.registry import capability_registry, process_and_register_capabilities_from_module
+    from uhp.capabilities.parallel import scan_modules_parallel
+    from uhp.capabilities.scanner import scan_for_capabilities
+
+    def register_inline():
+        for cap in scan_for_capabilities(shared_model_capability_module):
+            capability_registry.register(cap, module_name=shared_model_capability_module.__name__)
+
+    def register_parallel():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scan_modules_parallel([shared_model_capability_module], executor=executor)
+
+    def register_module():
+        process_and_register_capabilities_from_module(shared_model_capability_module)
+
+    results = []
+    try:
+        for register in (register_module, register_inline, register_parallel):
+            capability_registry.clear()
+            capability_registry.hoist_schemas = True
+            register()
+            results.append((capability_registry.describe_all(), capability_registry.describe_schema_defs()))
+    finally:
+        capability_registry.hoist_schemas = False
+        capability_registry.clear()
+
+    expected_caps, expected_defs = results[0]
+    assert set(expected_defs) == {"Person", "Address"}
+    for cap in expected_caps:
+        assert cap.output_schema == {"$ref": "#/$defs/Person"}
+        assert cap.input_schema["properties"]["person"] == {"$ref": "#/$defs/Person"}
+    for caps, defs in results[1:]:
+        assert caps == expected_caps
+        assert defs == expected_defs
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from uhp.enums.consent_state import ConsentState
+from uhp.models.consent import Consent
+from uhp.privacy.consent_store import ConsentStore
+from uhp.privacy.expiry import ConsentExpiryScheduler
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _consent(consent_id, purpose, state=ConsentState.GRANTED, target_id="emp1", **kwargs):
+    return Consent(consent_id=consent_id, actor_id="cand1", target_id=target_id, state=state,
+                   purpose=purpose, granted_at=NOW, **kwargs)
+
+
+def test_is_allowed_is_indexed_by_pair_and_purpose():
+    store = ConsentStore([
+        _consent("c1", ["contact"]),
+        _consent("c2", ["process_application"]),
+        _consent("c3", ["contact"], state=ConsentState.DENIED, target_id="emp2"),
+        _consent("c4", None, target_id="emp3"),
+    ])
+    assert len(store) == 3
+    assert store.is_allowed("cand1", "emp1", "contact")
+    assert store.is_allowed("cand1", "emp1", "process_application")
+    assert not store.is_allowed("cand1", "emp1", "share_with_third_party")
+    assert not store.is_allowed("cand1", "emp2", "contact")
+    assert store.has_consent("cand1", "emp3")
+    assert store.purposes("cand1", "emp3") == frozenset()
+    assert store.purposes("cand1", "emp1") == frozenset({"contact", "process_application"})
+
+
+def test_incremental_grant_and_revoke():
+    store = ConsentStore([_consent("c1", ["contact", "analytics"]), _consent("c2", ["contact"])])
+
+    store.add(_consent("c1", ["analytics"], state=ConsentState.REVOKED))
+    assert store.purposes("cand1", "emp1") == frozenset({"contact"})
+
+    store.grant("c2", "cand1", "emp1", ["analytics"])
+    assert store.purposes("cand1", "emp1") == frozenset({"analytics"})
+
+    assert store.revoke("c2")
+    assert not store.revoke("c2")
+    assert not store.has_consent("cand1", "emp1")
+
+
+def test_expired_consents_leave_the_index():
+    store = ConsentStore()
+    store.add(_consent("old", ["contact"], expires_at=NOW))
+    assert "old" not in store
+
+    scheduler = ConsentExpiryScheduler(on_expire=store.revoke_many)
+    consent = _consent("c1", ["contact"], expires_at=datetime.now() + timedelta(days=1))
+    store.add(consent)
+    scheduler.schedule_consent(consent)
+    scheduler.expire_due(consent.expires_at + timedelta(seconds=1))
+    assert not store.is_allowed("cand1", "emp1", "contact")
+
+
+def test_consents_stop_allowing_once_expired():
+    expires_at = datetime.now() + timedelta(days=1)
+    later = expires_at + timedelta(seconds=1)
+    store = ConsentStore([
+        _consent("c1", ["contact", "analytics"], expires_at=expires_at),
+        _consent("c2", ["contact"]),
+    ])
+    assert store.is_allowed("cand1", "emp1", "analytics")
+
+    assert not store.is_allowed("cand1", "emp1", "analytics", now=later)
+    assert store.is_allowed("cand1", "emp1", "contact", now=later)
+    assert store.purposes("cand1", "emp1", now=later) == frozenset({"contact"})
+    assert store.is_expired("cand1", "emp1", "analytics", now=later)
+    assert not store.is_expired("cand1", "emp1", "contact", now=later)
+
+    store.revoke("c2")
+    assert not store.has_consent("cand1", "emp1", now=later)
+    assert store.is_expired("cand1", "emp1", now=later)
+
+    store.grant("c1", "cand1", "emp1", ["analytics"])
+    assert store.is_allowed("cand1", "emp1", "analytics", now=later)
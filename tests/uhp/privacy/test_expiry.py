@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from uhp.enums.consent_state import ConsentState
+from uhp.errors import ConsentExpired
+from uhp.models.consent import Consent
+from uhp.privacy.expiry import ConsentExpiryScheduler
+from uhp.privacy.purpose import assert_purpose_allowed
+from uhp.state_machines.consent import ConsentStateMachine
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_expire_due_revokes_in_expiry_order():
+    batches = []
+    scheduler = ConsentExpiryScheduler(on_expire=batches.append)
+    granted = ConsentStateMachine(ConsentState.GRANTED)
+    pending = ConsentStateMachine()
+    scheduler.schedule("c-late", NOW + timedelta(hours=2), ConsentStateMachine(ConsentState.GRANTED))
+    scheduler.schedule("c-1", NOW + timedelta(minutes=5), granted)
+    scheduler.schedule("c-2", NOW + timedelta(minutes=10), pending)
+    scheduler.schedule("c-cancelled", NOW + timedelta(minutes=1))
+    scheduler.cancel("c-cancelled")
+    # Moved later: its original heap entry is stale.
+    scheduler.schedule("c-moved", NOW + timedelta(minutes=1))
+    scheduler.schedule("c-moved", NOW + timedelta(days=1))
+
+    assert scheduler.next_expiry() == NOW + timedelta(minutes=5)
+    batch = scheduler.expire_due(NOW + timedelta(hours=1))
+
+    assert batch.expired == ["c-1", "c-2"]
+    assert batch.revoked == ["c-1"]
+    assert granted.current_state == ConsentState.REVOKED
+    assert pending.current_state == ConsentState.PENDING
+    assert batches == [["c-1", "c-2"]]
+    assert scheduler.expire_due(NOW + timedelta(hours=1)).expired == []
+    assert scheduler.expire_due(NOW + timedelta(hours=3), limit=1).expired == ["c-late"]
+
+
+def test_check_is_a_lookup_and_raises_consent_expired():
+    scheduler = ConsentExpiryScheduler()
+    consent = Consent(consent_id="c-1", actor_id="cand", target_id="job", state=ConsentState.GRANTED,
+                      granted_at=NOW, expires_at=NOW + timedelta(days=30))
+    assert scheduler.schedule_consent(consent)
+    assert not scheduler.schedule_consent(consent.model_copy(update={"consent_id": "c-2", "expires_at": None}))
+
+    scheduler.check("c-1", NOW)
+    scheduler.check("unknown", NOW)
+    assert scheduler.is_expired("c-1", NOW + timedelta(days=30))
+    with pytest.raises(ConsentExpired) as excinfo:
+        scheduler.check("c-1", NOW + timedelta(days=31))
+    assert excinfo.value.expiration_date == consent.expires_at
+
+
+def test_assert_purpose_allowed_rejects_expired_consent():
+    consent = Consent(consent_id="c-1", actor_id="cand", target_id="job", state=ConsentState.GRANTED,
+                      purpose=["contact"], granted_at=NOW, expires_at=NOW)
+    assert consent.is_expired()
+    assert not consent.is_expired(NOW - timedelta(seconds=1))
+    with pytest.raises(ConsentExpired):
+        assert_purpose_allowed(consent, "contact")
+
+
+def test_consent_is_expired_mixes_naive_and_aware_datetimes():
+    aware = Consent(consent_id="c-1", actor_id="cand", target_id="job", state=ConsentState.GRANTED,
+                    granted_at=NOW, expires_at=NOW)
+    naive = aware.model_copy(update={"expires_at": NOW.astimezone().replace(tzinfo=None)})
+    naive_before = (NOW - timedelta(seconds=1)).astimezone().replace(tzinfo=None)
+    for consent in (aware, naive):
+        assert not consent.is_expired(naive_before)
+        assert consent.is_expired(NOW)
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.visibility import VisibilityLevel
+from uhp.models.application import Application
+from uhp.models.candidate import CandidateProfile
+from uhp.privacy import pseudonym
+from uhp.privacy.pseudonym import Pseudonymizer, set_default_pseudonymizer
+from uhp.privacy.visibility import filter_visible_fields, filter_visible_fields_many
+
+
+def test_pseudonyms_are_stable_per_key_and_cached():
+    p = Pseudonymizer(b"secret", cache_size=2)
+    first = p.pseudonym("cand1")
+    assert p.pseudonym("cand1") == first
+    assert len(first) == 32
+    assert p.pseudonym(None) is None
+    assert Pseudonymizer(b"secret").pseudonym("cand1") == first
+    assert p.cache_info().hits == 1
+
+    assert p.pseudonyms(["cand1", "cand2", None, "cand1"]) == [first, p.pseudonym("cand2"), None, first]
+
+    p.rotate(b"new secret", key_id="2")
+    assert p.key_id == "2"
+    assert p.pseudonym("cand1") != first
+    assert p.cache_info().currsize == 1
+
+
+def test_anonymized_visibility_uses_default_pseudonymizer():
+    previous = pseudonym._default
+    try:
+        set_default_pseudonymizer(Pseudonymizer(b"k"))
+        profiles = [CandidateProfile(candidate_id=f"c{i % 2}", first_name="A", last_name="B",
+                                     email=f"c{i % 2}@example.com") for i in range(4)]
+        projected = filter_visible_fields_many(profiles, VisibilityLevel.ANONYMIZED)
+        assert projected[0] == projected[2]
+        assert projected[0]["candidate_id"] == Pseudonymizer(b"k").pseudonym("c0")
+        assert projected[0]["email"] != projected[1]["email"]
+
+        set_default_pseudonymizer(Pseudonymizer(b"rotated"))
+        assert filter_visible_fields(profiles[0], VisibilityLevel.ANONYMIZED, None) != projected[0]
+    finally:
+        pseudonym._default = previous
+
+
+def test_batch_projection_hashes_each_value_once():
+    previous = pseudonym._default
+    try:
+        p = Pseudonymizer(b"k", cache_size=100)
+        set_default_pseudonymizer(p)
+        apps = [Application(application_id=f"a{i}", job_id="j1", candidate_id=f"c{i}",
+                            status=ApplicationState.SUBMITTED, submission_date=datetime(2026, 1, 1))
+                for i in range(2000)]
+        projected = filter_visible_fields_many(apps, VisibilityLevel.ANONYMIZED)
+
+        assert p.cache_info().misses == 2000
+        assert projected[1999]["candidate_id"] == Pseudonymizer(b"k").pseudonym("c1999")
+    finally:
+        pseudonym._default = previous
+
+
+def test_default_pseudonymizer_warns_without_a_configured_key(monkeypatch, capsys):
+    monkeypatch.setattr(pseudonym, "_default", None)
+    monkeypatch.delenv(pseudonym.PSEUDONYM_KEY_ENV_VAR, raising=False)
+    pseudonym.get_default_pseudonymizer()
+    assert pseudonym.PSEUDONYM_KEY_ENV_VAR in capsys.readouterr().err
+
+    monkeypatch.setattr(pseudonym, "_default", None)
+    monkeypatch.setenv(pseudonym.PSEUDONYM_KEY_ENV_VAR, b"secret".hex())
+    assert pseudonym.get_default_pseudonymizer().pseudonym("cand1") == Pseudonymizer(b"secret").pseudonym("cand1")
+    assert capsys.readouterr().err == ""
@@ -44,3 +44,69 @@ def test_matched_purpose_allows_access():
         granted_at=datetime(2024, 1, 1, 12, 0, 0)
     )
     assert assert_purpose_allowed(consent, "SALARY_NEGOTIATION") is True
+
+def test_check_purposes_returns_mask_and_denials():
+    from datetime import timedelta
+    from uhp.privacy.purpose import check_purposes
+
+    base = dict(actor_id="cand789", target_id="job456", granted_at=datetime(2024, 1, 1, 12, 0, 0))
+    consents = [
+        Consent(consent_id="ok", state=ConsentState.GRANTED, purpose=["CONTACT"], **base),
+        Consent(consent_id="denied", state=ConsentState.DENIED, purpose=["CONTACT"], **base),
+        Consent(consent_id="expired", state=ConsentState.GRANTED, purpose=["CONTACT"],
+                expires_at=datetime(2024, 6, 1), **base),
+        Consent(consent_id="other", state=ConsentState.GRANTED, purpose=["ANALYTICS"], **base),
+    ]
+    result = check_purposes(consents, "CONTACT", now=datetime(2025, 1, 1))
+    assert result.allowed == [True, False, False, False]
+    assert [(d.index, d.consent_id, d.reason) for d in result.denials] == [
+        (1, "denied", "not_granted"), (2, "expired", "expired"), (3, "other", "purpose_not_granted")]
+    assert check_purposes(consents, "CONTACT", now=datetime(2024, 5, 1)).allowed[2] is True
+
+
+def test_check_purposes_mixes_naive_and_aware_datetimes():
+    from datetime import timedelta, timezone
+    from uhp.privacy.purpose import check_purposes
+
+    expires_at = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    base = dict(actor_id="cand789", target_id="job456", state=ConsentState.GRANTED, purpose=["CONTACT"],
+                granted_at=datetime(2024, 1, 1, 12, 0, 0))
+    consents = [
+        Consent(consent_id="aware", expires_at=expires_at, **base),
+        Consent(consent_id="naive", expires_at=expires_at.astimezone().replace(tzinfo=None), **base),
+    ]
+    naive_before = (expires_at - timedelta(hours=1)).astimezone().replace(tzinfo=None)
+    assert check_purposes(consents, "CONTACT", now=naive_before).allowed == [True, True]
+    assert check_purposes(consents, "CONTACT", now=expires_at).allowed == [False, False]
+
+
+def test_filter_allowed_uses_the_consent_store():
+    from uhp.privacy.consent_store import ConsentStore
+    from uhp.privacy.purpose import filter_allowed
+
+    store = ConsentStore()
+    store.grant("c1", "cand1", "emp1", ["CONTACT"])
+    store.grant("c2", "cand2", "emp1", ["ANALYTICS"])
+    candidates = [{"id": "cand1"}, {"id": "cand2"}, {"id": "cand3"}]
+
+    denials = []
+    allowed = filter_allowed(candidates, "CONTACT", store, key=lambda c: (c["id"], "emp1"), denials=denials)
+    assert list(allowed) == [{"id": "cand1"}]
+    assert [(d.index, d.reason) for d in denials] == [(1, "purpose_not_granted"), (2, "no_consent")]
+
+def test_filter_allowed_agrees_with_check_purposes_on_expiry():
+    from datetime import timedelta
+    from uhp.privacy.consent_store import ConsentStore
+    from uhp.privacy.purpose import check_purposes, filter_allowed
+
+    expires_at = datetime.now() + timedelta(days=1)
+    consent = Consent(consent_id="c1", actor_id="cand1", target_id="emp1", state=ConsentState.GRANTED,
+                      purpose=["CONTACT"], granted_at=datetime(2024, 1, 1), expires_at=expires_at)
+    store = ConsentStore([consent])
+    assert list(filter_allowed([("cand1", "emp1")], "CONTACT", store)) == [("cand1", "emp1")]
+
+    later = expires_at + timedelta(seconds=1)
+    denials = []
+    assert list(filter_allowed([("cand1", "emp1")], "CONTACT", store, denials=denials, now=later)) == []
+    expected = check_purposes([consent], "CONTACT", now=later).denials
+    assert [(d.field, d.reason) for d in denials] == [(d.field, d.reason) for d in expected]
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.visibility import VisibilityLevel
+from uhp.models.application import Application
+from uhp.models.candidate import CandidateProfile
+from uhp.models.consent import Consent
+from uhp.privacy import visibility
+from uhp.privacy.visibility import filter_visible_fields, get_projection, register_visibility_policy
+
+CANDIDATE = CandidateProfile(candidate_id="cand1", first_name="Ada", last_name="Lovelace",
+                             email="ada@example.com", skills=["Python"], is_open_to_remote=True)
+
+
+def test_anonymized_projection_hides_identity():
+    projected = filter_visible_fields(CANDIDATE, VisibilityLevel.ANONYMIZED, None)
+    assert set(projected) == {"candidate_id", "email", "skills", "is_open_to_remote"}
+    assert projected["skills"] == ["Python"]
+    assert projected["email"] != CANDIDATE.email
+    projected["skills"].append("Go")
+    assert CANDIDATE.skills == ["Python"]
+    assert filter_visible_fields(CANDIDATE, VisibilityLevel.RESTRICTED, None) == {}
+
+    app = Application(application_id="a1", job_id="j1", candidate_id="cand1",
+                      status=ApplicationState.SUBMITTED, submission_date=datetime(2026, 1, 1), notes="n")
+    assert filter_visible_fields(app, VisibilityLevel.ANONYMIZED, None) == {
+        "job_id": "j1", "candidate_id": projected["candidate_id"],
+        "status": ApplicationState.SUBMITTED, "submission_date": datetime(2026, 1, 1)}
+
+
+def test_projections_match_model_dump_and_are_cached():
+    consent = Consent(consent_id="c1", actor_id="cand1", target_id="emp1", state=ConsentState.GRANTED,
+                      purpose=None, granted_at=datetime(2026, 1, 1))
+    assert filter_visible_fields(consent, VisibilityLevel.PUBLIC, None) == consent.model_dump()
+    assert get_projection(CandidateProfile, VisibilityLevel.PUBLIC) is \
+        get_projection(CandidateProfile, VisibilityLevel.PUBLIC)
+
+
+def test_register_policy_and_pydantic_fallback():
+    class Inner(BaseModel):
+        value: int
+
+    class Outer(BaseModel):
+        name: str
+        inner: Inner
+        secret: str
+
+    outer = Outer(name="x", inner=Inner(value=1), secret="s")
+    assert filter_visible_fields(outer, VisibilityLevel.PUBLIC, None) == {}
+    try:
+        register_visibility_policy(Outer, {VisibilityLevel.PUBLIC: ("name", "inner")})
+        assert filter_visible_fields(outer, VisibilityLevel.PUBLIC, None) == {"name": "x", "inner": {"value": 1}}
+    finally:
+        visibility.VISIBILITY_POLICIES.pop(Outer, None)
+
+
+def test_iter_visible_json_streams_ndjson_and_arrays():
+    import json
+    import pytest
+    from pydantic_core import to_json
+    from uhp.privacy.visibility import iter_visible_json
+
+    app = Application(application_id="a1", job_id="j1", candidate_id="cand1",
+                      status=ApplicationState.SUBMITTED, submission_date=datetime(2026, 1, 1))
+    items = [CANDIDATE, app] * 50
+
+    chunks = list(iter_visible_json(items, VisibilityLevel.ANONYMIZED, chunk_size=256))
+    assert len(chunks) > 1
+    lines = b"".join(chunks).splitlines()
+    assert len(lines) == 100
+    assert lines[:2] == [to_json(filter_visible_fields(item, VisibilityLevel.ANONYMIZED, None))
+                         for item in items[:2]]
+
+    public = json.loads(b"".join(iter_visible_json([CANDIDATE, {"other": 1}], VisibilityLevel.PUBLIC, "json")))
+    assert public == [json.loads(CANDIDATE.model_dump_json()), {}]
+    assert b"".join(iter_visible_json([], VisibilityLevel.PUBLIC, "json")) == b"[]"
+    with pytest.raises(ValueError):
+        list(iter_visible_json(items, VisibilityLevel.PUBLIC, "xml"))
@@ -32,3 +32,58 @@ def test_enforce_transition_raises_error_for_invalid_transition():
         state_machine.perform_action("INVALID_ACTION")
 
     assert "Cannot perform INVALID_ACTION from state STATE_A" in str(excinfo.value)
+
+def test_class_level_transition_map_is_compiled_once():
+    """
+    Tests that a class-level transition_map is compiled into frozensets shared by
+    all instances, and that instances only store their current state.
+    """
+    class CompiledStateMachine(UhpStateMachine):
+        __slots__ = ()
+        transition_map = {"STATE_A": ["ACTION_B"], "STATE_B": []}
+
+        def __init__(self, current_state):
+            self.current_state = current_state
+
+    assert CompiledStateMachine._allowed_actions == {
+        "STATE_A": frozenset({"ACTION_B"}),
+        "STATE_B": frozenset(),
+    }
+
+    state_machine = CompiledStateMachine("STATE_A")
+    state_machine._enforce_transition("ACTION_B")
+    assert not hasattr(state_machine, "__dict__")
+
+    state_machine.current_state = "STATE_B"
+    with pytest.raises(InvalidStateTransitionError):
+        state_machine._enforce_transition("ACTION_B")
+
+def test_try_apply_and_can_apply_do_not_raise():
+    """
+    Tests the non-raising transition API and that the raising methods wrap it.
+    """
+    from uhp.enums.consent_state import ConsentState
+    from uhp.enums.intent import IntentType
+    from uhp.enums.transition_result import TransitionResult
+    from uhp.state_machines.consent import ConsentStateMachine
+
+    sm = ConsentStateMachine()
+    assert sm.can_apply(IntentType.PROPOSE_CONSENT)
+    assert not sm.can_apply(IntentType.REVOKE_CONSENT)
+
+    assert sm.try_apply(IntentType.REVOKE_CONSENT) is TransitionResult.NOT_ALLOWED
+    assert sm.current_state == ConsentState.PENDING
+    assert sm.try_apply(IntentType.PROPOSE_CONSENT, ConsentState.REVOKED) is TransitionResult.INVALID_TARGET
+    assert sm.current_state == ConsentState.PENDING
+    assert sm.try_apply(IntentType.PROPOSE_CONSENT) is TransitionResult.INVALID_TARGET
+    assert sm.current_state == ConsentState.PENDING
+
+    assert sm.try_apply(IntentType.PROPOSE_CONSENT, ConsentState.DENIED) is TransitionResult.OK
+    assert sm.current_state == ConsentState.DENIED
+    assert sm.try_apply(IntentType.REVOKE_CONSENT) is TransitionResult.OK
+    assert sm.current_state == ConsentState.REVOKED
+
+    with pytest.raises(InvalidStateTransitionError) as excinfo:
+        sm.apply(IntentType.PROPOSE_CONSENT)
+    assert excinfo.value.current_state == ConsentState.REVOKED
+    assert excinfo.value.intended_action == IntentType.PROPOSE_CONSENT
@@ -0,0 +1,52 @@
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.batch import BatchTransitioner
+from uhp.state_machines.consent import ConsentStateMachine
+
+
+def test_batch_reports_columnar_results():
+    states = {"a1": ApplicationState.DRAFT, "a2": ApplicationState.REJECTED}
+    batch = BatchTransitioner(ApplicationStateMachine, states)
+    result = batch.apply([
+        ("a1", IntentType.APPLY_FOR_JOB),
+        ("a2", IntentType.WITHDRAW_APPLICATION),
+        ("a1", IntentType.WITHDRAW_APPLICATION),
+        ("missing", IntentType.APPLY_FOR_JOB),
+    ])
+
+    assert result.states == [ApplicationState.SUBMITTED, ApplicationState.REJECTED,
+                             ApplicationState.WITHDRAWN, None]
+    assert list(result.codes) == [TransitionResult.OK, TransitionResult.NOT_ALLOWED,
+                                  TransitionResult.OK, TransitionResult.UNKNOWN_ENTITY]
+    assert list(result.failure_indices) == [1, 3]
+    assert result.counts() == {TransitionResult.OK: 2, TransitionResult.NOT_ALLOWED: 1,
+                               TransitionResult.UNKNOWN_ENTITY: 1}
+    assert states["a1"] == ApplicationState.WITHDRAWN
+
+
+def test_apply_chunks_streams_with_offsets():
+    states = {f"c{i}": ConsentState.PENDING for i in range(25)}
+    batch = BatchTransitioner(ConsentStateMachine, states)
+    requests = ((f"c{i}", IntentType.PROPOSE_CONSENT, ConsentState.DENIED if i % 10 == 0 else ConsentState.GRANTED)
+                for i in range(25))
+    chunks = list(batch.apply_chunks(requests, chunk_size=10))
+
+    assert [(c.offset, len(c)) for c in chunks] == [(0, 10), (10, 10), (20, 5)]
+    assert all(len(c.failure_indices) == 0 for c in chunks)
+    assert states["c10"] == ConsentState.DENIED
+    assert states["c11"] == ConsentState.GRANTED
+
+
+def test_observer_receives_entity_ids():
+    events = []
+    states = {"a1": ApplicationState.DRAFT, "a2": ApplicationState.REJECTED, "a3": ApplicationState.DRAFT}
+    batch = BatchTransitioner(ApplicationStateMachine, states,
+                              observer=lambda entity_id, intent, from_state, to_state: events.append(
+                                  (entity_id, from_state, to_state)))
+    batch.apply([(entity_id, IntentType.APPLY_FOR_JOB) for entity_id in states])
+
+    assert events == [("a1", ApplicationState.DRAFT, ApplicationState.SUBMITTED),
+                      ("a3", ApplicationState.DRAFT, ApplicationState.SUBMITTED)]
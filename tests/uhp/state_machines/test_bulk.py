@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.errors import InvalidStateTransitionError
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.bulk import BulkTransitionEngine
+from uhp.state_machines.consent import ConsentStateMachine
+
+
+def test_bulk_withdraw_matches_per_object_semantics():
+    engine = BulkTransitionEngine(ApplicationStateMachine)
+    states = list(ApplicationState) * 3
+    codes = engine.encode(states)
+
+    result = engine.apply(codes, IntentType.WITHDRAW_APPLICATION)
+
+    expected_states, expected_violations = [], []
+    for state in states:
+        sm = ApplicationStateMachine(current_state=state)
+        try:
+            sm.withdraw_application()
+            expected_violations.append(False)
+        except InvalidStateTransitionError:
+            expected_violations.append(True)
+        expected_states.append(sm.current_state)
+
+    assert engine.decode(result.states) == expected_states
+    assert result.violations.tolist() == expected_violations
+    assert result.violation_indices.tolist() == [i for i, v in enumerate(expected_violations) if v]
+    assert engine.decode(codes) == states # input is left untouched
+
+
+def test_bulk_consent_propose_with_explicit_outcome():
+    engine = BulkTransitionEngine(ConsentStateMachine)
+    codes = engine.encode([ConsentState.PENDING, "GRANTED", ConsentState.PENDING])
+
+    with pytest.raises(ValueError):
+        engine.apply(codes, IntentType.PROPOSE_CONSENT)
+    granted = engine.apply(codes, IntentType.PROPOSE_CONSENT, target=ConsentState.GRANTED)
+    denied = engine.apply(codes, IntentType.PROPOSE_CONSENT, target=ConsentState.DENIED)
+
+    assert engine.decode(granted.states) == [ConsentState.GRANTED, ConsentState.GRANTED, ConsentState.GRANTED]
+    assert granted.violations.tolist() == [False, True, False]
+    assert engine.decode(denied.states) == [ConsentState.DENIED, ConsentState.GRANTED, ConsentState.DENIED]
+
+
+def test_bulk_rejects_unknown_states_intents_and_targets():
+    engine = BulkTransitionEngine(ConsentStateMachine)
+    codes = engine.encode([ConsentState.PENDING])
+
+    with pytest.raises(ValueError, match="Unknown state"):
+        engine.encode(["NOT_A_STATE"])
+    with pytest.raises(ValueError, match="Unknown intent"):
+        engine.apply(codes, IntentType.APPLY_FOR_JOB)
+    with pytest.raises(ValueError, match="not an outcome"):
+        engine.apply(codes, IntentType.REVOKE_CONSENT, target=ConsentState.GRANTED)
+    with pytest.raises(ValueError, match="Unknown state code -1"):
+        engine.apply(np.array([0, -1], dtype=engine.dtype), IntentType.REVOKE_CONSENT)
+    with pytest.raises(ValueError, match="Unknown state code 4"):
+        engine.apply(np.array([4], dtype=engine.dtype), IntentType.REVOKE_CONSENT)
+    with pytest.raises(ValueError, match="Unknown state code"):
+        engine.decode(np.array([-1], dtype=engine.dtype))
@@ -0,0 +1,78 @@
+import pytest
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.errors import InvalidStateTransitionError
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.codegen import build_state_machine
+from uhp.state_machines.consent import ConsentStateMachine
+
+
+def test_build_state_machine_generates_intent_methods():
+    Door = build_state_machine("Door", [
+        ("CLOSED", "OPEN", "OPENED"),
+        ("OPENED", "CLOSE", "CLOSED"),
+        ("CLOSED", "LOCK", "LOCKED"),
+        ("CLOSED", "BREAK", "BROKEN"),
+        ("CLOSED", "BREAK", "JAMMED"),
+    ], initial_state="CLOSED", states=["UNUSED"])
+
+    door = Door()
+    door.open()
+    assert door.current_state == "OPENED"
+    with pytest.raises(InvalidStateTransitionError):
+        door.lock()
+    door.close()
+    door.break_("JAMMED")
+    assert door.current_state == "JAMMED"
+
+    assert Door.terminal_states == frozenset({"LOCKED", "BROKEN", "JAMMED", "UNUSED"})
+    assert Door.reachable_states == frozenset({"CLOSED", "OPENED", "LOCKED", "BROKEN", "JAMMED"})
+    assert Door.reachable_from["OPENED"] == Door.reachable_states
+    assert "UNUSED" in Door.states
+
+
+def test_build_state_machine_rejects_targets_depending_on_from_state():
+    with pytest.raises(ValueError, match="'next'"):
+        build_state_machine("Steps", [("A", "next", "B"), ("B", "next", "C")], initial_state="A")
+
+
+def test_specialized_repo_machines():
+    assert ApplicationStateMachine.terminal_states == frozenset(
+        {ApplicationState.REJECTED, ApplicationState.WITHDRAWN})
+    assert ApplicationState.SCREENING not in ApplicationStateMachine.reachable_states
+    assert ConsentStateMachine.reachable_states == frozenset(ConsentState)
+    assert "Applies REVOKE_CONSENT" in ConsentStateMachine.revoke_consent.__doc__
+
+    # Subclasses and values equal to, but not identical with, the members take the generic path.
+    class Custom(ApplicationStateMachine):
+        __slots__ = ()
+        transition_map = {ApplicationState.DRAFT: []}
+
+    with pytest.raises(InvalidStateTransitionError):
+        Custom().apply_for_job()
+    sm = ApplicationStateMachine(current_state="DRAFT")
+    sm.apply_for_job()
+    assert sm.current_state == ApplicationState.SUBMITTED
+
+
+def test_propose_consent_is_generated_with_a_grant_flag():
+    propose = ConsentStateMachine.propose_consent
+    assert propose.__code__.co_filename == "<uhp specialized ConsentStateMachine.propose_consent>"
+    assert propose.__code__.co_varnames[:2] == ("self", "grant")
+    assert "GRANTED if grant is true, else DENIED" in propose.__doc__
+
+    for grant, expected in ((True, ConsentState.GRANTED), (False, ConsentState.DENIED)):
+        sm = ConsentStateMachine()
+        sm.propose_consent(grant)
+        assert sm.current_state is expected
+    with pytest.raises(InvalidStateTransitionError):
+        ConsentStateMachine(ConsentState.GRANTED).propose_consent(grant=True)
+
+
+def test_flag_arguments_need_two_targets():
+    from uhp.state_machines.codegen import specialize
+
+    with pytest.raises(ValueError, match="exactly two targets"):
+        specialize(flag_arguments={"LOCK": "force"})(build_state_machine(
+            "Lock", [("OPEN", "LOCK", "LOCKED")], initial_state="OPEN"))
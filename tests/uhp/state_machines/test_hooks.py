@@ -0,0 +1,88 @@
+import pytest
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.errors import InvalidStateTransitionError
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.consent import ConsentStateMachine
+
+
+def test_observers_and_pre_hooks_are_per_class():
+    class ObservedConsent(ConsentStateMachine):
+        __slots__ = ()
+
+    events = []
+
+    @ObservedConsent.add_observer
+    def record(machine, intent, from_state, to_state):
+        events.append((intent, from_state, to_state))
+
+    sm = ObservedConsent()
+    sm.propose_consent(grant=False)
+    sm.try_apply(IntentType.PROPOSE_CONSENT)  # rejected: not observed
+    ConsentStateMachine().propose_consent(grant=True)  # other class: not observed
+
+    assert events == [(IntentType.PROPOSE_CONSENT, ConsentState.PENDING, ConsentState.DENIED)]
+
+    ObservedConsent.add_pre_transition_hook(lambda machine, intent, from_state, to_state: False)
+    assert sm.try_apply(IntentType.REVOKE_CONSENT) is TransitionResult.VETOED
+    assert sm.current_state == ConsentState.DENIED
+    with pytest.raises(InvalidStateTransitionError, match="vetoed"):
+        sm.revoke_consent()
+
+    ObservedConsent.remove_hook(record)
+    assert ObservedConsent._observers == ()
+    assert ConsentStateMachine._pre_hooks == ()
+
+
+def test_batch_observers_receive_changed_rows():
+    np = pytest.importorskip("numpy")
+    from uhp.state_machines.bulk import BulkTransitionEngine
+
+    class ObservedApplication(ApplicationStateMachine):
+        __slots__ = ()
+
+    batches = []
+    ObservedApplication.add_batch_observer(
+        lambda engine, intent, indices, from_codes, to_state: batches.append(
+            (intent, indices.tolist(), engine.decode(from_codes), to_state)))
+
+    engine = BulkTransitionEngine(ObservedApplication)
+    codes = engine.encode([ApplicationState.DRAFT, ApplicationState.REVIEW, ApplicationState.REJECTED])
+    engine.apply(codes, IntentType.WITHDRAW_APPLICATION)
+
+    assert batches == [(IntentType.WITHDRAW_APPLICATION, [1], [ApplicationState.REVIEW], ApplicationState.WITHDRAWN)]
+
+
+def test_versioned_store_runs_hooks_and_observers():
+    from uhp.state_machines.versioned import VersionedStateStore
+
+    class ObservedConsent(ConsentStateMachine):
+        __slots__ = ()
+
+    events = []
+    ObservedConsent.add_observer(lambda machine, intent, from_state, to_state: events.append(to_state))
+    store = VersionedStateStore(ObservedConsent)
+    store.create("c-1")
+
+    store.apply("c-1", IntentType.PROPOSE_CONSENT, ConsentState.GRANTED)
+    assert events == [ConsentState.GRANTED]
+
+    ObservedConsent.add_pre_transition_hook(lambda machine, intent, from_state, to_state: False)
+    assert store.try_apply("c-1", IntentType.REVOKE_CONSENT) is TransitionResult.VETOED
+    assert store.get("c-1") == (ConsentState.GRANTED, 1)
+
+
+def test_bulk_engine_rejects_classes_with_pre_hooks():
+    pytest.importorskip("numpy")
+    from uhp.state_machines.bulk import BulkTransitionEngine
+
+    class GuardedApplication(ApplicationStateMachine):
+        __slots__ = ()
+
+    GuardedApplication.add_pre_transition_hook(lambda machine, intent, from_state, to_state: False)
+    engine = BulkTransitionEngine(GuardedApplication)
+    with pytest.raises(TypeError, match="pre-transition hooks"):
+        engine.apply(engine.encode([ApplicationState.DRAFT]), IntentType.APPLY_FOR_JOB)
@@ -0,0 +1,73 @@
+import pytest
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.consent import ConsentStateMachine
+from uhp.state_machines.journal import FileTransitionJournal, InMemoryTransitionJournal
+
+
+@pytest.fixture(params=["memory", "file"])
+def make_journal(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return InMemoryTransitionJournal(**kwargs)
+        return FileTransitionJournal(str(tmp_path / "journal"), **kwargs)
+    return factory
+
+
+def test_apply_journals_only_successful_transitions(make_journal):
+    journal = make_journal()
+    sm = ApplicationStateMachine()
+
+    assert journal.apply("app-1", sm, IntentType.WITHDRAW_APPLICATION) is TransitionResult.NOT_ALLOWED
+    assert journal.apply("app-1", sm, IntentType.APPLY_FOR_JOB) is TransitionResult.OK
+    assert journal.apply("app-1", sm, IntentType.WITHDRAW_APPLICATION) is TransitionResult.OK
+
+    history = journal.history("app-1")
+    assert [r.sequence for r in history] == [1, 2]
+    assert history[0].from_state == ApplicationState.DRAFT
+    assert history[0].intent == IntentType.APPLY_FOR_JOB
+    assert history[1].to_state == ApplicationState.WITHDRAWN
+    assert journal.state_of("app-1") == ApplicationState.WITHDRAWN
+
+
+def test_replay_uses_snapshot_and_tail(make_journal):
+    journal = make_journal(snapshot_interval=3)
+    for i in range(5):
+        journal.append(f"c-{i}", ConsentState.PENDING, IntentType.PROPOSE_CONSENT, ConsentState.GRANTED)
+    journal.append("c-0", ConsentState.GRANTED, IntentType.REVOKE_CONSENT, ConsentState.REVOKED)
+
+    snapshot = journal.latest_snapshot()
+    assert snapshot.sequence == 6
+    journal.append("c-1", ConsentState.GRANTED, IntentType.REVOKE_CONSENT, ConsentState.REVOKED)
+
+    assert [r.sequence for r in journal.records(after=snapshot.sequence)] == [7]
+    states = journal.replay()
+    assert states == journal.states()
+    assert states["c-0"] == ConsentState.REVOKED
+    assert states["c-1"] == ConsentState.REVOKED
+    assert states["c-4"] == ConsentState.GRANTED
+
+
+def test_file_journal_recovers_after_restart(tmp_path):
+    directory = str(tmp_path / "journal")
+    with FileTransitionJournal(directory) as journal:
+        sm = ConsentStateMachine()
+        journal.apply("c-1", sm, IntentType.PROPOSE_CONSENT, ConsentState.DENIED)
+        journal.snapshot()
+        journal.apply("c-1", sm, IntentType.REVOKE_CONSENT)
+
+    # Simulate a crash in the middle of writing a record.
+    with open(journal.log_path, "ab") as f:
+        f.write(b'[3,"c-2","PENDING"')
+
+    with FileTransitionJournal(directory) as journal:
+        assert journal.sequence == 2
+        assert journal.state_of("c-1") == ConsentState.REVOKED
+        record = journal.append("c-2", ConsentState.PENDING, IntentType.PROPOSE_CONSENT, ConsentState.GRANTED)
+        assert record.sequence == 3
+        assert [r.sequence for r in journal.records()] == [1, 2, 3]
+        assert journal.replay() == {"c-1": "REVOKED", "c-2": "GRANTED"}
@@ -0,0 +1,72 @@
+import sqlite3
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.consent import ConsentStateMachine
+from uhp.state_machines.store import SQLiteStateStore
+
+
+def _row_count(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM uhp_state").fetchone()[0]
+
+
+def test_writes_are_group_committed(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = SQLiteStateStore(path, namespace="application", batch_size=3, max_delay=None)
+    sm = ApplicationStateMachine()
+
+    assert store.apply("app-1", sm, IntentType.APPLY_FOR_JOB) is TransitionResult.OK
+    assert store.apply("app-1", sm, IntentType.APPLY_FOR_JOB) is TransitionResult.NOT_ALLOWED
+    store.save("app-2", ApplicationState.DRAFT)
+
+    # Buffered, but visible to reads through the store.
+    assert _row_count(path) == 0
+    assert store.load("app-1") == ApplicationState.SUBMITTED
+
+    store.save("app-3", ApplicationState.DRAFT)
+    assert _row_count(path) == 3
+    store.close()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_bulk_restore_into_machines(tmp_path):
+    path = str(tmp_path / "state.db")
+    with SQLiteStateStore(path, namespace="consent") as consents, \
+            SQLiteStateStore(path, namespace="application") as applications:
+        consents.persist({f"c-{i}": ConsentStateMachine(ConsentState.GRANTED) for i in range(5)})
+        applications.save("app-1", ApplicationState.REVIEW)
+
+    with SQLiteStateStore(path, namespace="consent") as consents:
+        machines = consents.restore(ConsentStateMachine)
+        assert sorted(machines) == [f"c-{i}" for i in range(5)]
+        assert all(m.current_state is ConsentState.GRANTED for m in machines.values())
+        assert consents.restore(ConsentStateMachine, ["c-1", "missing"]).keys() == {"c-1"}
+        machines["c-1"].revoke_consent()
+        consents.persist({"c-1": machines["c-1"]})
+        assert consents.load("c-1") == ConsentState.REVOKED
+        assert consents.load("app-1") is None
+
+
+def test_load_many_reads_ids_in_chunks(tmp_path):
+    path = str(tmp_path / "state.db")
+    with SQLiteStateStore(path, namespace="application", batch_size=10000, max_delay=None) as store:
+        store.save_many((f"app-{i}", "DRAFT") for i in range(2000))
+        store.flush()
+        store.save("app-5", "SUBMITTED")
+        statements = []
+        store._conn.set_trace_callback(statements.append)
+
+        ids = [f"app-{i}" for i in range(1999, -1, -1)] + ["missing", "app-5"]
+        states = store.load_many(ids)
+
+        store._conn.set_trace_callback(None)
+        assert len(statements) == 3
+        assert list(states) == [f"app-{i}" for i in range(1999, -1, -1)]
+        assert states["app-5"] == "SUBMITTED"
+        assert states["app-0"] == "DRAFT"
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+
+from uhp.enums.application_state import ApplicationState
+from uhp.enums.consent_state import ConsentState
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.errors import InvalidStateTransitionError, StateVersionConflict
+from uhp.state_machines.application import ApplicationStateMachine
+from uhp.state_machines.consent import ConsentStateMachine
+from uhp.state_machines.versioned import AsyncVersionedStateStore, VersionedState, VersionedStateStore
+
+
+def test_apply_increments_version_and_detects_conflicts():
+    store = VersionedStateStore(ApplicationStateMachine)
+    assert store.create("app-1") == VersionedState(ApplicationState.DRAFT, 0)
+
+    read = store.apply("app-1", IntentType.APPLY_FOR_JOB)
+    assert read == VersionedState(ApplicationState.SUBMITTED, 1)
+
+    # The employer advances the application while the candidate decides to withdraw.
+    store.compare_and_set("app-1", read.version, ApplicationState.SCREENING)
+
+    with pytest.raises(StateVersionConflict) as excinfo:
+        store.apply("app-1", IntentType.WITHDRAW_APPLICATION, expected_version=read.version)
+    assert excinfo.value.retryable
+    assert (excinfo.value.expected_version, excinfo.value.actual_version) == (1, 2)
+    assert store.try_apply("app-1", IntentType.WITHDRAW_APPLICATION, expected_version=1) is TransitionResult.CONFLICT
+
+    current = store.get("app-1")
+    assert store.apply("app-1", IntentType.WITHDRAW_APPLICATION, expected_version=current.version) == \
+        VersionedState(ApplicationState.WITHDRAWN, 3)
+
+    assert store.try_apply("app-1", IntentType.WITHDRAW_APPLICATION) is TransitionResult.NOT_ALLOWED
+    with pytest.raises(InvalidStateTransitionError):
+        store.apply("app-1", IntentType.APPLY_FOR_JOB)
+    with pytest.raises(ValueError):
+        store.create("app-1")
+
+
+def test_concurrent_writers_never_lose_updates():
+    store = VersionedStateStore(ConsentStateMachine, stripes=4)
+    store.create("c-1", ConsentState.GRANTED)
+    outcomes = []
+
+    def worker(grant_state):
+        seen = store.get("c-1")
+        try:
+            store.compare_and_set("c-1", seen.version, grant_state)
+            outcomes.append("ok")
+        except StateVersionConflict:
+            outcomes.append("conflict")
+
+    threads = [threading.Thread(target=worker, args=(ConsentState.DENIED,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.get("c-1").version == outcomes.count("ok")
+
+
+def test_async_store_matches_thread_store():
+    async def scenario():
+        store = AsyncVersionedStateStore(ConsentStateMachine)
+        await store.create("c-1")
+        results = await asyncio.gather(
+            store.try_apply("c-1", IntentType.PROPOSE_CONSENT, ConsentState.GRANTED, expected_version=0),
+            store.try_apply("c-1", IntentType.PROPOSE_CONSENT, ConsentState.DENIED, expected_version=0),
+        )
+        return store.get("c-1"), results
+
+    entry, results = asyncio.run(scenario())
+    assert sorted(results) == [TransitionResult.OK, TransitionResult.CONFLICT]
+    assert entry == VersionedState(ConsentState.GRANTED, 1)
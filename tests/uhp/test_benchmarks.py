@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import os
+import json
+
+
+def test_discovery_benchmark_writes_json_report(tmp_path):
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, os.path.join('benchmarks', 'bench_discovery.py'),
+         "--modules", "3", "--import-repeats", "1", "--lookup-iterations", "10", "--output", str(output)],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+    )
+
+    report = json.loads(output.read_text())
+    assert report["meta"]["modules"] == 3
+    assert report["results"]["scan"]["capabilities"] == 9
+    assert set(report["results"]["cold_import"]) == {"lazy", "eager", "off"}
+    assert all(mode["capabilities"] >= 9 for mode in report["results"]["cold_import"].values())
+    assert report["results"]["memory"]["peak_bytes"] > 0
+    assert "get_ns" in report["results"]["lookups"]
@@ -7,6 +7,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from uhp.errors import InvalidStateTransition, PrivacyViolation, ConsentExpired, InvalidStateTransitionError
+from uhp.errors import CapabilityExecutionError, CapabilityNotFound, InvalidCapabilityPayload, StateVersionConflict
 
 
 def test_invalid_state_transition_error_instantiation():
@@ -31,4 +32,27 @@ def test_consent_expired_error_instantiation():
     expiration_time = datetime(2026, 1, 1, 12, 0, 0)
     error = ConsentExpired("consent123", expiration_time)
     assert error.consent_id == "consent123"
-    assert "Consent 'consent123' expired on 2026-01-01T12:00:00." in str(error)
\ No newline at end of file
+    assert "Consent 'consent123' expired on 2026-01-01T12:00:00." in str(error)
+
+def test_capability_invocation_errors_instantiation():
+    not_found = CapabilityNotFound("cap1")
+    assert not_found.capability_id == "cap1"
+    assert "No invocable capability 'cap1' is registered." in str(not_found)
+
+    invalid = InvalidCapabilityPayload("cap1", [{"type": "missing", "loc": ("name",)}])
+    assert invalid.errors == [{"type": "missing", "loc": ("name",)}]
+    assert "1 validation error(s) for capability 'cap1'." in str(invalid)
+
+def test_capability_execution_error_instantiation():
+    cause = ValueError("bad value")
+    error = CapabilityExecutionError("cap1", cause)
+    assert error.error_type == "ValueError"
+    assert error.error_message == "bad value"
+    assert error.__cause__ is cause
+    assert "Capability 'cap1' raised ValueError: bad value" in str(error)
+
+def test_state_version_conflict():
+    error = StateVersionConflict("app-1", 1, 2)
+    assert error.retryable
+    assert error.entity_id == "app-1"
+    assert "Entity 'app-1' is at version 2, expected 1." in str(error)
@@ -63,3 +63,89 @@ def test_capabilities_discovered_on_sdk_startup(dummy_startup_capability_module)
     assert cap.description == "A capability discovered on startup."
     assert cap.input_schema["properties"]["name"]["type"] == "string"
     assert cap.output_schema["type"] == "string"
+
+
+def test_lazy_discovery_runs_once_on_first_lookup():
+    """
+    Test that a lazy loader is deferred until the first registry lookup and
+    then runs exactly once.
+    """
+    calls = []
+    cap = Capability(id="lazy_cap", description="Lazy Cap", input_schema={}, output_schema={})
+
+    def loader():
+        calls.append(1)
+        capability_registry.register(cap)
+
+    capability_registry.clear()
+    capability_registry.set_loader(loader)
+    assert calls == []
+
+    assert capability_registry.get("lazy_cap") == cap
+    assert discover_capabilities() == [cap]
+    assert len(calls) == 1
+
+
+def test_off_mode_only_discovers_on_warmup():
+    """
+    Test that non-automatic discovery is skipped by lookups and run by warmup().
+    """
+    cap = Capability(id="warm_cap", description="Warm Cap", input_schema={}, output_schema={})
+
+    capability_registry.clear()
+    capability_registry.set_loader(lambda: capability_registry.register(cap), automatic=False)
+    assert discover_capabilities() == []
+
+    uhp.warmup()
+    assert discover_capabilities() == [cap]
+
+
+def test_set_discovery_mode_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        uhp.set_discovery_mode("sometimes")
+
+
+def test_discovery_mode_env_var_disables_auto_discovery():
+    """
+    Test that UHP_CAPABILITY_DISCOVERY=off leaves the registry untouched on lookup.
+    """
+    import subprocess
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    script = (
+        "import uhp\n"
+        "from uhp.capabilities.registry import capability_registry\n"
+        "capability_registry.describe_all()\n"
+        "print(capability_registry._loaded)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+        env={**os.environ, "UHP_CAPABILITY_DISCOVERY": "off"},
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_unknown_discovery_mode_env_var_falls_back_to_lazy():
+    """
+    Test that an unknown UHP_CAPABILITY_DISCOVERY value warns instead of failing the import.
+    """
+    import subprocess
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    script = (
+        "import uhp\n"
+        "from uhp.capabilities.registry import capability_registry\n"
+        "print(capability_registry._loaded, capability_registry._automatic)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+        env={**os.environ, "UHP_CAPABILITY_DISCOVERY": "sometimes"},
+    )
+    assert result.stdout.strip() == "False True"
+    assert "UHP_CAPABILITY_DISCOVERY" in result.stderr
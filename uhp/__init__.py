@@ -11,10 +11,46 @@ from types import ModuleType # Import ModuleType
 # Placeholder for SDK version (can be moved to a separate version.py later)
 __version__ = "0.1.0"
 
+# Controls when capabilities are auto-discovered:
+#   "lazy"  -- on the first registry lookup (default)
+#   "eager" -- on package import
+#   "off"   -- never; call warmup() or _initialize_capabilities() explicitly
+DISCOVERY_MODE_ENV_VAR = "UHP_CAPABILITY_DISCOVERY"
+DISCOVERY_MODES = ("lazy", "eager", "off")
+
+
+def _discover_package_capabilities():
+    """
+    Walks the uhp.capabilities package and registers every capability found.
+    Uses the on-disk manifest cache when UHP_CAPABILITY_MANIFEST is set.
+    """
+    from uhp.capabilities.manifest import get_default_manifest, load_module_capabilities
+    manifest = get_default_manifest()
+    capabilities_package = importlib.import_module("uhp.capabilities")
+    if hasattr(capabilities_package, '__path__'):
+        for _, name, ispkg in pkgutil.walk_packages(capabilities_package.__path__):
+            full_module_name = f"{capabilities_package.__name__}.{name}"
+            if not ispkg:
+                try:
+                    if manifest is not None:
+                        for cap_model in load_module_capabilities(full_module_name, manifest):
+                            capability_registry.register(cap_model, module_name=full_module_name)
+                    else:
+                        module = importlib.import_module(full_module_name)
+                        process_and_register_capabilities_from_module(module)
+                except Exception as e:
+                    print(f"Error during capability discovery in module {full_module_name}: {e}", file=sys.stderr)
+        if manifest is not None and manifest.dirty:
+            try:
+                manifest.save()
+            except OSError as e:
+                print(f"Error writing capability manifest {manifest.path}: {e}", file=sys.stderr)
+
+
 # Auto-discovery of capabilities during SDK initialization
-# This section will execute when the 'uhp' package is first imported.
+# Runs on import, on first lookup or on warmup() depending on the discovery mode.
 def _initialize_capabilities(modules_to_scan: Optional[List[ModuleType]] = None):
-    capability_registry._registry.clear()
+    capability_registry.clear()
 
     if modules_to_scan:
         # Scan explicitly provided modules (useful for testing)
@@ -25,24 +61,52 @@ def _initialize_capabilities(modules_to_scan: Optional[List[ModuleType]] = None)
                 print(f"Error during explicit capability discovery in module {module.__name__}: {e}", file=sys.stderr)
     else:
         # Default behavior: auto-discover from uhp.capabilities subpackages
-        capabilities_package = importlib.import_module("uhp.capabilities")
-        if hasattr(capabilities_package, '__path__'):
-            for _, name, ispkg in pkgutil.walk_packages(capabilities_package.__path__):
-                full_module_name = f"{capabilities_package.__name__}.{name}"
-                if not ispkg:
-                    try:
-                        module = importlib.import_module(full_module_name)
-                        process_and_register_capabilities_from_module(module)
-                    except Exception as e:
-                        print(f"Error during capability discovery in module {full_module_name}: {e}", file=sys.stderr)
+        _discover_package_capabilities()
+
+    # An explicit initialization supersedes any pending lazy discovery.
+    capability_registry.mark_loaded()
+
+
+def set_discovery_mode(mode: str):
+    """
+    Sets how capabilities are auto-discovered ("lazy", "eager" or "off").
+    In "off" mode discovery only runs when warmup() is called.
+    """
+    if mode not in DISCOVERY_MODES:
+        raise ValueError(f"Unknown discovery mode '{mode}'. Expected one of {DISCOVERY_MODES}.")
+    if mode == "eager":
+        _initialize_capabilities()
+    else:
+        capability_registry.set_loader(_discover_package_capabilities, automatic=(mode == "lazy"))
+
+
+def warmup():
+    """
+    Runs capability discovery now, so later lookups do not pay for it.
+    Works in every discovery mode, including "off".
+    """
+    capability_registry.ensure_discovered(explicit=True)
+
+
+def _discovery_mode_from_env() -> str:
+    """
+    Reads the discovery mode from UHP_CAPABILITY_DISCOVERY. An unknown value
+    must not make `import uhp` fail, so it is reported and "lazy" is used.
+    """
+    mode = os.environ.get(DISCOVERY_MODE_ENV_VAR, "lazy").strip().lower() or "lazy"
+    if mode not in DISCOVERY_MODES:
+        print(f"Unknown {DISCOVERY_MODE_ENV_VAR} value '{mode}'. Expected one of {DISCOVERY_MODES}; "
+              f"using 'lazy'.", file=sys.stderr)
+        return "lazy"
+    return mode
 
 
-# Call initialization on package import (default behavior)
-_initialize_capabilities()
+# Apply the configured discovery mode on package import
+set_discovery_mode(_discovery_mode_from_env())
 
 
 def discover_capabilities() -> List[Capability]:
     """
     Returns a list of all discovered and registered UHP capabilities.
     """
-    return capability_registry.describe_all()
\ No newline at end of file
+    return capability_registry.describe_all()
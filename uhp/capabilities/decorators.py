@@ -1,6 +1,13 @@
-def uhp_capability(func):
+def uhp_capability(func=None, *, tags=None):
     """
     Decorator to mark a function or class as a UHP capability.
+    Use it bare (`@uhp_capability`) or with tags (`@uhp_capability(tags=["search"])`).
     """
-    func._is_uhp_capability = True
-    return func
+    def mark(obj):
+        obj._is_uhp_capability = True
+        obj._uhp_capability_tags = list(tags or [])
+        return obj
+
+    if func is None:
+        return mark
+    return mark(func)
@@ -0,0 +1,109 @@
+import inspect
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+from uhp.errors import InvalidCapabilityPayload
+
+_ARGUMENT_KINDS = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+
+
+def _signature(obj: Callable) -> inspect.Signature:
+    try:
+        return inspect.signature(obj, eval_str=True)
+    except (NameError, TypeError):
+        # Unresolvable string annotations: fall back to validating them as-is.
+        return inspect.signature(obj)
+
+
+def _arguments_adapter(obj: Callable, skip_self: bool = False) -> Optional[TypeAdapter]:
+    """
+    Builds a TypeAdapter that validates a payload dict against the keyword
+    parameters of `obj`. Returns None when `obj` takes no such parameters.
+    """
+    params = list(_signature(obj).parameters.values())
+    if skip_self and params and params[0].name == 'self':
+        params = params[1:]
+    fields: Dict[str, Any] = {}
+    accepts_extra = False
+    for param in params:
+        if param.kind == inspect.Parameter.VAR_KEYWORD:
+            accepts_extra = True
+        elif param.kind in _ARGUMENT_KINDS:
+            annotation = Any if param.annotation is inspect.Parameter.empty else param.annotation
+            fields[param.name] = annotation if param.default is inspect.Parameter.empty else NotRequired[annotation]
+    if not fields and not accepts_extra:
+        return None
+    arguments = TypedDict(f"{getattr(obj, '__qualname__', 'capability')}Arguments", fields)
+    arguments.__pydantic_config__ = ConfigDict(extra='allow' if accepts_extra else 'forbid')
+    return TypeAdapter(arguments)
+
+
+class CapabilityInvoker:
+    """
+    A capability target with its argument validators compiled once.
+
+    Functions are called with the validated payload as keyword arguments.
+    Classes are instantiated with the payload keys naming `__init__`
+    parameters, and `execute` (if defined) is called with the remaining keys.
+    """
+    __slots__ = ("capability_id", "target", "is_class", "is_coroutine",
+                 "has_execute", "_init_adapter", "_execute_adapter", "_execute_names")
+
+    def __init__(self, capability_id: str, target: Any):
+        self.capability_id = capability_id
+        self.target = target
+        self.is_class = inspect.isclass(target)
+        self._execute_names: FrozenSet[str] = frozenset()
+        self._execute_adapter: Optional[TypeAdapter] = None
+        if self.is_class:
+            self._init_adapter = _arguments_adapter(target.__init__, skip_self=True) \
+                if target.__init__ is not object.__init__ else None
+            execute = getattr(target, 'execute', None)
+            self.has_execute = execute is not None
+            if execute is not None:
+                self._execute_adapter = _arguments_adapter(execute, skip_self=True)
+                if self._execute_adapter is not None:
+                    self._execute_names = frozenset(
+                        name for name in _signature(execute).parameters if name != 'self')
+            self.is_coroutine = execute is not None and inspect.iscoroutinefunction(execute)
+        else:
+            self.has_execute = False
+            self._init_adapter = _arguments_adapter(target)
+            self.is_coroutine = inspect.iscoroutinefunction(target)
+
+    def _validate(self, adapter: Optional[TypeAdapter], payload: Dict[str, Any]) -> Dict[str, Any]:
+        if adapter is None:
+            if payload:
+                raise InvalidCapabilityPayload(
+                    capability_id=self.capability_id,
+                    errors=[{"type": "extra_forbidden", "loc": (key,), "msg": "Extra inputs are not permitted"}
+                            for key in payload],
+                )
+            return {}
+        try:
+            return adapter.validate_python(payload)
+        except ValidationError as e:
+            raise InvalidCapabilityPayload(capability_id=self.capability_id, errors=e.errors()) from e
+
+    def __call__(self, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Validates `payload`, binds it and runs the target. For coroutine
+        targets the returned value is a coroutine.
+
+        Raises:
+            InvalidCapabilityPayload: If the payload does not match the signature.
+        """
+        payload = payload or {}
+        if not self.is_class:
+            return self.target(**self._validate(self._init_adapter, payload))
+        if self._execute_names:
+            init_payload = {k: v for k, v in payload.items() if k not in self._execute_names}
+            execute_payload = {k: v for k, v in payload.items() if k in self._execute_names}
+        else:
+            init_payload, execute_payload = payload, {}
+        instance = self.target(**self._validate(self._init_adapter, init_payload))
+        if not self.has_execute:
+            return instance
+        return instance.execute(**self._validate(self._execute_adapter, execute_payload))
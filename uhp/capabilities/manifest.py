@@ -0,0 +1,213 @@
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import pkgutil
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import pydantic
+
+from uhp.models.capability import Capability
+from uhp.capabilities.scanner import scan_for_capabilities
+
+# Bump whenever the scanner output format changes, so old manifests are discarded.
+MANIFEST_FORMAT_VERSION = 1
+# Path of the manifest used by default discovery. Caching is disabled when unset.
+MANIFEST_PATH_ENV_VAR = "UHP_CAPABILITY_MANIFEST"
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _environment_key() -> Dict[str, Any]:
+    from uhp import __version__
+    return {
+        "format": MANIFEST_FORMAT_VERSION,
+        "uhp_version": __version__,
+        "pydantic_version": pydantic.VERSION,
+    }
+
+
+class CapabilityManifest:
+    """
+    An on-disk cache of the capabilities discovered in each module.
+
+    Entries are keyed by module name and validated against the module file's
+    path, mtime and size, falling back to a content hash when the mtime moved
+    but the file did not change. The whole manifest is discarded when the
+    format, SDK or pydantic version differs. Schemas of models imported from
+    other modules are not tracked; rebuild the manifest when those change.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "CapabilityManifest":
+        """
+        Loads a manifest from `path`. A missing, unreadable or outdated file yields an empty manifest.
+        """
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if not isinstance(data, dict) or data.get("environment") != _environment_key():
+            manifest.dirty = True
+            return manifest
+        manifest._modules = data.get("modules", {})
+        return manifest
+
+    def save(self):
+        """
+        Atomically writes the manifest to its path.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        data = {"environment": _environment_key(), "modules": self._modules}
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".uhp-manifest-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+    def lookup(self, module_name: str, file_path: str) -> Optional[List[Capability]]:
+        """
+        Returns the cached capabilities of a module, or None if the entry is missing or stale.
+        """
+        entry = self._modules.get(module_name)
+        if entry is None or entry["path"] != file_path:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry["mtime_ns"] or stat.st_size != entry["size"]:
+            if stat.st_size != entry["size"] or _file_digest(file_path) != entry["sha256"]:
+                return None
+            # Touched but unchanged (e.g. a fresh checkout): refresh the fast-path key.
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+        return [Capability.model_validate(cap) for cap in entry["capabilities"]]
+
+    def store(self, module_name: str, file_path: str, capabilities: List[Capability]):
+        """
+        Records the capabilities scanned from a module file.
+        """
+        stat = os.stat(file_path)
+        self._modules[module_name] = {
+            "path": file_path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _file_digest(file_path),
+            "capabilities": [cap.model_dump(mode="json") for cap in capabilities],
+        }
+        self.dirty = True
+
+    def invalidate(self, module_name: Optional[str] = None):
+        """
+        Drops the entry of one module, or every entry when no module is given.
+        """
+        if module_name is None:
+            self._modules.clear()
+        else:
+            self._modules.pop(module_name, None)
+        self.dirty = True
+
+    def module_names(self) -> List[str]:
+        """
+        Returns the names of the modules held in the manifest.
+        """
+        return list(self._modules)
+
+
+def get_default_manifest() -> Optional[CapabilityManifest]:
+    """
+    Loads the manifest named by UHP_CAPABILITY_MANIFEST, or returns None when caching is disabled.
+    """
+    path = os.environ.get(MANIFEST_PATH_ENV_VAR)
+    if not path:
+        return None
+    return CapabilityManifest.load(path)
+
+
+def load_module_capabilities(module_name: str, manifest: CapabilityManifest) -> List[Capability]:
+    """
+    Returns the capabilities of a module, from the manifest when its entry is
+    fresh. On a hit the module is not imported at all; on a miss it is imported,
+    scanned and stored in the manifest.
+    """
+    spec = importlib.util.find_spec(module_name)
+    file_path = spec.origin if spec is not None else None
+    if file_path and os.path.isfile(file_path):
+        cached = manifest.lookup(module_name, file_path)
+        if cached is not None:
+            return cached
+    module = importlib.import_module(module_name)
+    capabilities = scan_for_capabilities(module)
+    if file_path and os.path.isfile(file_path):
+        manifest.store(module_name, file_path, capabilities)
+    return capabilities
+
+
+def _package_module_names(package_name: str) -> List[str]:
+    package = importlib.import_module(package_name)
+    return [
+        f"{package_name}.{name}"
+        for _, name, ispkg in pkgutil.walk_packages(package.__path__)
+        if not ispkg
+    ]
+
+
+def rebuild_manifest(path: str, module_names: Iterable[str]) -> CapabilityManifest:
+    """
+    Rescans `module_names` from scratch and writes a fresh manifest to `path`.
+    """
+    manifest = CapabilityManifest(path)
+    for module_name in module_names:
+        load_module_capabilities(module_name, manifest)
+    manifest.save()
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point: python -m uhp.capabilities.manifest rebuild [modules...]
+    """
+    parser = argparse.ArgumentParser(prog="python -m uhp.capabilities.manifest",
+                                     description="Manage the UHP capability manifest cache.")
+    parser.add_argument("command", choices=["rebuild", "clear"])
+    parser.add_argument("modules", nargs="*",
+                        help="Modules to scan in addition to the uhp.capabilities package.")
+    parser.add_argument("--path", default=os.environ.get(MANIFEST_PATH_ENV_VAR),
+                        help=f"Manifest file (defaults to ${MANIFEST_PATH_ENV_VAR}).")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error(f"no manifest path given and ${MANIFEST_PATH_ENV_VAR} is not set")
+
+    if args.command == "clear":
+        if os.path.exists(args.path):
+            os.unlink(args.path)
+        print(f"Removed capability manifest {args.path}")
+        return 0
+
+    module_names = _package_module_names("uhp.capabilities") + list(args.modules)
+    manifest = rebuild_manifest(args.path, module_names)
+    print(f"Wrote capability manifest for {len(manifest.module_names())} modules to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
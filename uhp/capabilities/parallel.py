@@ -0,0 +1,130 @@
+import importlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from uhp.models.capability import Capability
+from uhp.capabilities.registry import capability_registry
+from uhp.capabilities.scanner import scan_for_capability_targets
+
+
+class ModuleScanResult(BaseModel):
+    """
+    The outcome of scanning a single module.
+    """
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    module_name: str = Field(..., description="Name of the scanned module.")
+    capabilities: List[Capability] = Field(default_factory=list, description="Capabilities found in the module.")
+    duration_seconds: float = Field(..., description="Wall-clock time spent importing and scanning the module.")
+    error_type: Optional[str] = Field(None, description="Exception class name if the scan failed.")
+    error_message: Optional[str] = Field(None, description="Exception message if the scan failed.")
+
+    @property
+    def ok(self) -> bool:
+        return self.error_type is None
+
+
+class ParallelScanResult(BaseModel):
+    """
+    The outcome of a parallel scan, with one entry per module in input order.
+    """
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    modules: List[ModuleScanResult] = Field(..., description="Per-module results, in input order.")
+    total_seconds: float = Field(..., description="Wall-clock time of the whole scan.")
+
+    @property
+    def capabilities(self) -> List[Capability]:
+        return [cap for result in self.modules for cap in result.capabilities]
+
+    @property
+    def errors(self) -> List[ModuleScanResult]:
+        return [result for result in self.modules if not result.ok]
+
+
+def _scan_module_targets(target: Union[ModuleType, str]) -> Tuple[ModuleScanResult, List[Any]]:
+    """
+    Imports (if given a name) and scans one module, returning its result and
+    the function or class behind each capability. Never raises; failures are
+    reported in the result.
+    """
+    module_name = target if isinstance(target, str) else target.__name__
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(target) if isinstance(target, str) else target
+        found = scan_for_capability_targets(module)
+    except Exception as e:
+        return ModuleScanResult(
+            module_name=module_name,
+            duration_seconds=time.perf_counter() - start,
+            error_type=type(e).__name__,
+            error_message=str(e),
+        ), []
+    return ModuleScanResult(
+        module_name=module_name,
+        capabilities=[cap for cap, _ in found],
+        duration_seconds=time.perf_counter() - start,
+    ), [obj for _, obj in found]
+
+
+def _scan_module(target: Union[ModuleType, str]) -> ModuleScanResult:
+    """
+    Scans one module without its targets. Top-level so that process pools can pickle it.
+    """
+    return _scan_module_targets(target)[0]
+
+
+def scan_modules_parallel(
+    modules: Iterable[Union[ModuleType, str]],
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    register: bool = True,
+) -> ParallelScanResult:
+    """
+    Scans many modules concurrently and merges their capabilities into the
+    global `capability_registry` in input order, so the result does not depend
+    on which worker finishes first.
+
+    Args:
+        modules: Module objects or importable module names.
+        executor: Pool to fan out to. Defaults to a ThreadPoolExecutor. With a
+            ProcessPoolExecutor, modules are passed by name and imported in the
+            worker, which sidesteps the GIL for schema generation.
+        max_workers: Size of the default thread pool; ignored if `executor` is given.
+        register: Whether to register the discovered capabilities.
+
+    Returns:
+        A ParallelScanResult with per-module timings and errors.
+    """
+    targets: List[Union[ModuleType, str]] = list(modules)
+    in_process = not isinstance(executor, ProcessPoolExecutor)
+    if not in_process:
+        # Module objects cannot be pickled; workers re-import them by name.
+        targets = [t if isinstance(t, str) else t.__name__ for t in targets]
+
+    start = time.perf_counter()
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if in_process:
+            scanned = list(executor.map(_scan_module_targets, targets))
+        else:
+            # Functions cannot be sent back from workers either; invoke() imports them on first use.
+            scanned = [(result, [None] * len(result.capabilities))
+                       for result in executor.map(_scan_module, targets)]
+    finally:
+        if owns_executor:
+            executor.shutdown()
+
+    results = [result for result, _ in scanned]
+    if register:
+        for result, objs in scanned:
+            for cap_model, obj in zip(result.capabilities, objs):
+                capability_registry.register(cap_model, module_name=result.module_name, target=obj)
+
+    return ParallelScanResult(modules=results, total_seconds=time.perf_counter() - start)
@@ -1,7 +1,63 @@
 from uhp.models.capability import Capability
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from types import ModuleType
-from uhp.capabilities.scanner import scan_for_capabilities
+import importlib
+import json
+import sys
+import threading
+from uhp.capabilities.scanner import hoist_schema, scan_for_capability_targets
+from uhp.errors import CapabilityExecutionError, CapabilityNotFound, UHPError
+
+if TYPE_CHECKING:
+    # Imported where used: invocation, its thread pool and the catalog hash are
+    # not needed to import uhp or to register capabilities without targets.
+    from concurrent.futures import ThreadPoolExecutor
+    from uhp.capabilities.invoker import CapabilityInvoker
+
+class _PrefixTrie:
+    """
+    A character trie over capability IDs for prefix lookups.
+    """
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, key: str):
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[None] = True # Terminal marker; None never collides with a character
+
+    def remove(self, key: str):
+        nodes = [self._root]
+        for ch in key:
+            node = nodes[-1].get(ch)
+            if node is None:
+                return
+            nodes.append(node)
+        nodes[-1].pop(None, None)
+        # Prune branches left empty, deepest first.
+        for depth in range(len(key), 0, -1):
+            if nodes[depth]:
+                break
+            del nodes[depth - 1][key[depth - 1]]
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        keys: List[str] = []
+        stack = [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            for ch, child in node.items():
+                if ch is None:
+                    keys.append(key)
+                else:
+                    stack.append((key + ch, child))
+        return sorted(keys)
+
 
 class _CapabilityRegistry: # Renamed to an internal class
     """
@@ -13,28 +69,481 @@ class _CapabilityRegistry: # Renamed to an internal class
         # Clear registry for fresh start in testing/re-initialization.
         # This is primarily for test isolation; in production, it's usually initialized once.
         self._registry = {} 
+        # Shared model schemas referenced by `$ref` from capability descriptors.
+        # Only populated when `hoist_schemas` is enabled.
+        self.hoist_schemas = False
+        self.schema_defs: Dict[str, Any] = {}
+        # Secondary indexes, maintained by register(). Each maps a key to the
+        # capabilities carrying it, keyed by ID to keep insertion order.
+        # They are modified in place under `_write_lock`; lookups copy the
+        # matching entries out under the same lock.
+        self._by_input_property: Dict[str, Dict[str, Capability]] = {}
+        self._by_output: Dict[str, Dict[str, Capability]] = {}
+        self._by_tag: Dict[str, Dict[str, Capability]] = {}
+        self._id_trie = _PrefixTrie()
+        # IDs registered from each module, so a module can be rescanned and swapped in alone.
+        self._module_ids: Dict[str, List[str]] = {}
+        # The module each ID was last registered from; an ID belongs to one module at a time.
+        self._owners: Dict[str, str] = {}
+        self._write_lock = threading.RLock()
+        # Compiled invokers, paired with the descriptor they were compiled for.
+        self._invokers: Dict[str, Tuple[Capability, "CapabilityInvoker"]] = {}
+        # Serialized catalog, rebuilt on the first read after a registration change.
+        # Each capability's JSON is cached separately so a rebuild only
+        # re-serializes the capabilities that changed.
+        self._catalog: Optional[Tuple[bytes, str]] = None
+        self._serialized: Dict[str, Tuple[Capability, bytes]] = {}
+        # Bounded pool that runs sync capabilities for the async API; created on first use.
+        self.invoke_max_workers: Optional[int] = None
+        self._invoke_executor: Optional["ThreadPoolExecutor"] = None
+        # Deferred discovery: when a loader is set, it runs once on the first lookup.
+        self._loader: Optional[Callable[[], None]] = None
+        self._automatic = True
+        self._loaded = True
+        self._loading = False
+        self._load_lock = threading.RLock()
+
+    def set_loader(self, loader: Optional[Callable[[], None]], automatic: bool = True):
+        """
+        Defers capability discovery to `loader`. When `automatic` is True the loader
+        runs once on the first lookup; otherwise only on an explicit
+        `ensure_discovered(explicit=True)`. Passing None cancels any pending discovery.
+        """
+        with self._load_lock:
+            self._loader = loader
+            self._automatic = automatic
+            self._loaded = loader is None
+
+    def mark_loaded(self):
+        """
+        Marks discovery as done so that lookups no longer trigger the loader.
+        """
+        with self._load_lock:
+            self._loaded = True
+
+    def ensure_discovered(self, explicit: bool = False):
+        """
+        Runs the pending discovery loader, if any. Safe to call from several threads.
+        Non-automatic loaders only run when `explicit` is True.
+        """
+        if self._loaded or not (self._automatic or explicit):
+            return
+        with self._load_lock:
+            # Lookups made by the loader itself must not re-enter it.
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                if self._loader is not None:
+                    self._loader()
+                self._loaded = True
+            finally:
+                self._loading = False
+
+    def register(self, capability: Capability, module_name: Optional[str] = None, target: Any = None):
+        """
+        Registers a capability, optionally recording the module it was scanned from
+        and the function or class it describes. A target's argument validation is
+        compiled here, once, so that `invoke()` only validates and calls.
+        """
+        invoker = None
+        if target is not None:
+            from uhp.capabilities.invoker import CapabilityInvoker
+            invoker = CapabilityInvoker(capability.id, target)
+        with self._write_lock:
+            capability = self._hoisted(capability)
+            previous = self._registry.get(capability.id)
+            if previous is not None:
+                # Re-registration replaces the previous descriptor, including its index entries.
+                self._unindex(previous)
+            self._registry[capability.id] = capability
+            self._index(capability)
+            self._catalog = None
+            if invoker is not None:
+                self._invokers[capability.id] = (capability, invoker)
+            else:
+                self._invokers.pop(capability.id, None)
+            if module_name is not None:
+                self._claim(capability.id, module_name)
+                module_ids = self._module_ids.setdefault(module_name, [])
+                if capability.id not in module_ids:
+                    module_ids.append(capability.id)
+
+    def _claim(self, cap_id: str, module_name: str):
+        # Moves an ID to `module_name`, so reloading its previous module leaves it alone.
+        owner = self._owners.get(cap_id)
+        if owner is not None and owner != module_name:
+            owner_ids = self._module_ids.get(owner)
+            if owner_ids is not None and cap_id in owner_ids:
+                owner_ids.remove(cap_id)
+        self._owners[cap_id] = module_name
+
+    def _hoisted(self, capability: Capability) -> Capability:
+        # With `hoist_schemas` on, model schemas move into `schema_defs` whichever
+        # way the capability was discovered. Called under the write lock.
+        if not self.hoist_schemas:
+            return capability
+        update = {}
+        properties = capability.input_schema.get("properties")
+        if isinstance(properties, dict):
+            hoisted = {name: hoist_schema(schema, self.schema_defs) if isinstance(schema, dict) else schema
+                       for name, schema in properties.items()}
+            if any(hoisted[name] is not properties[name] for name in properties):
+                update["input_schema"] = {**capability.input_schema, "properties": hoisted}
+        output_schema = hoist_schema(capability.output_schema, self.schema_defs)
+        if output_schema is not capability.output_schema:
+            update["output_schema"] = output_schema
+        return capability.model_copy(update=update) if update else capability
+
+    def replace_modules(self, capabilities_by_module: Dict[str, List[Capability]],
+                        targets: Optional[Dict[str, Any]] = None):
+        """
+        Atomically replaces the capabilities registered from the given modules.
 
-    def register(self, capability: Capability):
+        Only the affected entries and their index entries are updated, under
+        the write lock, so listing lookups (`describe_all`, `find_by_*`, the
+        catalog) see either the old or the new set of capabilities, never a
+        mix, and an ID present before and after the swap never disappears
+        from `get`. `targets` maps capability IDs to the functions or classes
+        to invoke.
         """
-        Registers a capability.
+        from uhp.capabilities.invoker import CapabilityInvoker
+
+        targets = targets or {}
+        invokers = {
+            cap.id: CapabilityInvoker(cap.id, targets[cap.id])
+            for capabilities in capabilities_by_module.values()
+            for cap in capabilities if cap.id in targets
+        }
+        with self._write_lock:
+            registry = self._registry
+            for module_name, capabilities in capabilities_by_module.items():
+                new_ids = {cap.id for cap in capabilities}
+                for cap_id in self._module_ids.get(module_name, ()):
+                    # IDs since re-registered from another module stay with that module.
+                    if cap_id in new_ids or self._owners.get(cap_id) != module_name:
+                        continue
+                    del self._owners[cap_id]
+                    self._invokers.pop(cap_id, None)
+                    old = registry.pop(cap_id, None)
+                    if old is not None:
+                        self._unindex(old)
+                for capability in capabilities:
+                    capability = self._hoisted(capability)
+                    invoker = invokers.get(capability.id)
+                    old = registry.get(capability.id)
+                    if old is not None:
+                        self._unindex(old)
+                    registry[capability.id] = capability
+                    self._index(capability)
+                    if invoker is not None:
+                        self._invokers[capability.id] = (capability, invoker)
+                    else:
+                        self._invokers.pop(capability.id, None)
+                    self._claim(capability.id, module_name)
+                self._module_ids[module_name] = [cap.id for cap in capabilities]
+            self._catalog = None
+
+    def module_names(self) -> List[str]:
         """
-        if capability.id in self._registry:
-            # Optionally raise an error or log a warning if a capability is registered twice
-            # For now, let's allow re-registration to simplify, but in a robust system, this needs thought.
-            pass 
-        self._registry[capability.id] = capability
+        Returns the names of the modules capabilities were registered from.
+        """
+        return list(self._module_ids)
+
+    def clear(self):
+        """
+        Removes every registered capability, index entry and hoisted schema.
+        """
+        with self._write_lock:
+            self._registry = {}
+            self.schema_defs.clear()
+            self._by_input_property.clear()
+            self._by_output.clear()
+            self._by_tag.clear()
+            self._id_trie = _PrefixTrie()
+            self._module_ids.clear()
+            self._owners.clear()
+            self._invokers.clear()
+            self._catalog = None
+            self._serialized.clear()
+
+    @staticmethod
+    def _output_keys(capability: Capability) -> List[str]:
+        """
+        Returns the output index keys of a capability: its output schema's
+        title, type and, for hoisted schemas, the referenced definition name.
+        """
+        schema = capability.output_schema
+        keys = [schema[k] for k in ("title", "type") if isinstance(schema.get(k), str)]
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            keys.append(ref.rsplit("/", 1)[-1])
+        return keys
+
+    def _index_entries(self, capability: Capability):
+        properties = capability.input_schema.get("properties") or {}
+        yield from ((self._by_input_property, name) for name in properties)
+        yield from ((self._by_output, key) for key in self._output_keys(capability))
+        yield from ((self._by_tag, tag) for tag in capability.tags)
+
+    def _index(self, capability: Capability):
+        for index, key in self._index_entries(capability):
+            index.setdefault(key, {})[capability.id] = capability
+        self._id_trie.insert(capability.id)
+
+    def _unindex(self, capability: Capability):
+        for index, key in self._index_entries(capability):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(capability.id, None)
+                if not bucket:
+                    del index[key]
+        self._id_trie.remove(capability.id)
+        self._serialized.pop(capability.id, None)
 
     def get(self, capability_id: str) -> Optional[Capability]:
         """
         Retrieves a capability by its ID.
         """
+        self.ensure_discovered()
         return self._registry.get(capability_id)
 
     def describe_all(self) -> List[Capability]:
         """
         Returns a list of all registered capabilities.
         """
-        return list(self._registry.values())
+        self.ensure_discovered()
+        with self._write_lock:
+            return list(self._registry.values())
+
+    def _lookup(self, index: Dict[str, Dict[str, Capability]], key: str) -> List[Capability]:
+        self.ensure_discovered()
+        with self._write_lock:
+            bucket = index.get(key)
+            return list(bucket.values()) if bucket else []
+
+    def find_by_input_property(self, name: str) -> List[Capability]:
+        """
+        Returns the capabilities whose input schema has a top-level property `name`.
+        """
+        return self._lookup(self._by_input_property, name)
+
+    def find_by_output(self, type_or_title: str) -> List[Capability]:
+        """
+        Returns the capabilities whose output schema has the given type (e.g. "string")
+        or model title (e.g. "SearchResult").
+        """
+        return self._lookup(self._by_output, type_or_title)
+
+    def find_by_tag(self, tag: str) -> List[Capability]:
+        """
+        Returns the capabilities carrying `tag`.
+        """
+        return self._lookup(self._by_tag, tag)
+
+    def find_by_id_prefix(self, prefix: str) -> List[Capability]:
+        """
+        Returns the capabilities whose ID starts with `prefix`, sorted by ID.
+        """
+        self.ensure_discovered()
+        with self._write_lock:
+            registry = self._registry
+            return [registry[cap_id] for cap_id in self._id_trie.with_prefix(prefix)]
+
+    def _resolve_invoker(self, capability: Capability) -> Optional["CapabilityInvoker"]:
+        """
+        Compiles an invoker for a capability registered without a target (e.g. from
+        the manifest cache or a process pool) by importing its module.
+        """
+        module_name = self._owners.get(capability.id)
+        if module_name is None:
+            return None
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
+        for obj in vars(module).values():
+            if getattr(obj, '_is_uhp_capability', False) and getattr(obj, '__name__', None) == capability.id:
+                from uhp.capabilities.invoker import CapabilityInvoker
+
+                invoker = CapabilityInvoker(capability.id, obj)
+                with self._write_lock:
+                    if self._registry.get(capability.id) is capability:
+                        self._invokers[capability.id] = (capability, invoker)
+                return invoker
+        return None
+
+    def get_invoker(self, capability_id: str) -> "CapabilityInvoker":
+        """
+        Returns the compiled invoker of a capability.
+
+        Raises:
+            CapabilityNotFound: If the capability is unknown or has no invocable target.
+        """
+        self.ensure_discovered()
+        capability = self._registry.get(capability_id)
+        if capability is None:
+            raise CapabilityNotFound(capability_id=capability_id)
+        entry = self._invokers.get(capability_id)
+        if entry is not None and entry[0] is capability:
+            return entry[1]
+        invoker = self._resolve_invoker(capability)
+        if invoker is None:
+            raise CapabilityNotFound(capability_id=capability_id)
+        return invoker
+
+    def invoke(self, capability_id: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Validates `payload` against a capability's signature and runs it.
+
+        Raises:
+            CapabilityNotFound: If the capability is unknown or has no invocable target.
+            InvalidCapabilityPayload: If the payload does not match the signature.
+        """
+        return self.get_invoker(capability_id)(payload)
+
+    def _get_invoke_executor(self) -> "ThreadPoolExecutor":
+        if self._invoke_executor is None:
+            with self._write_lock:
+                if self._invoke_executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._invoke_executor = ThreadPoolExecutor(
+                        max_workers=self.invoke_max_workers, thread_name_prefix="uhp-capability")
+        return self._invoke_executor
+
+    async def ainvoke(self, capability_id: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Invokes a capability from asyncio code. Coroutine targets are awaited
+        directly; sync targets run on a bounded thread pool so they do not
+        block the event loop.
+
+        Raises:
+            CapabilityNotFound: If the capability is unknown or has no invocable target.
+            InvalidCapabilityPayload: If the payload does not match the signature.
+        """
+        invoker = self.get_invoker(capability_id)
+        if invoker.is_coroutine:
+            return await invoker(payload)
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_invoke_executor(), invoker, payload)
+
+    async def ainvoke_many(self, requests: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+                           concurrency: int = 16) -> List[Any]:
+        """
+        Invokes many capabilities with at most `concurrency` calls in flight.
+
+        Args:
+            requests: `(capability_id, payload)` pairs.
+            concurrency: Maximum number of calls running at once.
+
+        Returns:
+            One entry per request, in request order: the call's result, or a
+            UHPError describing why it failed. A failing call never aborts the
+            batch; exceptions raised by targets are wrapped in CapabilityExecutionError.
+
+        Raises:
+            ValueError: If `concurrency` is less than 1.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}.")
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(capability_id: str, payload: Optional[Dict[str, Any]]) -> Any:
+            async with semaphore:
+                try:
+                    return await self.ainvoke(capability_id, payload)
+                except UHPError as e:
+                    return e
+                except Exception as e:
+                    return CapabilityExecutionError(capability_id=capability_id, error=e)
+
+        return await asyncio.gather(*(run(capability_id, payload) for capability_id, payload in requests))
+
+    def invoke_many(self, requests: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+                    concurrency: int = 16) -> List[Any]:
+        """
+        Synchronous form of `ainvoke_many` for code without a running event loop.
+        """
+        import asyncio
+
+        return asyncio.run(self.ainvoke_many(requests, concurrency))
+
+    def _serialize(self, capability: Capability) -> bytes:
+        cached = self._serialized.get(capability.id)
+        if cached is not None and cached[0] is capability:
+            return cached[1]
+        data = capability.model_dump_json().encode("utf-8")
+        self._serialized[capability.id] = (capability, data)
+        return data
+
+    def _build_catalog(self) -> Tuple[bytes, str]:
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
+        with self._write_lock:
+            if self._catalog is None:
+                import hashlib
+
+                parts = [b'{"capabilities":[', b",".join(self._serialize(cap) for cap in self._registry.values()), b"]"]
+                if self.schema_defs:
+                    parts.append(b',"$defs":' + json.dumps(self.schema_defs, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+                parts.append(b"}")
+                body = b"".join(parts)
+                self._catalog = (body, f'"{hashlib.sha256(body).hexdigest()}"')
+            return self._catalog
+
+    def catalog_json(self) -> bytes:
+        """
+        Returns the whole catalog, `{"capabilities": [...]}` plus `$defs` when
+        schemas are hoisted, as pre-serialized JSON bytes. The bytes are
+        rebuilt only after a registration change.
+        """
+        self.ensure_discovered()
+        return self._build_catalog()[0]
+
+    def catalog_etag(self) -> str:
+        """
+        Returns a quoted content hash of `catalog_json()`, suitable as an HTTP ETag.
+        """
+        self.ensure_discovered()
+        return self._build_catalog()[1]
+
+    def get_catalog(self, if_none_match: Optional[str] = None) -> Tuple[str, Optional[bytes]]:
+        """
+        Returns `(etag, body)`, or `(etag, None)` when `if_none_match` is the
+        current ETag and the client can keep its copy.
+        """
+        self.ensure_discovered()
+        body, etag = self._build_catalog()
+        if if_none_match == etag:
+            return etag, None
+        return etag, body
+
+    def iter_catalog_ndjson(self) -> Iterator[bytes]:
+        """
+        Streams the catalog as newline-delimited JSON, one capability per line.
+        When schemas are hoisted, a leading `{"$defs": {...}}` line carries the
+        definitions the capabilities' `$ref`s point to. The set of capabilities
+        and definitions is fixed when iteration starts.
+        """
+        self.ensure_discovered()
+        with self._write_lock:
+            capabilities = list(self._registry.values())
+            schema_defs = json.dumps(self.schema_defs, separators=(",", ":"), sort_keys=True) if self.schema_defs else None
+        if schema_defs is not None:
+            yield b'{"$defs":' + schema_defs.encode("utf-8") + b"}\n"
+        for capability in capabilities:
+            yield self._serialize(capability) + b"\n"
+
+    def describe_schema_defs(self) -> Dict[str, Any]:
+        """
+        Returns the registry-level `$defs` section that hoisted capability schemas point to.
+        """
+        self.ensure_discovered()
+        with self._write_lock:
+            return dict(self.schema_defs)
 
 # Create a module-level instance of the registry to ensure it's a singleton (or at least, its state is shared)
 capability_registry = _CapabilityRegistry()
@@ -44,7 +553,7 @@ def process_and_register_capabilities_from_module(module: ModuleType):
     Scans a module for capabilities, converts them to `Capability` models,
     and registers them in the global `capability_registry`.
     """
-    discovered_capabilities = scan_for_capabilities(module)
-    for cap_model in discovered_capabilities:
-        capability_registry.register(cap_model)
+    discovered_capabilities = scan_for_capability_targets(module)
+    for cap_model, target in discovered_capabilities:
+        capability_registry.register(cap_model, module_name=module.__name__, target=target)
 
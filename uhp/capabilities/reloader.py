@@ -0,0 +1,157 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from uhp.capabilities.parallel import ModuleScanResult
+from uhp.capabilities.registry import _CapabilityRegistry, capability_registry
+from uhp.capabilities.scanner import scan_for_capability_targets
+
+
+def _module_file(module_name: str) -> Optional[str]:
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    return path if path and os.path.isfile(path) else None
+
+
+def _reexecute_module(module_name: str):
+    """
+    Executes a module's current source into a fresh module object and publishes
+    it in sys.modules only on success. Unlike importlib.reload, names removed
+    from the source do not linger, and a failed load leaves the old module intact.
+    """
+    spec = sys.modules[module_name].__spec__
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[module_name] = module
+    return module
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class CapabilityReloader:
+    """
+    Hot-reloads capability modules whose source files changed.
+
+    Each poll stats the tracked module files and only reloads and rescans the
+    ones whose mtime or size moved; their capabilities are then swapped into
+    the registry in one atomic step, so readers never see a partially rebuilt
+    registry. If a changed module fails to import or scan, its previous
+    capabilities stay registered and the failure is reported in the result.
+
+    Changes are detected by stat polling, which works on every platform
+    without extra dependencies.
+    """
+    def __init__(self, module_names: Optional[Iterable[str]] = None,
+                 registry: _CapabilityRegistry = capability_registry,
+                 interval: float = 1.0):
+        """
+        Args:
+            module_names: Modules to watch. Defaults to every module the
+                registry has registered capabilities from.
+            registry: Registry to update.
+            interval: Seconds between polls when running in the background.
+        """
+        self.registry = registry
+        self.interval = interval
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        for module_name in (module_names if module_names is not None else registry.module_names()):
+            self.track(module_name)
+
+    def track(self, module_name: str):
+        """
+        Starts watching a module, taking its current file state as the baseline.
+        """
+        path = _module_file(module_name)
+        self._stats[module_name] = _stat_key(path) if path else None
+
+    def untrack(self, module_name: str):
+        """
+        Stops watching a module. Its capabilities stay registered.
+        """
+        self._stats.pop(module_name, None)
+
+    def changed_modules(self) -> List[str]:
+        """
+        Returns the tracked modules whose files changed since they were last loaded.
+        """
+        changed = []
+        for module_name, known in self._stats.items():
+            path = _module_file(module_name)
+            if path is not None and _stat_key(path) != known:
+                changed.append(module_name)
+        return changed
+
+    def poll(self) -> List[ModuleScanResult]:
+        """
+        Reloads and rescans the changed modules and swaps their capabilities in.
+
+        Returns:
+            One ModuleScanResult per changed module; empty if nothing changed.
+        """
+        results: List[ModuleScanResult] = []
+        replacements = {}
+        targets = {}
+        for module_name in self.changed_modules():
+            path = _module_file(module_name)
+            # Record the new file state first so a broken edit is not retried until it changes again.
+            self._stats[module_name] = _stat_key(path)
+            start = time.perf_counter()
+            try:
+                module = _reexecute_module(module_name)
+                found = scan_for_capability_targets(module)
+            except Exception as e:
+                results.append(ModuleScanResult(
+                    module_name=module_name,
+                    duration_seconds=time.perf_counter() - start,
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                ))
+                continue
+            capabilities = [cap for cap, _ in found]
+            targets.update((cap.id, target) for cap, target in found)
+            replacements[module_name] = capabilities
+            results.append(ModuleScanResult(
+                module_name=module_name,
+                capabilities=capabilities,
+                duration_seconds=time.perf_counter() - start,
+            ))
+        if replacements:
+            self.registry.replace_modules(replacements, targets)
+        return results
+
+    def start(self):
+        """
+        Polls in a background daemon thread every `interval` seconds.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="uhp-capability-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread started by `start()`.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error during capability reload: {e}", file=sys.stderr)
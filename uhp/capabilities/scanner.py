@@ -1,13 +1,60 @@
+import copy
 import inspect
+import weakref
 from types import ModuleType
-from typing import Any, Dict, List, get_origin, get_args
+from typing import Any, Dict, List, Optional, Tuple, get_origin, get_args
 from pydantic import BaseModel # Import BaseModel
 
 from uhp.models.capability import Capability
 
 from uhp.capabilities.decorators import uhp_capability
 
-def _extract_schema_from_callable(obj) -> Dict[str, Any]:
+# Generated model schemas, keyed by model class. Weak keys let redefined or
+# unloaded models drop out. Callers get deep copies, so a capability whose
+# schema is modified does not affect later scans.
+_model_schema_cache: "weakref.WeakKeyDictionary[type, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def hoist_schema(schema: Dict[str, Any], schema_defs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Moves a model schema, and the nested definitions it carries in `$defs`,
+    into `schema_defs` and returns a `{"$ref": "#/$defs/<title>"}` pointer.
+
+    Schemas that are not model schemas (no title or no properties), or whose
+    definitions clash with a different schema already in `schema_defs`, are
+    returned unchanged.
+    """
+    name = schema.get("title")
+    if not isinstance(name, str) or "properties" not in schema:
+        return schema
+    definitions = dict(schema.get("$defs", {}))
+    definitions[name] = {k: v for k, v in schema.items() if k != "$defs"}
+    for def_name, definition in definitions.items():
+        existing = schema_defs.get(def_name)
+        if existing is not None and existing != definition:
+            return schema
+    schema_defs.update(definitions)
+    return {"$ref": f"#/$defs/{name}"}
+
+
+def _model_schema(model: type, schema_defs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Returns the JSON schema of a Pydantic model, generating it once per model.
+
+    When `schema_defs` is given, the schema is hoisted into it with
+    `hoist_schema` and a `$ref` pointer is returned instead.
+    """
+    schema = _model_schema_cache.get(model)
+    if schema is None:
+        schema = model.model_json_schema()
+        _model_schema_cache[model] = schema
+    schema = copy.deepcopy(schema)
+    if schema_defs is None:
+        return schema
+    return hoist_schema(schema, schema_defs)
+
+
+def _extract_schema_from_callable(obj, schema_defs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Extracts Pydantic-like JSON schema from a callable's signature.
     """
@@ -20,7 +67,7 @@ def _extract_schema_from_callable(obj) -> Dict[str, Any]:
             
             # If the parameter is a Pydantic model, use its schema directly
             if isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
-                schema["properties"][name] = param.annotation.model_json_schema()
+                schema["properties"][name] = _model_schema(param.annotation, schema_defs)
             elif param.annotation is not inspect.Parameter.empty:
                 # Basic type mapping for non-Pydantic annotated types
                 prop = {}
@@ -47,7 +94,7 @@ def _extract_schema_from_callable(obj) -> Dict[str, Any]:
                 schema["required"].append(name)
     return schema
 
-def _extract_return_schema_from_callable(obj) -> Dict[str, Any]:
+def _extract_return_schema_from_callable(obj, schema_defs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Extracts Pydantic-like JSON schema for a callable's return type.
     """
@@ -59,7 +106,7 @@ def _extract_return_schema_from_callable(obj) -> Dict[str, Any]:
     
     # Handle Pydantic models
     if isinstance(return_annotation, type) and issubclass(return_annotation, BaseModel):
-        return return_annotation.model_json_schema()
+        return _model_schema(return_annotation, schema_defs)
     # Basic type mapping for return
     elif return_annotation is str:
         return {"type": "string"}
@@ -78,11 +125,20 @@ def _extract_return_schema_from_callable(obj) -> Dict[str, Any]:
         # mechanism, e.g., return_annotation.model_json_schema() if it's a Pydantic model
         return {"type": "object"} # Default to object for more complex types
 
-def scan_for_capabilities(module: ModuleType) -> List[Capability]:
+def scan_for_capabilities(module: ModuleType, schema_defs: Optional[Dict[str, Any]] = None) -> List[Capability]:
     """
     Scans a given module for UHP capabilities marked with the uhp_capability decorator.
+    Pydantic model schemas are inlined, or hoisted into `schema_defs` and
+    referenced by `$ref` when that dict is given.
+    """
+    return [cap for cap, _ in scan_for_capability_targets(module, schema_defs)]
+
+def scan_for_capability_targets(module: ModuleType, schema_defs: Optional[Dict[str, Any]] = None) -> List[Tuple[Capability, Any]]:
+    """
+    Like `scan_for_capabilities`, but pairs each capability with the decorated
+    function or class it describes, so that it can be invoked.
     """
-    capabilities: List[Capability] = []
+    capabilities: List[Tuple[Capability, Any]] = []
     
     for name, obj in inspect.getmembers(module):
         if hasattr(obj, '_is_uhp_capability') and getattr(obj, '_is_uhp_capability'):
@@ -94,8 +150,8 @@ def scan_for_capabilities(module: ModuleType) -> List[Capability]:
             examples: List[Dict[str, Any]] = [] # Currently no way to extract from function/class directly
 
             if inspect.isfunction(obj):
-                input_schema = _extract_schema_from_callable(obj)
-                output_schema = _extract_return_schema_from_callable(obj)
+                input_schema = _extract_schema_from_callable(obj, schema_defs)
+                output_schema = _extract_return_schema_from_callable(obj, schema_defs)
             elif inspect.isclass(obj):
                 # For classes, assume the __init__ method defines inputs,
                 # and a special 'execute' method defines the primary action.
@@ -111,7 +167,7 @@ def scan_for_capabilities(module: ModuleType) -> List[Capability]:
                     for param in init_params:
                         # If the parameter is a Pydantic model, use its schema directly
                         if isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
-                            class_input_schema["properties"][param.name] = param.annotation.model_json_schema()
+                            class_input_schema["properties"][param.name] = _model_schema(param.annotation, schema_defs)
                         elif param.annotation is not inspect.Parameter.empty:
                             prop = {}
                             if param.annotation is str: prop["type"] = "string"
@@ -126,17 +182,19 @@ def scan_for_capabilities(module: ModuleType) -> List[Capability]:
                     input_schema = class_input_schema
                 
                 if hasattr(obj, 'execute') and inspect.isfunction(obj.execute):
-                    output_schema = _extract_return_schema_from_callable(obj.execute)
+                    output_schema = _extract_return_schema_from_callable(obj.execute, schema_defs)
 
 
-            capabilities.append(
+            capabilities.append((
                 Capability(
                     id=cap_id,
                     description=description,
                     input_schema=input_schema,
                     output_schema=output_schema,
-                    examples=examples
-                )
-            )
+                    examples=examples,
+                    tags=getattr(obj, '_uhp_capability_tags', [])
+                ),
+                obj
+            ))
             
     return capabilities
@@ -0,0 +1,9 @@
+from enum import IntEnum
+
+class TransitionResult(IntEnum):
+    OK = 0
+    NOT_ALLOWED = 1
+    INVALID_TARGET = 2
+    CONFLICT = 3
+    VETOED = 4
+    UNKNOWN_ENTITY = 5
@@ -59,3 +59,67 @@ class ConsentExpired(UHPError):
         self.expiration_date = expiration_date
         self.message = f"{message} Consent '{consent_id}' expired on {expiration_date.isoformat()}."
         super().__init__(self.message)
+
+class CapabilityNotFound(UHPError):
+    """
+    Exception raised when a capability cannot be found or has no invocable target.
+    Attributes:
+        capability_id -- the ID of the requested capability
+        message -- explanation of the error
+    """
+    def __init__(self, capability_id: str, message: str = "Capability not found."):
+        self.capability_id = capability_id
+        self.message = f"{message} No invocable capability '{capability_id}' is registered."
+        super().__init__(self.message)
+
+class InvalidCapabilityPayload(UHPError):
+    """
+    Exception raised when a capability payload does not match its input schema.
+    Attributes:
+        capability_id -- the ID of the invoked capability
+        errors -- the validation errors, as reported by pydantic
+        message -- explanation of the error
+    """
+    def __init__(self, capability_id: str, errors: list, message: str = "Invalid capability payload."):
+        self.capability_id = capability_id
+        self.errors = errors
+        self.message = f"{message} {len(errors)} validation error(s) for capability '{capability_id}'."
+        super().__init__(self.message)
+
+class CapabilityExecutionError(UHPError):
+    """
+    Exception raised when a capability's target fails while running.
+    Attributes:
+        capability_id -- the ID of the invoked capability
+        error_type -- the class name of the underlying exception
+        error_message -- the message of the underlying exception
+        message -- explanation of the error
+    """
+    def __init__(self, capability_id: str, error: BaseException, message: str = "Capability execution failed."):
+        self.capability_id = capability_id
+        self.error_type = type(error).__name__
+        self.error_message = str(error)
+        self.message = f"{message} Capability '{capability_id}' raised {self.error_type}: {self.error_message}"
+        super().__init__(self.message)
+        self.__cause__ = error
+
+class StateVersionConflict(UHPError):
+    """
+    Exception raised when a versioned state changed between read and write.
+    The operation can be retried after re-reading the current state.
+    Attributes:
+        entity_id -- the ID of the entity whose state was being changed
+        expected_version -- the version the caller based its change on
+        actual_version -- the version found in the store
+        message -- explanation of the error
+    """
+    retryable = True
+
+    def __init__(self, entity_id: str, expected_version: int, actual_version: int,
+                 message: str = "State version conflict."):
+        self.entity_id = entity_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        self.message = (f"{message} Entity '{entity_id}' is at version {actual_version}, "
+                        f"expected {expected_version}.")
+        super().__init__(self.message)
@@ -10,6 +10,7 @@ class Capability(BaseModel):
     input_schema: Dict[str, Any] = Field(..., description="JSON schema for the input parameters of the capability's operations.")
     output_schema: Dict[str, Any] = Field(..., description="JSON schema for the expected output of the capability's operations.")
     examples: List[Dict[str, Any]] = Field(default_factory=list, description="Practical examples demonstrating how an agent can invoke and interact with the capability.")
+    tags: List[str] = Field(default_factory=list, description="Optional labels used to group and look up capabilities.")
 
     model_config = {
         "frozen": True,  # Make instances immutable
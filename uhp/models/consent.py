@@ -1,3 +1,4 @@
+import time
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 from datetime import datetime
@@ -16,3 +17,15 @@ class Consent(BaseModel):
     purpose: Optional[List[str]] = Field(None, description="A list of specific purposes for which consent is granted.")
     granted_at: datetime = Field(..., description="The date and time the consent was granted.")
     revoked_at: Optional[datetime] = Field(None, description="The date and time the consent was revoked, if applicable.")
+    expires_at: Optional[datetime] = Field(None, description="The date and time after which the consent no longer applies, if any.")
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """
+        Returns whether the consent has expired at `now` (defaults to the current time).
+        Times are compared as epoch timestamps, as in ConsentExpiryScheduler, so
+        naive (local time) and aware datetimes can be mixed.
+        """
+        if self.expires_at is None:
+            return False
+        cutoff = time.time() if now is None else now.timestamp()
+        return self.expires_at.timestamp() <= cutoff
@@ -0,0 +1,199 @@
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from uhp.enums.consent_state import ConsentState
+from uhp.models.consent import Consent
+from uhp.privacy.expiry import Instant, _timestamp
+
+PairKey = Tuple[str, str]
+
+
+class ConsentStore:
+    """
+    An index of granted consents by (actor_id, target_id), for O(1) purpose checks.
+
+    Purposes are interned to bit positions the first time they are seen, and
+    each (actor, target) pair holds the union of the purposes of its granted
+    consents as one integer bitmask. `is_allowed` is therefore two dict
+    lookups and a bitwise AND, independent of how many purposes or consents
+    exist. Only masks are kept, not the Consent models.
+
+    Grants and revocations update the index incrementally. Reads do not lock;
+    writes are serialized. To drop consents when they lapse, pass `revoke_many`
+    as the `on_expire` callback of a ConsentExpiryScheduler.
+    """
+    def __init__(self, consents: Iterable[Consent] = ()):
+        self._lock = threading.Lock()
+        self._purpose_bits: Dict[str, int] = {}
+        self._consents: Dict[str, Tuple[PairKey, int]] = {}
+        self._by_pair: Dict[PairKey, Dict[str, int]] = {}
+        self._masks: Dict[PairKey, int] = {}
+        self._expires: Dict[str, float] = {}
+        self._earliest: Dict[PairKey, float] = {}
+        for consent in consents:
+            self.add(consent)
+
+    def __len__(self) -> int:
+        return len(self._consents)
+
+    def __contains__(self, consent_id: str) -> bool:
+        return consent_id in self._consents
+
+    def _mask(self, purposes: Optional[Iterable[str]]) -> int:
+        mask = 0
+        bits = self._purpose_bits
+        for purpose in purposes or ():
+            bit = bits.get(purpose)
+            if bit is None:
+                bit = bits[purpose] = 1 << len(bits)
+            mask |= bit
+        return mask
+
+    def add(self, consent: Consent):
+        """
+        Indexes a consent, or updates it if its id is already known. Consents
+        that are not GRANTED, or have expired, are removed from the index.
+        """
+        if consent.state != ConsentState.GRANTED or consent.is_expired():
+            self.revoke(consent.consent_id)
+        else:
+            self.grant(consent.consent_id, consent.actor_id, consent.target_id, consent.purpose,
+                       consent.expires_at)
+
+    def grant(self, consent_id: str, actor_id: str, target_id: str, purposes: Optional[Iterable[str]],
+              expires_at: Optional[Instant] = None):
+        """
+        Records a granted consent for `purposes`, replacing any earlier grant with the same id.
+        `expires_at` is a datetime or seconds since the epoch; None never expires.
+        """
+        key = (actor_id, target_id)
+        expiry = None if expires_at is None else _timestamp(expires_at)
+        with self._lock:
+            mask = self._mask(purposes)
+            previous = self._consents.get(consent_id)
+            if previous is not None and previous[0] != key:
+                self._remove(consent_id)
+                previous = None
+            self._consents[consent_id] = (key, mask)
+            self._by_pair.setdefault(key, {})[consent_id] = mask
+            if expiry is None:
+                self._expires.pop(consent_id, None)
+            else:
+                self._expires[consent_id] = expiry
+            if previous is None:
+                self._masks[key] = self._masks.get(key, 0) | mask
+                if expiry is not None and expiry < self._earliest.get(key, float("inf")):
+                    self._earliest[key] = expiry
+            else:
+                # A re-grant may have dropped purposes or moved the expiry, so rebuild the pair.
+                self._refresh(key)
+
+    def revoke(self, consent_id: str) -> bool:
+        """
+        Removes a consent from the index. Returns False if it was not indexed.
+        """
+        with self._lock:
+            return self._remove(consent_id)
+
+    def revoke_many(self, consent_ids: Iterable[str]) -> int:
+        """
+        Removes many consents and returns how many were indexed.
+        """
+        with self._lock:
+            return sum(self._remove(consent_id) for consent_id in consent_ids)
+
+    def _remove(self, consent_id: str) -> bool:
+        entry = self._consents.pop(consent_id, None)
+        if entry is None:
+            return False
+        key = entry[0]
+        pair = self._by_pair[key]
+        del pair[consent_id]
+        self._expires.pop(consent_id, None)
+        if pair:
+            self._refresh(key)
+        else:
+            del self._by_pair[key]
+            del self._masks[key]
+            self._earliest.pop(key, None)
+        return True
+
+    def _refresh(self, key: PairKey):
+        # Rebuilds the purpose union and the earliest expiry of a pair.
+        mask = 0
+        earliest = None
+        for consent_id, consent_mask in self._by_pair[key].items():
+            mask |= consent_mask
+            expiry = self._expires.get(consent_id)
+            if expiry is not None and (earliest is None or expiry < earliest):
+                earliest = expiry
+        self._masks[key] = mask
+        if earliest is None:
+            self._earliest.pop(key, None)
+        else:
+            self._earliest[key] = earliest
+
+    def _split(self, key: PairKey, now: Optional[Instant]) -> Tuple[List[int], List[int]]:
+        # Masks of the pair's unexpired and expired consents; only called once an expiry has passed.
+        cutoff = _timestamp(now)
+        expires = self._expires
+        live: List[int] = []
+        expired: List[int] = []
+        for consent_id, mask in list(self._by_pair.get(key, {}).items()):
+            expiry = expires.get(consent_id)
+            (live if expiry is None or expiry > cutoff else expired).append(mask)
+        return live, expired
+
+    def _expiry_passed(self, key: PairKey, now: Optional[Instant]) -> bool:
+        earliest = self._earliest.get(key)
+        return earliest is not None and earliest <= _timestamp(now)
+
+    def is_allowed(self, actor_id: str, target_id: str, purpose: str, now: Optional[Instant] = None) -> bool:
+        """
+        Returns whether an unexpired granted consent of `actor_id` to
+        `target_id` covers `purpose` at `now` (defaults to the current time).
+        """
+        bit = self._purpose_bits.get(purpose)
+        key = (actor_id, target_id)
+        if bit is None or self._masks.get(key, 0) & bit == 0:
+            return False
+        if not self._expiry_passed(key, now):
+            return True
+        return any(mask & bit for mask in self._split(key, now)[0])
+
+    def has_consent(self, actor_id: str, target_id: str, now: Optional[Instant] = None) -> bool:
+        """
+        Returns whether `actor_id` has any unexpired granted consent for `target_id`.
+        """
+        key = (actor_id, target_id)
+        if key not in self._masks:
+            return False
+        return not self._expiry_passed(key, now) or bool(self._split(key, now)[0])
+
+    def is_expired(self, actor_id: str, target_id: str, purpose: Optional[str] = None,
+                   now: Optional[Instant] = None) -> bool:
+        """
+        Returns whether `actor_id` granted consents to `target_id` that have
+        all expired at `now`. With `purpose`, returns whether `purpose` was
+        granted only by expired consents.
+        """
+        key = (actor_id, target_id)
+        if not self._expiry_passed(key, now):
+            return False
+        live, expired = self._split(key, now)
+        if purpose is None:
+            return not live
+        bit = self._purpose_bits.get(purpose, 0)
+        return any(mask & bit for mask in expired) and not any(mask & bit for mask in live)
+
+    def purposes(self, actor_id: str, target_id: str, now: Optional[Instant] = None) -> FrozenSet[str]:
+        """
+        Returns the purposes granted by `actor_id` to `target_id` through unexpired consents.
+        """
+        key = (actor_id, target_id)
+        mask = self._masks.get(key, 0)
+        if self._expiry_passed(key, now):
+            mask = 0
+            for consent_mask in self._split(key, now)[0]:
+                mask |= consent_mask
+        return frozenset(purpose for purpose, bit in self._purpose_bits.items() if mask & bit)
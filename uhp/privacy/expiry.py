@@ -0,0 +1,171 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from uhp.enums.intent import IntentType
+from uhp.enums.transition_result import TransitionResult
+from uhp.errors import ConsentExpired
+from uhp.models.consent import Consent
+from uhp.state_machines.consent import ConsentStateMachine
+
+Instant = Union[datetime, float]
+
+
+def _timestamp(value: Optional[Instant]) -> float:
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class ExpiryBatch(NamedTuple):
+    """
+    The consents that came due in one `expire_due` call.
+    """
+    expired: List[str]  # Every consent whose expiry time passed, in expiry order
+    revoked: List[str]  # Those whose scheduled state machine moved to REVOKED
+
+
+class ConsentExpiryScheduler:
+    """
+    Tracks consent expiry times and revokes consents in bulk when they lapse.
+
+    Expiry times live in a dict, so checking a consent at access time is one
+    hash lookup, and in a min-heap keyed by expiry time, so `expire_due` only
+    touches the consents that are actually due instead of sweeping all of
+    them. Cancelled or rescheduled entries are left in the heap and skipped
+    when popped; the heap is rebuilt when they outnumber the live entries.
+
+    A consent keeps its expiry time after it has been expired, so `check`
+    keeps raising ConsentExpired for it until it is cancelled.
+    """
+    def __init__(self, on_expire: Optional[Callable[[List[str]], None]] = None):
+        """
+        Args:
+            on_expire: Called with the ids of each non-empty batch of expired
+                consents, for consents kept outside this scheduler (for
+                example in a StateStore or a BulkTransitionEngine array).
+        """
+        self.on_expire = on_expire
+        self._lock = threading.Lock()
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._machines: Dict[str, ConsentStateMachine] = {}
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def schedule(self, consent_id: str, expires_at: Instant,
+                 machine: Optional[ConsentStateMachine] = None):
+        """
+        Sets (or moves) the expiry time of a consent.
+
+        Args:
+            consent_id: The consent to track.
+            expires_at: Expiry time, as a datetime or seconds since the epoch.
+            machine: The consent's state machine, revoked by `expire_due`.
+        """
+        ts = _timestamp(expires_at)
+        with self._lock:
+            if self._expiry.get(consent_id) != ts:
+                self._expiry[consent_id] = ts
+                heapq.heappush(self._heap, (ts, consent_id))
+            if machine is not None:
+                self._machines[consent_id] = machine
+
+    def schedule_consent(self, consent: Consent, machine: Optional[ConsentStateMachine] = None) -> bool:
+        """
+        Schedules a Consent model by its `expires_at`. Returns False, without
+        scheduling, if the consent does not expire.
+        """
+        if consent.expires_at is None:
+            return False
+        self.schedule(consent.consent_id, consent.expires_at, machine)
+        return True
+
+    def cancel(self, consent_id: str):
+        """
+        Stops tracking a consent.
+        """
+        with self._lock:
+            self._expiry.pop(consent_id, None)
+            self._machines.pop(consent_id, None)
+            if len(self._heap) > 2 * len(self._expiry) + 1024:
+                self._compact()
+
+    def _compact(self):
+        expiry = self._expiry
+        self._heap = [(ts, consent_id) for ts, consent_id in self._heap if expiry.get(consent_id) == ts]
+        heapq.heapify(self._heap)
+
+    def expires_at(self, consent_id: str) -> Optional[datetime]:
+        """
+        Returns the expiry time of a consent, or None if it is not tracked.
+        """
+        ts = self._expiry.get(consent_id)
+        return None if ts is None else datetime.fromtimestamp(ts, timezone.utc)
+
+    def is_expired(self, consent_id: str, now: Optional[Instant] = None) -> bool:
+        """
+        Returns whether a tracked consent has expired at `now` (defaults to the current time).
+        """
+        ts = self._expiry.get(consent_id)
+        return ts is not None and ts <= _timestamp(now)
+
+    def check(self, consent_id: str, now: Optional[Instant] = None):
+        """
+        Raises ConsentExpired if the consent has expired at `now`.
+        """
+        ts = self._expiry.get(consent_id)
+        if ts is not None and ts <= _timestamp(now):
+            raise ConsentExpired(consent_id=consent_id, expiration_date=datetime.fromtimestamp(ts, timezone.utc))
+
+    def next_expiry(self) -> Optional[datetime]:
+        """
+        Returns the earliest pending expiry time, or None if nothing is pending.
+        """
+        with self._lock:
+            self._drop_stale()
+            return datetime.fromtimestamp(self._heap[0][0], timezone.utc) if self._heap else None
+
+    def _drop_stale(self):
+        heap, expiry = self._heap, self._expiry
+        while heap and expiry.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def expire_due(self, now: Optional[Instant] = None, limit: Optional[int] = None) -> ExpiryBatch:
+        """
+        Expires every consent due at `now`, oldest first.
+
+        Scheduled state machines are moved to REVOKED with `try_apply`, so
+        their observers run; machines that cannot be revoked (e.g. still
+        PENDING) are left as they are but still reported as expired.
+
+        Args:
+            now: The current time; defaults to the wall clock.
+            limit: Expire at most this many consents, leaving the rest for the next call.
+
+        Returns:
+            An ExpiryBatch with the expired and the revoked consent ids.
+        """
+        cutoff = _timestamp(now)
+        expired: List[str] = []
+        machines: List[Tuple[str, ConsentStateMachine]] = []
+        with self._lock:
+            heap, expiry = self._heap, self._expiry
+            while heap and heap[0][0] <= cutoff and (limit is None or len(expired) < limit):
+                ts, consent_id = heapq.heappop(heap)
+                if expiry.get(consent_id) != ts:
+                    continue
+                expired.append(consent_id)
+                machine = self._machines.pop(consent_id, None)
+                if machine is not None:
+                    machines.append((consent_id, machine))
+        revoked = [consent_id for consent_id, machine in machines
+                   if machine.try_apply(IntentType.REVOKE_CONSENT) is TransitionResult.OK]
+        if expired and self.on_expire is not None:
+            self.on_expire(expired)
+        return ExpiryBatch(expired=expired, revoked=revoked)
@@ -0,0 +1,125 @@
+import functools
+import hashlib
+import hmac
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Secret key of the default pseudonymizer, as hex. When unset, a random per-process
+# key is used and a warning is printed: set it wherever pseudonyms must match
+# across processes or restarts.
+PSEUDONYM_KEY_ENV_VAR = "UHP_PSEUDONYM_KEY"
+
+
+class Pseudonymizer:
+    """
+    Derives stable pseudonyms from identifiers with HMAC-SHA256 under a secret key.
+
+    The same value always maps to the same pseudonym under the same key, so
+    anonymized records can be correlated without revealing identities, and
+    rotating the key unlinks all earlier pseudonyms. The keyed HMAC state is
+    prepared once per key and copied for each value, and results are kept in
+    a bounded LRU cache, which is dropped on rotation.
+    """
+    def __init__(self, key: bytes, key_id: str = "1", cache_size: int = 65536, length: int = 32):
+        """
+        Args:
+            key: Secret HMAC key.
+            key_id: Label of the key, for callers that track rotations.
+            cache_size: Maximum number of cached pseudonyms.
+            length: Number of hex characters kept from the digest (at most 64).
+        """
+        self.cache_size = cache_size
+        self.length = length
+        self._lock = threading.Lock()
+        self.rotate(key, key_id)
+
+    def rotate(self, key: bytes, key_id: Optional[str] = None):
+        """
+        Switches to a new key and clears the cache.
+        """
+        base = hmac.new(key, digestmod=hashlib.sha256)
+        length = self.length
+
+        def compute(value: str) -> str:
+            h = base.copy()
+            h.update(value.encode("utf-8"))
+            return h.hexdigest()[:length]
+
+        with self._lock:
+            self.key_id = key_id if key_id is not None else getattr(self, "key_id", "1")
+            # Replaced as a whole, so concurrent callers use either the old or the new key.
+            self._cached = functools.lru_cache(maxsize=self.cache_size)(compute)
+
+    def pseudonym(self, value: Optional[str]) -> Optional[str]:
+        """
+        Returns the pseudonym of `value` (None stays None).
+        """
+        if value is None:
+            return None
+        return self._cached(value)
+
+    def pseudonym_map(self, values: Iterable[Optional[str]]) -> Dict[Optional[str], Optional[str]]:
+        """
+        Returns a dict from each distinct value to its pseudonym (None maps to
+        None). Each distinct value is hashed at most once per call, whatever
+        the cache size.
+        """
+        cached = self._cached
+        unique = {value: None for value in values if value is not None}
+        mapping: Dict[Optional[str], Optional[str]] = dict(zip(unique, map(cached, unique)))
+        mapping[None] = None
+        return mapping
+
+    def pseudonyms(self, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Returns the pseudonyms of many values, in order, hashing each distinct value once.
+        """
+        values = list(values)
+        mapping = self.pseudonym_map(values)
+        return [mapping[value] for value in values]
+
+    def cache_info(self):
+        """
+        Returns the hit/miss statistics of the cache, as functools.lru_cache reports them.
+        """
+        return self._cached.cache_info()
+
+
+_default: Optional[Pseudonymizer] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pseudonymizer() -> Pseudonymizer:
+    """
+    Returns the pseudonymizer used for ANONYMIZED visibility. Its key is read
+    from UHP_PSEUDONYM_KEY (hex). Without it, a random key is generated and a
+    warning is printed to stderr: pseudonyms are then only stable within the
+    process, so workers, replicas and restarts cannot correlate them. Set the
+    variable, or call `set_default_pseudonymizer` with an explicit key, in any
+    deployment with more than one process.
+    """
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                key_hex = os.environ.get(PSEUDONYM_KEY_ENV_VAR)
+                if key_hex:
+                    key = bytes.fromhex(key_hex)
+                else:
+                    print(f"Warning: {PSEUDONYM_KEY_ENV_VAR} is not set; using a random per-process "
+                          f"pseudonym key. Pseudonyms will not match across processes or restarts.",
+                          file=sys.stderr)
+                    key = os.urandom(32)
+                _default = Pseudonymizer(key)
+    return _default
+
+
+def set_default_pseudonymizer(pseudonymizer: Pseudonymizer):
+    """
+    Replaces the pseudonymizer used for ANONYMIZED visibility.
+    """
+    global _default
+    with _default_lock:
+        _default = pseudonymizer
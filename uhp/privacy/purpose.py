@@ -1,16 +1,122 @@
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
 from uhp.models.consent import Consent
 from uhp.enums.consent_state import ConsentState
-from uhp.errors import PrivacyViolation
+from uhp.errors import ConsentExpired, PrivacyViolation
+from uhp.privacy.consent_store import ConsentStore
+from uhp.privacy.expiry import _timestamp
 
 def assert_purpose_allowed(consent: Consent, purpose: str) -> bool:
     """
     Asserts if the given purpose is allowed based on the consent.
-    Raises a PrivacyViolation if the purpose is not allowed.
+    Raises a PrivacyViolation if the purpose is not allowed, or ConsentExpired
+    if the consent is past its expiry time.
     """
     if consent.state != ConsentState.GRANTED:
         raise PrivacyViolation(field="consent_state", reason=f"Consent '{consent.consent_id}' is not granted.")
 
+    if consent.is_expired():
+        raise ConsentExpired(consent_id=consent.consent_id, expiration_date=consent.expires_at)
+
     if not consent.purpose or purpose not in consent.purpose:
         raise PrivacyViolation(field="purpose", reason=f"Purpose '{purpose}' not granted in consent {consent.consent_id}")
 
     return True
+
+
+class PurposeDenial(NamedTuple):
+    """
+    Why one item of a batch check was denied. `field` matches the field of the
+    PrivacyViolation that assert_purpose_allowed would raise ("consent" when
+    there is no consent at all, "expires_at" for ConsentExpired).
+    """
+    index: int
+    consent_id: Optional[str]
+    field: str
+    reason: str
+
+
+class PurposeCheckResult(NamedTuple):
+    """
+    The outcome of `check_purposes`: one flag per consent and the denials.
+    """
+    allowed: List[bool]
+    denials: List[PurposeDenial]
+
+
+def check_purposes(consents: Iterable[Consent], purpose: str,
+                   now: Optional[datetime] = None) -> PurposeCheckResult:
+    """
+    Applies the rules of assert_purpose_allowed to many consents without
+    raising: each denied consent adds a PurposeDenial instead of an exception.
+
+    Args:
+        consents: The consents to check.
+        purpose: The purpose every consent must cover.
+        now: Time used for expiry checks; defaults to the current time. As in
+            ConsentExpiryScheduler, times are compared as epoch timestamps, so
+            naive and aware datetimes can be mixed (naive ones are local time).
+
+    Returns:
+        A PurposeCheckResult whose `allowed` mask has one entry per consent.
+    """
+    cutoff = _timestamp(now)
+    allowed: List[bool] = []
+    denials: List[PurposeDenial] = []
+    for index, consent in enumerate(consents):
+        if consent.state != ConsentState.GRANTED:
+            denials.append(PurposeDenial(index, consent.consent_id, "consent_state", "not_granted"))
+            allowed.append(False)
+            continue
+        expires_at = consent.expires_at
+        if expires_at is not None and expires_at.timestamp() <= cutoff:
+            denials.append(PurposeDenial(index, consent.consent_id, "expires_at", "expired"))
+            allowed.append(False)
+            continue
+        if not consent.purpose or purpose not in consent.purpose:
+            denials.append(PurposeDenial(index, consent.consent_id, "purpose", "purpose_not_granted"))
+            allowed.append(False)
+            continue
+        allowed.append(True)
+    return PurposeCheckResult(allowed, denials)
+
+
+def _pair(item: Any) -> Tuple[str, str]:
+    return item[0], item[1]
+
+
+def filter_allowed(items: Iterable[Any], purpose: str, store: ConsentStore,
+                   key: Callable[[Any], Tuple[str, str]] = _pair,
+                   denials: Optional[List[PurposeDenial]] = None,
+                   now: Optional[datetime] = None) -> Iterator[Any]:
+    """
+    Lazily yields the items whose consent in `store` covers `purpose`.
+    Expired consents allow nothing, as in check_purposes.
+
+    Args:
+        items: Items to filter, e.g. candidates.
+        purpose: The purpose to check.
+        store: ConsentStore holding the granted consents.
+        key: Returns the (actor_id, target_id) pair of an item. By default each
+            item is such a pair.
+        denials: If given, a PurposeDenial is appended for each item filtered
+            out, with its index in `items`.
+        now: Time used for expiry checks; defaults to the current time.
+    """
+    is_allowed = store.is_allowed
+    for index, item in enumerate(items):
+        actor_id, target_id = key(item)
+        if is_allowed(actor_id, target_id, purpose, now):
+            yield item
+        elif denials is not None:
+            # Expiry is reported before missing purposes, in the order of check_purposes.
+            if store.has_consent(actor_id, target_id, now):
+                if store.is_expired(actor_id, target_id, purpose, now):
+                    denials.append(PurposeDenial(index, None, "expires_at", "expired"))
+                else:
+                    denials.append(PurposeDenial(index, None, "purpose", "purpose_not_granted"))
+            elif store.is_expired(actor_id, target_id, now=now):
+                denials.append(PurposeDenial(index, None, "expires_at", "expired"))
+            else:
+                denials.append(PurposeDenial(index, None, "consent", "no_consent"))
@@ -1,33 +1,307 @@
+import enum
+import threading
+import typing
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, EmailStr
+
 from uhp.enums.visibility import VisibilityLevel
 from uhp.models.job import Job
 from uhp.models.candidate import CandidateProfile
 from uhp.models.application import Application
 from uhp.models.consent import Consent
-from typing import Any, Dict
+from uhp.privacy.pseudonym import get_default_pseudonymizer
+
+Projection = Callable[..., Dict[str, Any]]
+JsonSerializer = Callable[[Any], bytes]
+
+# Fields visible per model and visibility level. None means every field; a
+# level that is not listed shows nothing, so new levels are private by default.
+VISIBILITY_POLICIES: Dict[Type[BaseModel], Dict[VisibilityLevel, Optional[Tuple[str, ...]]]] = {
+    Job: {
+        VisibilityLevel.PUBLIC: None,
+        VisibilityLevel.ANONYMIZED: None,
+    },
+    CandidateProfile: {
+        VisibilityLevel.PUBLIC: None,
+        VisibilityLevel.ANONYMIZED: ("skills", "is_open_to_remote"),
+    },
+    Application: {
+        VisibilityLevel.PUBLIC: None,
+        VisibilityLevel.ANONYMIZED: ("job_id", "status", "submission_date"),
+    },
+    Consent: {
+        VisibilityLevel.PUBLIC: None,
+        VisibilityLevel.ANONYMIZED: ("target_id", "state", "purpose", "granted_at", "revoked_at", "expires_at"),
+    },
+}
+
+# Identifying fields replaced by keyed-hash pseudonyms, per model and level,
+# so that records stay correlatable without revealing who they belong to.
+PSEUDONYMIZED_FIELDS: Dict[Type[BaseModel], Dict[VisibilityLevel, Tuple[str, ...]]] = {
+    CandidateProfile: {VisibilityLevel.ANONYMIZED: ("candidate_id", "email")},
+    Application: {VisibilityLevel.ANONYMIZED: ("candidate_id",)},
+    Consent: {VisibilityLevel.ANONYMIZED: ("actor_id",)},
+}
+
+_SCALARS = (str, int, float, bool, date, datetime, time, EmailStr, type(None))
+
+_projections: Dict[Tuple[type, VisibilityLevel], Projection] = {}
+_json_serializers: Dict[Tuple[type, VisibilityLevel], JsonSerializer] = {}
+_lock = threading.Lock()
+
+
+def _empty(data: Any, _p: Any = None) -> Dict[str, Any]:
+    return {}
+
+
+def _pseudonymize(value: Any) -> Any:
+    # Resolves the default pseudonymizer per call, so replacing it takes effect at once.
+    return get_default_pseudonymizer().pseudonym(value)
+
+
+def _is_scalar(tp: Any) -> bool:
+    return tp in _SCALARS or (isinstance(tp, type) and issubclass(tp, enum.Enum))
+
+
+def _unwrap_optional(tp: Any) -> Tuple[Any, bool]:
+    args = typing.get_args(tp)
+    if typing.get_origin(tp) is typing.Union and type(None) in args and len(args) == 2:
+        return next(arg for arg in args if arg is not type(None)), True
+    return tp, False
+
+
+def _field_expression(name: str, annotation: Any) -> Optional[str]:
+    """
+    Returns a Python expression reading field `name` of `o` the way
+    `model_dump()` would, or None if the field needs pydantic to dump it.
+    """
+    tp, optional = _unwrap_optional(annotation)
+    if _is_scalar(tp):
+        return f"o.{name}"
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin in (list, dict) and all(_is_scalar(arg) for arg in args):
+        # Copy containers, as model_dump does, so callers cannot mutate the model.
+        copy = f"{origin.__name__}(o.{name})"
+        return f"(None if o.{name} is None else {copy})" if optional else copy
+    return None
+
+
+def _compile(model_cls: Type[BaseModel], fields: Optional[Tuple[str, ...]],
+             pseudonymized: Tuple[str, ...] = ()) -> Projection:
+    """
+    Builds a function returning the given fields of a `model_cls` instance as
+    a dict equal to the matching part of `model_dump()`, with `pseudonymized`
+    fields replaced by their pseudonyms and moved last. Fields of simple types are read
+    directly; if any field needs pydantic, the projection uses
+    `model_dump(include=...)` instead. The projection's optional second
+    argument maps values to pseudonyms; it defaults to the default
+    pseudonymizer.
+    """
+    model_fields = model_cls.model_fields
+    pseudonymized = tuple(name for name in pseudonymized if name in model_fields)
+    names = tuple(name for name in model_fields
+                  if (fields is None or name in fields) and name not in pseudonymized) + pseudonymized
+    if not names:
+        return _empty
+    expressions = [f"_p(o.{name})" if name in pseudonymized else
+                   _field_expression(name, model_fields[name].annotation) for name in names]
+    if any(expression is None for expression in expressions):
+        include = frozenset(name for name in names if name not in pseudonymized)
+
+        def project(o, _p=_pseudonymize):
+            data = o.model_dump(include=include)
+            for name in pseudonymized:
+                data[name] = _p(getattr(o, name))
+            return data
+        return project
+    items = ", ".join(f"{name!r}: {expression}" for name, expression in zip(names, expressions))
+    source = f"def project(o, _p=_p):\n    return {{{items}}}\n"
+    namespace: Dict[str, Any] = {"_p": _pseudonymize}
+    exec(compile(source, f"<uhp projection {model_cls.__name__}>", "exec"), namespace)
+    return namespace["project"]
+
+
+def register_visibility_policy(model_cls: Type[BaseModel],
+                               policy: Dict[VisibilityLevel, Optional[Iterable[str]]],
+                               pseudonymized: Optional[Dict[VisibilityLevel, Iterable[str]]] = None):
+    """
+    Declares the fields of `model_cls` visible at each visibility level,
+    replacing any earlier policy. None means every field; unlisted levels
+    show nothing. `pseudonymized` lists, per level, fields shown as
+    pseudonyms instead of their values.
+    """
+    with _lock:
+        VISIBILITY_POLICIES[model_cls] = {
+            level: None if fields is None else tuple(fields) for level, fields in policy.items()
+        }
+        PSEUDONYMIZED_FIELDS[model_cls] = {
+            level: tuple(fields) for level, fields in (pseudonymized or {}).items()
+        }
+        for cache in (_projections, _json_serializers):
+            for key in [key for key in cache if issubclass(key[0], model_cls)]:
+                del cache[key]
+
+
+def get_projection(data_type: type, visibility_level: VisibilityLevel) -> Projection:
+    """
+    Returns the compiled projection of `data_type` at `visibility_level`,
+    compiling it on first use. Types without a policy (or whose base classes
+    have none) project to an empty dict.
+    """
+    key = (data_type, visibility_level)
+    projection = _projections.get(key)
+    if projection is not None:
+        return projection
+    with _lock:
+        policy = _policy_for(data_type)
+        if policy is None or visibility_level not in policy:
+            projection = _empty
+        else:
+            projection = _compile(data_type, policy[visibility_level],
+                                  _pseudonymized_for(data_type, visibility_level))
+        _projections[key] = projection
+    return projection
+
+
+def _policy_for(data_type: type) -> Optional[Dict[VisibilityLevel, Optional[Tuple[str, ...]]]]:
+    for cls in data_type.__mro__:
+        policy = VISIBILITY_POLICIES.get(cls)
+        if policy is not None:
+            return policy
+    return None
+
+
+def _pseudonymized_for(data_type: type, visibility_level: VisibilityLevel) -> Tuple[str, ...]:
+    for cls in data_type.__mro__:
+        if cls in VISIBILITY_POLICIES:
+            return PSEUDONYMIZED_FIELDS.get(cls, {}).get(visibility_level, ())
+    return ()
+
+
+def get_json_serializer(data_type: type, visibility_level: VisibilityLevel) -> JsonSerializer:
+    """
+    Returns a function serializing the visible fields of a `data_type`
+    instance straight to JSON bytes, equal to serializing the output of
+    `filter_visible_fields`. Models use their precompiled pydantic
+    serializer with an `include` set, so no intermediate dict is built;
+    pseudonyms are appended to its output, after the other fields.
+    """
+    key = (data_type, visibility_level)
+    serializer = _json_serializers.get(key)
+    if serializer is not None:
+        return serializer
+    with _lock:
+        policy = _policy_for(data_type)
+        fields = policy.get(visibility_level, ()) if policy is not None else ()
+        pseudonymized = _pseudonymized_for(data_type, visibility_level)
+        if pseudonymized and policy is not None and visibility_level in policy:
+            serializer = _pseudonymizing_serializer(data_type, fields, pseudonymized)
+        elif fields is not None and not fields:
+            serializer = lambda o: b"{}"
+        else:
+            model_to_json = data_type.__pydantic_serializer__.to_json
+            include = None if fields is None else set(fields)
+            serializer = lambda o: model_to_json(o, include=include)
+        _json_serializers[key] = serializer
+    return serializer
+
+
+def _pseudonymizing_serializer(data_type: type, fields: Optional[Tuple[str, ...]],
+                               pseudonymized: Tuple[str, ...]) -> JsonSerializer:
+    model_to_json = data_type.__pydantic_serializer__.to_json
+    model_fields = data_type.model_fields
+    pseudonymized = tuple(name for name in pseudonymized if name in model_fields)
+    include = {name for name in model_fields
+               if (fields is None or name in fields) and name not in pseudonymized}
+    # Field names are identifiers, so their JSON keys need no escaping.
+    keys = [(name, f'"{name}":'.encode()) for name in pseudonymized]
+
+    def serialize(o) -> bytes:
+        body = model_to_json(o, include=include)
+        parts = [body[:-1]]
+        separator = b"," if len(body) > 2 else b""
+        for name, key in keys:
+            value = _pseudonymize(getattr(o, name))
+            # Pseudonyms are hex digests, so they need no escaping either.
+            parts.append(separator + key + (b"null" if value is None else b'"' + value.encode() + b'"'))
+            separator = b","
+        parts.append(b"}")
+        return b"".join(parts)
+    return serialize
+
 
 def filter_visible_fields(data: Any, visibility_level: VisibilityLevel, consent: Consent) -> Dict:
     """
     Filters the fields of a data object based on the visibility level and consent.
-    This is a placeholder implementation.
-    """
-    if isinstance(data, Job):
-        if visibility_level == VisibilityLevel.PUBLIC:
-            return data.model_dump()
-        else: # PRIVATE
-            return {} # For now, return empty for private
-    elif isinstance(data, CandidateProfile):
-        if visibility_level == VisibilityLevel.PUBLIC:
-            return data.model_dump()
-        else: # PRIVATE
-            return {} # For now, return empty for private
-    elif isinstance(data, Application):
-        if visibility_level == VisibilityLevel.PUBLIC:
-            return data.model_dump()
-        else: # PRIVATE
-            return {} # For now, return empty for private
-    elif isinstance(data, Consent):
-        if visibility_level == VisibilityLevel.PUBLIC:
-            return data.model_dump()
-        else: # PRIVATE
-            return {} # For now, return empty for private
-    return {} # Default empty
+
+    The visible fields come from VISIBILITY_POLICIES and are read through a
+    projection compiled once per type and level, so the cost is proportional
+    to the number of visible fields. Unsupported types yield an empty dict.
+    """
+    return get_projection(type(data), visibility_level)(data)
+
+
+def filter_visible_fields_many(items: Iterable[Any], visibility_level: VisibilityLevel) -> List[Dict]:
+    """
+    Applies filter_visible_fields to many objects. Pseudonyms of the whole
+    batch are computed first in one pass over its distinct values and handed
+    to the projections, so each identifier is hashed once per call.
+    """
+    items = list(items)
+    values = [getattr(item, name) for item in items
+              for name in _pseudonymized_for(type(item), visibility_level)]
+    if not values:
+        return [get_projection(type(item), visibility_level)(item) for item in items]
+    lookup = get_default_pseudonymizer().pseudonym_map(values).__getitem__
+    return [get_projection(type(item), visibility_level)(item, lookup) for item in items]
+
+
+def iter_visible_json(items: Iterable[Any], visibility_level: VisibilityLevel, format: str = "ndjson",
+                      chunk_size: int = 65536) -> Iterator[bytes]:
+    """
+    Streams the visible fields of many objects as JSON bytes.
+
+    Each object is serialized directly from its model by the serializer of
+    `get_json_serializer`, and output is yielded in chunks of about
+    `chunk_size` bytes, so memory stays flat however many items there are.
+
+    Args:
+        items: Models to serialize, e.g. CandidateProfile or Application
+            objects; types may be mixed.
+        visibility_level: Visibility applied to every item.
+        format: "ndjson" for one JSON object per line, or "json" for a single
+            JSON array.
+        chunk_size: Approximate size of the yielded chunks, in bytes.
+
+    Raises:
+        ValueError: If `format` is unknown.
+    """
+    if format not in ("ndjson", "json"):
+        raise ValueError(f"Unknown format '{format}'. Expected 'ndjson' or 'json'.")
+    array = format == "json"
+    separator = b"," if array else b"\n"
+    serializers: Dict[type, JsonSerializer] = {}
+    buffer = bytearray(b"[" if array else b"")
+    first = True
+    for item in items:
+        data_type = type(item)
+        serializer = serializers.get(data_type)
+        if serializer is None:
+            serializer = serializers[data_type] = get_json_serializer(data_type, visibility_level)
+        if array:
+            if not first:
+                buffer += separator
+            first = False
+            buffer += serializer(item)
+        else:
+            buffer += serializer(item)
+            buffer += separator
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if array:
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
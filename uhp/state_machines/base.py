@@ -1,21 +1,164 @@
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+from uhp.enums.transition_result import TransitionResult
 from uhp.errors import InvalidStateTransitionError
 
 class UhpStateMachine:
     """
     Base class for all UHP state machines.
+
+    Subclasses declare `transition_map` once, at class level, mapping each state
+    to the actions allowed from it. The map is compiled into frozensets when the
+    subclass is created, so a transition check is a single hash lookup and
+    instances hold nothing but their current state. `intent_targets` lists the
+    states each action can lead to, the first being the default.
+
+    Hooks are registered per class and are not inherited by subclasses:
+    pre-transition hooks run before a change and veto it by returning False,
+    observers run after it, and batch observers receive whole batches from
+    BulkTransitionEngine. A class without hooks pays one empty-tuple check
+    per transition.
     """
+    __slots__ = ("current_state",)
+
+    transition_map: Dict[Any, Iterable[Any]] = {}
+    intent_targets: Dict[Any, Tuple[Any, ...]] = {}
+    _allowed_actions: Dict[Any, FrozenSet[Any]] = {}
+    # Tuples, so dispatch iterates a snapshot and registration never races it.
+    _pre_hooks: Tuple[Callable, ...] = ()
+    _observers: Tuple[Callable, ...] = ()
+    _batch_observers: Tuple[Callable, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._allowed_actions = {
+            state: frozenset(actions) for state, actions in cls.transition_map.items()
+        }
+        cls._pre_hooks = cls._observers = cls._batch_observers = ()
+
+    @classmethod
+    def add_pre_transition_hook(cls, hook: Callable) -> Callable:
+        """
+        Registers `hook(machine, intent, from_state, to_state)`, called before
+        each allowed transition of this class. Returning False vetoes the
+        transition. Returns the hook, so it can be used as a decorator.
+        """
+        cls._pre_hooks += (hook,)
+        return hook
+
+    @classmethod
+    def add_observer(cls, observer: Callable) -> Callable:
+        """
+        Registers `observer(machine, intent, from_state, to_state)`, called
+        after each transition of this class. Returns the observer.
+        """
+        cls._observers += (observer,)
+        return observer
+
+    @classmethod
+    def add_batch_observer(cls, observer: Callable) -> Callable:
+        """
+        Registers `observer(engine, intent, indices, from_codes, to_state)`,
+        called once per BulkTransitionEngine.apply with the rows that changed.
+        Returns the observer.
+        """
+        cls._batch_observers += (observer,)
+        return observer
+
+    @classmethod
+    def remove_hook(cls, hook: Callable):
+        """
+        Unregisters a pre-transition hook, observer or batch observer.
+        """
+        cls._pre_hooks = tuple(h for h in cls._pre_hooks if h is not hook)
+        cls._observers = tuple(h for h in cls._observers if h is not hook)
+        cls._batch_observers = tuple(h for h in cls._batch_observers if h is not hook)
+
     def __init__(self):
-        self.transition_map = {}
         self.current_state = None
 
+    def _allowed(self) -> Iterable[Any]:
+        transition_map = self.transition_map
+        if transition_map is type(self).transition_map:
+            return self._allowed_actions.get(self.current_state, ())
+        # A map assigned on the instance, which the class-level compilation cannot see.
+        return transition_map.get(self.current_state, [])
+
+    def can_apply(self, intent: Any) -> bool:
+        """
+        Returns whether `intent` is allowed from the current state.
+        """
+        return intent in self._allowed()
+
+    def try_apply(self, intent: Any, target: Optional[Any] = None) -> TransitionResult:
+        """
+        Applies `intent` if it is allowed, without raising.
+
+        Args:
+            intent: The intent to apply.
+            target: Destination state. Required for intents with several
+                possible outcomes (e.g. GRANTED or DENIED for PROPOSE_CONSENT);
+                intents with a single outcome default to it.
+
+        Returns:
+            TransitionResult.OK if the state changed, otherwise the reason it
+            did not. A missing target for an intent with several outcomes
+            gives INVALID_TARGET.
+        """
+        if intent not in self._allowed():
+            return TransitionResult.NOT_ALLOWED
+        targets = self.intent_targets.get(intent, ())
+        if target is None:
+            if len(targets) != 1:
+                return TransitionResult.INVALID_TARGET
+            target = targets[0]
+        elif target not in targets:
+            return TransitionResult.INVALID_TARGET
+        if not (self._pre_hooks or self._observers):
+            self.current_state = target
+            return TransitionResult.OK
+        return self._apply_with_hooks(intent, target)
+
+    def _apply_with_hooks(self, intent: Any, target: Any) -> TransitionResult:
+        from_state = self.current_state
+        for hook in self._pre_hooks:
+            if hook(self, intent, from_state, target) is False:
+                return TransitionResult.VETOED
+        self.current_state = target
+        # Observers run after the change; an observer that raises does not undo it.
+        for observer in self._observers:
+            observer(self, intent, from_state, target)
+        return TransitionResult.OK
+
+    def apply(self, intent: Any, target: Optional[Any] = None):
+        """
+        Applies `intent`, raising if it is not allowed.
+
+        Raises:
+            InvalidStateTransitionError: If the intent is not allowed from the
+                current state, or `target` is not one of its outcomes.
+        """
+        result = self.try_apply(intent, target)
+        if result is not TransitionResult.OK:
+            self._raise_for(result, intent, target)
+
+    def _raise_for(self, result: TransitionResult, intent: Any, target: Optional[Any] = None):
+        if result is TransitionResult.INVALID_TARGET and target is None:
+            message = f"Action '{intent}' requires a target state."
+        elif result is TransitionResult.INVALID_TARGET:
+            message = f"Action '{intent}' cannot lead to state '{target}'."
+        elif result is TransitionResult.VETOED:
+            message = f"Action '{intent}' was vetoed by a pre-transition hook."
+        else:
+            message = f"Action '{intent}' is not allowed from state '{self.current_state}'."
+        raise InvalidStateTransitionError(
+            current_state=self.current_state,
+            intended_action=intent,
+            message=message
+        )
+
     def _enforce_transition(self, action: str):
         """
         Checks if a transition is valid and raises an error if not.
         """
-        allowed_actions = self.transition_map.get(self.current_state, [])
-        if action not in allowed_actions:
-            raise InvalidStateTransitionError(
-                current_state=self.current_state,
-                intended_action=action,
-                message=f"Action '{action}' is not allowed from state '{self.current_state}'."
-            )
+        if action not in self._allowed():
+            self._raise_for(TransitionResult.NOT_ALLOWED, action)
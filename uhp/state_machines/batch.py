@@ -0,0 +1,116 @@
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, MutableMapping, NamedTuple, Optional, Sequence, Type
+
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.base import UhpStateMachine
+
+_OK = TransitionResult.OK
+_UNKNOWN_ENTITY = TransitionResult.UNKNOWN_ENTITY
+
+
+class BatchTransitionResult(NamedTuple):
+    """
+    The outcome of a batch of transitions, as parallel columns.
+
+    Row `i` is the `offset + i`-th request of the input stream.
+    """
+    offset: int
+    entity_ids: List[str]
+    states: List[Any]        # State after the row; unchanged if the row failed
+    codes: array             # TransitionResult values, one byte per row
+    failure_indices: array   # Rows whose code is not OK, relative to `offset`
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def counts(self) -> Dict[TransitionResult, int]:
+        """
+        Returns how many rows ended with each TransitionResult.
+        """
+        return {TransitionResult(code): n for code, n in Counter(self.codes).items()}
+
+
+class BatchTransitioner:
+    """
+    Applies (entity_id, intent) requests to many entities and reports the
+    outcome column-wise instead of raising one exception per rejected row.
+
+    Entity states are read from and written back to `states`, a mutable
+    mapping of entity id to state such as a dict. Rows are applied in order,
+    so an entity listed twice sees the result of its earlier row.
+    Transitions go through `try_apply` on one reused machine, so the class's
+    hooks and observers run as usual; since that machine stands for a
+    different entity on every row, pass `observer` to learn which entity
+    changed.
+    """
+    def __init__(self, machine_cls: Type[UhpStateMachine], states: MutableMapping[str, Any],
+                 observer: Optional[Callable[[str, Any, Any, Any], None]] = None):
+        """
+        Args:
+            machine_cls: The state machine whose rules apply.
+            states: Entity states by entity id, updated in place.
+            observer: Called as `observer(entity_id, intent, from_state, to_state)`
+                after each successful row.
+        """
+        self.machine_cls = machine_cls
+        self.states = states
+        self.observer = observer
+        self._machine = machine_cls()
+
+    def apply(self, requests: Iterable[Sequence[Any]], offset: int = 0) -> BatchTransitionResult:
+        """
+        Applies every request and returns the columnar result.
+
+        Args:
+            requests: (entity_id, intent) pairs, or (entity_id, intent, target)
+                triples for intents with several possible outcomes.
+            offset: Position of the first request in the overall stream.
+
+        Returns:
+            A BatchTransitionResult. Entities missing from `states` are
+            reported as UNKNOWN_ENTITY.
+        """
+        states = self.states
+        machine = self._machine
+        try_apply = machine.try_apply
+        observer = self.observer
+        entity_ids: List[str] = []
+        new_states: List[Any] = []
+        codes = array("B")
+        failures = array("q")
+        for row in requests:
+            entity_id, intent = row[0], row[1]
+            state = states.get(entity_id)
+            if state is None:
+                code = _UNKNOWN_ENTITY
+            else:
+                machine.current_state = from_state = state
+                code = try_apply(intent, row[2] if len(row) > 2 else None)
+                if code is _OK:
+                    state = machine.current_state
+                    states[entity_id] = state
+                    if observer is not None:
+                        observer(entity_id, intent, from_state, state)
+            if code is not _OK:
+                failures.append(len(codes))
+            entity_ids.append(entity_id)
+            new_states.append(state)
+            codes.append(code)
+        return BatchTransitionResult(offset, entity_ids, new_states, codes, failures)
+
+    def apply_chunks(self, requests: Iterable[Sequence[Any]],
+                     chunk_size: int = 10000) -> Iterator[BatchTransitionResult]:
+        """
+        Applies requests from an iterator of any length, yielding one result per
+        `chunk_size` rows, so memory stays bounded by the chunk size.
+        """
+        iterator = iter(requests)
+        offset = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield self.apply(chunk, offset)
+            offset += len(chunk)
@@ -0,0 +1,127 @@
+from typing import Any, Iterable, List, NamedTuple, Optional, Type
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for bulk transitions
+    np = None
+
+from uhp.state_machines.base import UhpStateMachine
+
+
+class BulkTransitionResult(NamedTuple):
+    """
+    The outcome of applying one intent to a whole state array.
+    """
+    states: "np.ndarray"      # New state codes; rejected rows keep their old code
+    violations: "np.ndarray"  # True where the intent was not allowed
+
+    @property
+    def violation_indices(self) -> "np.ndarray":
+        return np.flatnonzero(self.violations)
+
+
+class BulkTransitionEngine:
+    """
+    Applies intents to arrays of integer-coded states with NumPy.
+
+    States are coded by their position in the machine's `transition_map`. For
+    each intent, the engine precomputes an allowed-mask over state codes and the
+    destination code, so a bulk transition is two vectorized lookups. The rules
+    are those of `_enforce_transition`: a row whose current state does not allow
+    the intent is left unchanged and flagged as a violation, without raising.
+    Batch observers of the machine class are called once per `apply`;
+    per-transition observers are not run, and classes with pre-transition
+    hooks are rejected, since their vetoes cannot be applied row by row.
+    """
+    def __init__(self, machine_cls: Type[UhpStateMachine]):
+        if np is None:
+            raise ImportError("BulkTransitionEngine requires numpy. Install it with 'pip install numpy'.")
+        self.machine_cls = machine_cls
+        self.states: List[Any] = list(machine_cls.transition_map)
+        self._codes = {state: code for code, state in enumerate(self.states)}
+        self.dtype = np.int8 if len(self.states) < 128 else np.int32
+        self._allowed = {}
+        for intent in machine_cls.intent_targets:
+            self._allowed[intent] = np.array(
+                [intent in machine_cls._allowed_actions.get(state, ()) for state in self.states], dtype=bool)
+
+    def encode(self, states: Iterable[Any]) -> "np.ndarray":
+        """
+        Converts states (enum members or their string values) to an array of codes.
+
+        Raises:
+            ValueError: If a state is not part of the machine.
+        """
+        codes = self._codes
+        try:
+            return np.fromiter((codes[state] for state in states), dtype=self.dtype)
+        except KeyError as e:
+            raise ValueError(f"Unknown state {e.args[0]!r} for {self.machine_cls.__name__}.") from None
+
+    def _check_codes(self, codes: "np.ndarray"):
+        # Negative codes would silently wrap around in the lookups below.
+        if codes.size and (codes.min() < 0 or codes.max() >= len(self.states)):
+            bad = codes[(codes < 0) | (codes >= len(self.states))][0]
+            raise ValueError(f"Unknown state code {int(bad)} for {self.machine_cls.__name__}; "
+                             f"codes range from 0 to {len(self.states) - 1}.")
+
+    def decode(self, codes: "np.ndarray") -> List[Any]:
+        """
+        Converts an array of codes back to states.
+
+        Raises:
+            ValueError: If a code is not the code of a state.
+        """
+        self._check_codes(codes)
+        states = self.states
+        return [states[code] for code in codes.tolist()]
+
+    def code(self, state: Any) -> int:
+        """
+        Returns the code of a single state.
+        """
+        return self._codes[state]
+
+    def apply(self, codes: "np.ndarray", intent: Any, target: Optional[Any] = None) -> BulkTransitionResult:
+        """
+        Applies `intent` to every row of `codes`.
+
+        Args:
+            codes: State codes, as returned by `encode`. Not modified.
+            intent: The intent to apply.
+            target: Destination state. Required for intents with several
+                possible outcomes (e.g. GRANTED or DENIED for PROPOSE_CONSENT).
+
+        Returns:
+            A BulkTransitionResult with the new codes and the violation mask.
+
+        Raises:
+            ValueError: If a code is not the code of a state, the intent is
+                unknown, `target` is not one of its outcomes, or it is missing
+                for an intent with several outcomes.
+            TypeError: If the machine class has pre-transition hooks.
+        """
+        if self.machine_cls._pre_hooks:
+            raise TypeError(f"{self.machine_cls.__name__} has pre-transition hooks, which bulk transitions "
+                            f"cannot run. Use BatchTransitioner to apply them row by row.")
+        allowed = self._allowed.get(intent)
+        if allowed is None:
+            raise ValueError(f"Unknown intent {intent!r} for {self.machine_cls.__name__}.")
+        targets = self.machine_cls.intent_targets[intent]
+        if target is None:
+            if len(targets) != 1:
+                raise ValueError(f"{intent!r} has several outcomes; pass the target state.")
+            target = targets[0]
+        elif target not in targets:
+            raise ValueError(f"{target!r} is not an outcome of {intent!r}.")
+        self._check_codes(codes)
+        mask = allowed[codes]
+        new_codes = np.where(mask, self.dtype(self._codes[target]), codes).astype(self.dtype, copy=False)
+        batch_observers = self.machine_cls._batch_observers
+        if batch_observers:
+            indices = np.flatnonzero(mask)
+            if indices.size:
+                from_codes = codes[indices]
+                for observer in batch_observers:
+                    observer(self, intent, indices, from_codes, target)
+        return BulkTransitionResult(states=new_codes, violations=~mask)
@@ -0,0 +1,208 @@
+import keyword
+import re
+from collections import deque
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type
+
+from uhp.state_machines.base import UhpStateMachine
+
+
+def _method_name(intent: Any) -> str:
+    name = re.sub(r"\W", "_", str(getattr(intent, "value", intent)).lower())
+    # Keep names valid identifiers: BREAK becomes `break_`, 2FA becomes `_2fa`.
+    if keyword.iskeyword(name):
+        return name + "_"
+    return name if name.isidentifier() else "_" + name
+
+
+def _identity_test(variable: str, names: List[str]) -> str:
+    return " or ".join(f"{variable} is {name}" for name in names)
+
+
+def _method_source(method_name: str, intent_name: str, state_names: List[str],
+                   target_names: List[str], flag: Optional[str] = None) -> str:
+    """
+    Returns the source of one intent method. The fast path compares the
+    current state (and target) by identity against the constants of the spec;
+    anything else, including a class with hooks or a subclass (which may
+    declare other maps), goes through `apply`, which also produces the error.
+    With `flag`, the method takes a boolean argument of that name choosing
+    between the two targets instead of the target itself.
+    """
+    multi = len(target_names) > 1 and flag is None
+    if flag is not None:
+        signature = f"self, {flag}"
+        target = f"({target_names[0]} if {flag} else {target_names[1]})"
+        fallback = f"self.apply({intent_name}, {target})"
+    else:
+        signature = "self, target" if multi else "self"
+        target = "target" if multi else target_names[0]
+        fallback = f"self.apply({intent_name}, target)" if multi else f"self.apply({intent_name})"
+    lines = [f"def {method_name}({signature}):"]
+    if state_names:
+        conditions = [f"({_identity_test('state', state_names)})"]
+        if multi:
+            conditions.append(f"({_identity_test('target', target_names)})")
+        conditions.append("type(self) is _C and not (self._pre_hooks or self._observers)")
+        lines += [
+            "    state = self.current_state",
+            f"    if {' and '.join(conditions)}:",
+            f"        self.current_state = {target}",
+            "        return",
+        ]
+    lines.append(f"    {fallback}")
+    return "\n".join(lines) + "\n"
+
+
+def _reachable(start: Any, allowed: Dict[Any, FrozenSet[Any]],
+               intent_targets: Dict[Any, Tuple[Any, ...]]) -> FrozenSet[Any]:
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for intent in allowed.get(queue.popleft(), ()):
+            for target in intent_targets.get(intent, ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+    return frozenset(seen)
+
+
+def specialize(cls: Optional[Type[UhpStateMachine]] = None, *, initial_state: Any = None,
+               method_names: Optional[Dict[Any, str]] = None,
+               flag_arguments: Optional[Dict[Any, str]] = None) -> Callable:
+    """
+    Class decorator that generates one method per intent of a state machine,
+    with the transition check inlined as identity comparisons, and
+    precomputes its introspection attributes:
+
+    * `states`: every state of the machine
+    * `terminal_states`: states that allow no action
+    * `reachable_states`: states reachable from the initial state
+    * `reachable_from`: for each state, the states reachable from it
+
+    Methods are named after the intent value in lower case (APPLY_FOR_JOB
+    becomes `apply_for_job`) unless `method_names` says otherwise. Intents
+    with several targets take the target state as an argument, or, when listed
+    in `flag_arguments`, a boolean choosing between their two targets. Methods
+    defined in the class body are kept as they are.
+
+    Args:
+        initial_state: Start state for `reachable_states`. Defaults to the
+            state of an instance built without arguments.
+        method_names: Overrides of the generated method names, by intent.
+        flag_arguments: Argument names, by intent, for intents with exactly
+            two targets: a true value selects the first target, false the second.
+
+    Raises:
+        ValueError: If an intent in `flag_arguments` does not have exactly two targets.
+    """
+    def decorate(cls: Type[UhpStateMachine]) -> Type[UhpStateMachine]:
+        names = dict(method_names or {})
+        flags = dict(flag_arguments or {})
+        constants: Dict[str, Any] = {"_C": cls}
+        constant_names: Dict[int, str] = {}
+
+        def constant(value: Any, prefix: str) -> str:
+            name = constant_names.get(id(value))
+            if name is None:
+                name = f"_{prefix}{len(constants)}"
+                constants[name] = value
+                constant_names[id(value)] = name
+            return name
+
+        allowed = cls._allowed_actions
+        for intent, targets in cls.intent_targets.items():
+            method_name = names.get(intent, _method_name(intent))
+            flag = flags.get(intent)
+            if flag is not None and len(targets) != 2:
+                raise ValueError(f"Intent '{intent}' needs exactly two targets to take the flag '{flag}'.")
+            if method_name in cls.__dict__:
+                continue
+            from_states = [state for state, actions in allowed.items() if intent in actions]
+            source = _method_source(
+                method_name,
+                constant(intent, "I"),
+                [constant(state, "S") for state in from_states],
+                [constant(target, "S") for target in targets],
+                flag,
+            )
+            namespace = dict(constants)
+            exec(compile(source, f"<uhp specialized {cls.__name__}.{method_name}>", "exec"), namespace)
+            method = namespace[method_name]
+            method.__qualname__ = f"{cls.__name__}.{method_name}"
+            method.__module__ = cls.__module__
+            target_names = [str(getattr(t, 'value', t)) for t in targets]
+            method.__doc__ = (f"Applies {getattr(intent, 'value', intent)}: from "
+                              f"{', '.join(str(getattr(s, 'value', s)) for s in from_states) or 'no state'} "
+                              f"to {' or '.join(target_names) if flag is None else f'{target_names[0]} if {flag} is true, else {target_names[1]}'}.")
+            setattr(cls, method_name, method)
+
+        states = list(cls.transition_map)
+        for targets in cls.intent_targets.values():
+            states.extend(target for target in targets if target not in states)
+        start = cls().current_state if initial_state is None else initial_state
+        cls.states = tuple(states)
+        cls.terminal_states = frozenset(state for state in states if not allowed.get(state))
+        cls.reachable_from = {state: _reachable(state, allowed, cls.intent_targets) for state in states}
+        cls.reachable_states = cls.reachable_from.get(start, frozenset({start}))
+        return cls
+
+    return decorate(cls) if cls is not None else decorate
+
+
+def build_state_machine(name: str, transitions: Iterable[Tuple[Any, Any, Any]], initial_state: Any,
+                        states: Iterable[Any] = (), method_names: Optional[Dict[Any, str]] = None,
+                        module: Optional[str] = None) -> Type[UhpStateMachine]:
+    """
+    Builds a specialized state machine class from a declarative spec.
+
+    Args:
+        name: Class name.
+        transitions: (from_state, intent, to_state) triples. An intent listed
+            with several to-states becomes a method taking the target state.
+            An intent must lead to the same to-states from every state that
+            allows it, since a machine keeps one set of targets per intent.
+        initial_state: State of new instances.
+        states: Extra states with no outgoing transitions, such as terminal
+            states only listed as targets. Optional.
+        method_names: Overrides of the generated method names, by intent.
+        module: `__module__` of the class.
+
+    Returns:
+        A UhpStateMachine subclass with generated intent methods and the
+        introspection attributes described in `specialize`.
+
+    Raises:
+        ValueError: If an intent leads to different to-states depending on
+            the state it is applied from.
+    """
+    transition_map: Dict[Any, List[Any]] = {state: [] for state in states}
+    intent_targets: Dict[Any, List[Any]] = {}
+    targets_from: Dict[Tuple[Any, Any], List[Any]] = {}
+    transition_map.setdefault(initial_state, [])
+    for from_state, intent, to_state in transitions:
+        actions = transition_map.setdefault(from_state, [])
+        if intent not in actions:
+            actions.append(intent)
+        for targets in (intent_targets.setdefault(intent, []), targets_from.setdefault((from_state, intent), [])):
+            if to_state not in targets:
+                targets.append(to_state)
+        transition_map.setdefault(to_state, [])
+    for (from_state, intent), targets in targets_from.items():
+        if set(targets) != set(intent_targets[intent]):
+            raise ValueError(
+                f"Intent '{intent}' leads to {sorted(map(str, targets))} from state '{from_state}' "
+                f"but to {sorted(map(str, intent_targets[intent]))} from other states."
+            )
+
+    def __init__(self, current_state: Any = initial_state):
+        self.current_state = current_state
+
+    cls = type(name, (UhpStateMachine,), {
+        "__slots__": (),
+        "__module__": module or __name__,
+        "__doc__": "Specialized state machine generated from a transition spec.",
+        "transition_map": transition_map,
+        "intent_targets": {intent: tuple(targets) for intent, targets in intent_targets.items()},
+        "__init__": __init__,
+    })
+    return specialize(cls, initial_state=initial_state, method_names=method_names)
@@ -0,0 +1,302 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.base import UhpStateMachine
+
+
+def _value(member: Any) -> Any:
+    # Enum members are journaled by value so records round-trip through JSON.
+    return getattr(member, "value", member)
+
+
+class TransitionRecord(NamedTuple):
+    """
+    One applied transition.
+    """
+    sequence: int       # Position in the journal, starting at 1
+    entity_id: str
+    from_state: Any
+    intent: Any
+    to_state: Any
+    timestamp: float    # Seconds since the epoch
+
+
+class Snapshot(NamedTuple):
+    """
+    The state of every entity after the record numbered `sequence`.
+    """
+    sequence: int
+    states: Dict[str, Any]
+    timestamp: float
+
+
+class TransitionJournal(ABC):
+    """
+    An append-only log of state transitions, with periodic snapshots.
+
+    The journal keeps the current state of every entity it has seen, so taking
+    a snapshot does not require replaying the log. Recovery (`replay`) starts
+    from the latest snapshot and applies only the records appended after it.
+    States and intents are stored by value; the state enums are `str`
+    subclasses, so replayed values compare equal to their members.
+    """
+    def __init__(self, snapshot_interval: Optional[int] = None):
+        """
+        Args:
+            snapshot_interval: Take a snapshot automatically every this many
+                records. Snapshots are only taken by `snapshot()` when None.
+        """
+        self.snapshot_interval = snapshot_interval
+        self._lock = threading.Lock()
+        self._states: Dict[str, Any] = {}
+        self._sequence = 0
+        self._snapshot_sequence = 0
+
+    @property
+    def sequence(self) -> int:
+        """
+        The sequence number of the last appended record (0 when empty).
+        """
+        return self._sequence
+
+    def append(self, entity_id: str, from_state: Any, intent: Any, to_state: Any,
+               timestamp: Optional[float] = None) -> TransitionRecord:
+        """
+        Appends a transition and returns its record.
+        """
+        with self._lock:
+            record = TransitionRecord(
+                sequence=self._sequence + 1,
+                entity_id=entity_id,
+                from_state=_value(from_state),
+                intent=_value(intent),
+                to_state=_value(to_state),
+                timestamp=time.time() if timestamp is None else timestamp,
+            )
+            self._write(record)
+            self._sequence = record.sequence
+            self._states[entity_id] = record.to_state
+            if self.snapshot_interval and self._sequence - self._snapshot_sequence >= self.snapshot_interval:
+                self._take_snapshot()
+        return record
+
+    def apply(self, entity_id: str, machine: UhpStateMachine, intent: Any,
+              target: Optional[Any] = None) -> TransitionResult:
+        """
+        Applies `intent` to `machine` with `try_apply` and journals the
+        transition if it succeeded. Rejected transitions are not recorded.
+        """
+        from_state = machine.current_state
+        result = machine.try_apply(intent, target)
+        if result is TransitionResult.OK:
+            self.append(entity_id, from_state, intent, machine.current_state)
+        return result
+
+    def state_of(self, entity_id: str) -> Optional[Any]:
+        """
+        Returns the current journaled state of an entity, or None if it has no records.
+        """
+        return self._states.get(entity_id)
+
+    def states(self) -> Dict[str, Any]:
+        """
+        Returns a copy of the current state of every journaled entity.
+        """
+        with self._lock:
+            return dict(self._states)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Records the current state of every entity as the latest snapshot.
+        """
+        with self._lock:
+            return self._take_snapshot()
+
+    def _take_snapshot(self) -> Snapshot:
+        snapshot = Snapshot(sequence=self._sequence, states=dict(self._states), timestamp=time.time())
+        self._write_snapshot(snapshot)
+        self._snapshot_sequence = snapshot.sequence
+        return snapshot
+
+    def replay(self) -> Dict[str, Any]:
+        """
+        Rebuilds the state of every entity from the latest snapshot and the
+        records appended after it.
+        """
+        snapshot = self.latest_snapshot()
+        states = dict(snapshot.states) if snapshot is not None else {}
+        for record in self.records(after=snapshot.sequence if snapshot is not None else 0):
+            states[record.entity_id] = record.to_state
+        return states
+
+    def history(self, entity_id: str) -> List[TransitionRecord]:
+        """
+        Returns every record of one entity, oldest first. Reads the whole log.
+        """
+        return [record for record in self.records() if record.entity_id == entity_id]
+
+    @abstractmethod
+    def records(self, after: int = 0) -> Iterator[TransitionRecord]:
+        """
+        Yields the records with a sequence number greater than `after`, in order.
+        """
+        pass
+
+    @abstractmethod
+    def latest_snapshot(self) -> Optional[Snapshot]:
+        """
+        Returns the most recent snapshot, or None if none was taken.
+        """
+        pass
+
+    @abstractmethod
+    def _write(self, record: TransitionRecord):
+        pass
+
+    @abstractmethod
+    def _write_snapshot(self, snapshot: Snapshot):
+        pass
+
+
+class InMemoryTransitionJournal(TransitionJournal):
+    """
+    A journal held in process memory, for tests and short-lived workers.
+    """
+    def __init__(self, snapshot_interval: Optional[int] = None):
+        super().__init__(snapshot_interval)
+        self._records: List[TransitionRecord] = []
+        self._snapshot: Optional[Snapshot] = None
+
+    def records(self, after: int = 0) -> Iterator[TransitionRecord]:
+        # Sequence numbers are dense and start at 1, so `after` is a list index.
+        return iter(self._records[after:])
+
+    def latest_snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def _write(self, record: TransitionRecord):
+        self._records.append(record)
+
+    def _write_snapshot(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+
+
+class FileTransitionJournal(TransitionJournal):
+    """
+    A journal stored in a directory as an NDJSON log plus a snapshot file.
+
+    Each record is one JSON array per line in `journal.ndjson`. The latest
+    snapshot is written atomically to `snapshot.json` together with the log
+    offset it covers, so recovery seeks straight to the tail. A partial last
+    line, left by a crash mid-write, is discarded when the journal is opened.
+    """
+    LOG_FILE = "journal.ndjson"
+    SNAPSHOT_FILE = "snapshot.json"
+
+    def __init__(self, directory: str, snapshot_interval: Optional[int] = None, fsync: bool = False):
+        """
+        Args:
+            directory: Directory holding the journal files; created if missing.
+            snapshot_interval: See TransitionJournal.
+            fsync: fsync the log after every record, trading throughput for durability.
+        """
+        super().__init__(snapshot_interval)
+        self.directory = directory
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, self.LOG_FILE)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._snapshot_offset = 0
+        self._snapshot = self._read_snapshot()
+        self._recover()
+        self._log = open(self.log_path, "ab")
+
+    def _read_snapshot(self) -> Optional[Snapshot]:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        self._snapshot_offset = data["offset"]
+        return Snapshot(sequence=data["sequence"], states=data["states"], timestamp=data["timestamp"])
+
+    def _recover(self):
+        snapshot = self._snapshot
+        offset = self._snapshot_offset if snapshot is not None else 0
+        if snapshot is not None:
+            self._states = dict(snapshot.states)
+            self._sequence = self._snapshot_sequence = snapshot.sequence
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                record = TransitionRecord(*json.loads(line))
+                self._states[record.entity_id] = record.to_state
+                self._sequence = record.sequence
+                offset += len(line)
+        if offset < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(offset)
+
+    def records(self, after: int = 0) -> Iterator[TransitionRecord]:
+        if self._log is not None:
+            self._log.flush()
+        snapshot = self._snapshot
+        offset = self._snapshot_offset if snapshot is not None and after >= snapshot.sequence else 0
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                record = TransitionRecord(*json.loads(line))
+                if record.sequence > after:
+                    yield record
+
+    def latest_snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def _write(self, record: TransitionRecord):
+        self._log.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+        if self.fsync:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def _write_snapshot(self, snapshot: Snapshot):
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        offset = self._log.tell()
+        data = {"sequence": snapshot.sequence, "offset": offset,
+                "timestamp": snapshot.timestamp, "states": snapshot.states}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".uhp-snapshot-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._snapshot = snapshot
+        self._snapshot_offset = offset
+
+    def close(self):
+        """
+        Flushes and closes the log file.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __enter__(self) -> "FileTransitionJournal":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,205 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Type
+
+from uhp.enums.transition_result import TransitionResult
+from uhp.state_machines.base import UhpStateMachine
+
+
+class StateStore(ABC):
+    """
+    Persistent storage for the current state of state machine entities.
+
+    States are stored by value. `restore` converts them back to the state
+    members of a machine class and builds the machines in one pass.
+    """
+    @abstractmethod
+    def save_many(self, items: Iterable[Tuple[str, Any]]):
+        """
+        Stores the state of many entities, given as (entity_id, state) pairs.
+        """
+        pass
+
+    @abstractmethod
+    def load_many(self, entity_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Returns the stored states of `entity_ids` (all entities when None).
+        Unknown entities are omitted.
+        """
+        pass
+
+    def flush(self):
+        """
+        Makes buffered writes durable. A no-op for unbuffered stores.
+        """
+        pass
+
+    def close(self):
+        """
+        Flushes and releases the store.
+        """
+        self.flush()
+
+    def save(self, entity_id: str, state: Any):
+        """
+        Stores the state of one entity.
+        """
+        self.save_many(((entity_id, state),))
+
+    def load(self, entity_id: str) -> Optional[Any]:
+        """
+        Returns the stored state of one entity, or None if it is unknown.
+        """
+        return self.load_many((entity_id,)).get(entity_id)
+
+    def apply(self, entity_id: str, machine: UhpStateMachine, intent: Any,
+              target: Optional[Any] = None) -> TransitionResult:
+        """
+        Applies `intent` to `machine` with `try_apply` and stores the new state
+        if the transition succeeded.
+        """
+        result = machine.try_apply(intent, target)
+        if result is TransitionResult.OK:
+            self.save(entity_id, machine.current_state)
+        return result
+
+    def persist(self, machines: Mapping[str, UhpStateMachine]):
+        """
+        Stores the current state of every machine, keyed by entity id.
+        """
+        self.save_many((entity_id, machine.current_state) for entity_id, machine in machines.items())
+
+    def restore(self, machine_cls: Type[UhpStateMachine],
+                entity_ids: Optional[Iterable[str]] = None) -> Dict[str, UhpStateMachine]:
+        """
+        Loads stored states and returns one `machine_cls` instance per entity.
+        """
+        members = {getattr(state, "value", state): state for state in machine_cls.transition_map}
+        return {entity_id: machine_cls(members.get(state, state))
+                for entity_id, state in self.load_many(entity_ids).items()}
+
+    def __enter__(self) -> "StateStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteStateStore(StateStore):
+    """
+    A StateStore in a SQLite database, using only the standard library.
+
+    The database runs in WAL mode with `synchronous=NORMAL`, so readers do not
+    block the writer and a commit does not wait for a checkpoint. Writes are
+    group-committed: `save` buffers the latest state per entity and the buffer
+    is written with a single `executemany` and one commit once it holds
+    `batch_size` entities, once `max_delay` seconds have passed since the
+    oldest buffered write, or on `flush()`/`close()`. Statements are constant
+    strings, so sqlite3's statement cache prepares each of them once.
+    `load_many` reads ids in `IN (...)` chunks of up to 900, below SQLite's
+    default limit on bound parameters; only a final, shorter chunk needs a
+    statement of another length.
+
+    Several stores (for example applications and consents) can share one
+    database file under different namespaces. Reads see buffered writes.
+    """
+    _CREATE = ("CREATE TABLE IF NOT EXISTS uhp_state ("
+               "namespace TEXT NOT NULL, entity_id TEXT NOT NULL, state TEXT NOT NULL, "
+               "updated_at REAL NOT NULL, PRIMARY KEY (namespace, entity_id)) WITHOUT ROWID")
+    _UPSERT = ("INSERT INTO uhp_state (namespace, entity_id, state, updated_at) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT (namespace, entity_id) DO UPDATE SET state = excluded.state, "
+               "updated_at = excluded.updated_at")
+    _SELECT_ONE = "SELECT state FROM uhp_state WHERE namespace = ? AND entity_id = ?"
+    _SELECT_ALL = "SELECT entity_id, state FROM uhp_state WHERE namespace = ?"
+    _SELECT_IN = "SELECT entity_id, state FROM uhp_state WHERE namespace = ? AND entity_id IN ({})"
+    _IN_CHUNK = 900
+
+    def __init__(self, path: str, namespace: str = "default", batch_size: int = 1000,
+                 max_delay: Optional[float] = 0.5):
+        """
+        Args:
+            path: Database file, or ":memory:".
+            namespace: Keeps this store's entities apart from other stores in the same file.
+            batch_size: Buffered entities that trigger a commit.
+            max_delay: Seconds after which buffered writes are committed by the
+                next `save`. None waits for `batch_size` or an explicit `flush()`.
+        """
+        self.path = path
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Any] = {}
+        self._pending_since = 0.0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._CREATE)
+
+    def save_many(self, items: Iterable[Tuple[str, Any]]):
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                self._pending_since = time.monotonic()
+            for entity_id, state in items:
+                pending[entity_id] = getattr(state, "value", state)
+            if len(pending) >= self.batch_size or (
+                    self.max_delay is not None and time.monotonic() - self._pending_since >= self.max_delay):
+                self._commit()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._commit()
+
+    def _commit(self):
+        now = time.time()
+        namespace = self.namespace
+        rows = [(namespace, entity_id, state, now) for entity_id, state in self._pending.items()]
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(self._UPSERT, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._pending = {}
+
+    def load_many(self, entity_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        with self._lock:
+            if entity_ids is None:
+                states = dict(self._conn.execute(self._SELECT_ALL, (self.namespace,)))
+                states.update(self._pending)
+                return states
+            pending = self._pending
+            entity_ids = list(dict.fromkeys(entity_ids))
+            missing = [entity_id for entity_id in entity_ids if entity_id not in pending]
+            stored: Dict[str, Any] = {}
+            if len(missing) == 1:
+                row = self._conn.execute(self._SELECT_ONE, (self.namespace, missing[0])).fetchone()
+                if row is not None:
+                    stored[missing[0]] = row[0]
+            else:
+                chunk = self._IN_CHUNK
+                for start in range(0, len(missing), chunk):
+                    ids = missing[start:start + chunk]
+                    sql = self._SELECT_IN.format(", ".join("?" * len(ids)))
+                    stored.update(self._conn.execute(sql, (self.namespace, *ids)))
+            states = {}
+            for entity_id in entity_ids:
+                if entity_id in pending:
+                    states[entity_id] = pending[entity_id]
+                elif entity_id in stored:
+                    states[entity_id] = stored[entity_id]
+            return states
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
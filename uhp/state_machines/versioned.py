@@ -0,0 +1,209 @@
+import threading
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple, Type
+
+from uhp.enums.transition_result import TransitionResult
+from uhp.errors import StateVersionConflict
+from uhp.state_machines.base import UhpStateMachine
+
+
+class VersionedState(NamedTuple):
+    """
+    An entity's state and the number of times it has changed.
+    """
+    state: Any
+    version: int
+
+
+class _VersionedStates:
+    """
+    Storage and transition rules shared by the thread and asyncio stores.
+    Callers must make `_create`, `_set` and `_transition` exclusive per stripe:
+    each stripe reuses one machine for its transitions.
+    """
+    def __init__(self, machine_cls: Type[UhpStateMachine], stripes: int = 64):
+        self.machine_cls = machine_cls
+        self._machines = [machine_cls() for _ in range(stripes)]
+        self._initial_state = self._machines[0].current_state
+        self._entries: Dict[str, VersionedState] = {}
+        self._stripes = stripes
+
+    def _stripe(self, entity_id: str) -> int:
+        return hash(entity_id) % self._stripes
+
+    def get(self, entity_id: str) -> Optional[VersionedState]:
+        """
+        Returns the entity's current state and version, or None if it is unknown.
+        Reads do not lock: entries are immutable and replaced atomically.
+        """
+        return self._entries.get(entity_id)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def _create(self, entity_id: str, state: Optional[Any]) -> VersionedState:
+        if entity_id in self._entries:
+            raise ValueError(f"Entity '{entity_id}' already exists.")
+        entry = VersionedState(self._initial_state if state is None else state, 0)
+        self._entries[entity_id] = entry
+        return entry
+
+    def _set(self, entity_id: str, expected_version: int, new_state: Any) -> VersionedState:
+        current = self._entries[entity_id]
+        if current.version != expected_version:
+            raise StateVersionConflict(entity_id, expected_version, current.version)
+        entry = VersionedState(new_state, expected_version + 1)
+        self._entries[entity_id] = entry
+        return entry
+
+    def _transition(self, entity_id: str, intent: Any, target: Optional[Any],
+                    expected_version: Optional[int]) -> Tuple[TransitionResult, VersionedState]:
+        current = self._entries[entity_id]
+        if expected_version is not None and current.version != expected_version:
+            return TransitionResult.CONFLICT, current
+        # The machine's own rules, hooks and observers decide the transition.
+        machine = self._machines[self._stripe(entity_id)]
+        machine.current_state = current.state
+        try:
+            result = machine.try_apply(intent, target)
+        except Exception:
+            # A raising observer does not undo the change, as with a plain machine.
+            if machine.current_state != current.state:
+                self._entries[entity_id] = VersionedState(machine.current_state, current.version + 1)
+            raise
+        if result is not TransitionResult.OK:
+            return result, current
+        entry = VersionedState(machine.current_state, current.version + 1)
+        self._entries[entity_id] = entry
+        return TransitionResult.OK, entry
+
+    def _raise_for(self, result: TransitionResult, entity_id: str, intent: Any, target: Optional[Any],
+                   expected_version: Optional[int], current: VersionedState):
+        if result is TransitionResult.CONFLICT:
+            raise StateVersionConflict(entity_id, expected_version, current.version)
+        self.machine_cls(current.state)._raise_for(result, intent, target)
+
+
+class VersionedStateStore(_VersionedStates):
+    """
+    Entity states with optimistic versioning, safe to share between threads.
+
+    Every successful change increments the entity's version. A caller that
+    read version N passes it as `expected_version`; if another worker changed
+    the entity in the meantime, the write fails with StateVersionConflict
+    (or TransitionResult.CONFLICT) instead of overwriting. The read-check-write
+    of a transition runs under one of `stripes` locks chosen by entity id, so
+    writers to different entities rarely contend and reads never lock.
+
+    Transitions run `try_apply` on the stripe's machine, set to the entity's
+    state, so the machine class's pre-transition hooks and observers run,
+    under the entity's lock. The machine is reused by later transitions, so
+    hooks should not keep a reference to it.
+    """
+    def __init__(self, machine_cls: Type[UhpStateMachine], stripes: int = 64):
+        super().__init__(machine_cls, stripes)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def create(self, entity_id: str, state: Optional[Any] = None) -> VersionedState:
+        """
+        Adds an entity at version 0, in `state` or the machine's initial state.
+
+        Raises:
+            ValueError: If the entity already exists.
+        """
+        with self._locks[self._stripe(entity_id)]:
+            return self._create(entity_id, state)
+
+    def compare_and_set(self, entity_id: str, expected_version: int, new_state: Any) -> VersionedState:
+        """
+        Sets the entity's state if it is still at `expected_version`, without
+        checking the transition rules.
+
+        Raises:
+            KeyError: If the entity does not exist.
+            StateVersionConflict: If the entity is at another version.
+        """
+        with self._locks[self._stripe(entity_id)]:
+            return self._set(entity_id, expected_version, new_state)
+
+    def try_apply(self, entity_id: str, intent: Any, target: Optional[Any] = None,
+                  expected_version: Optional[int] = None) -> TransitionResult:
+        """
+        Applies `intent` to the entity without raising.
+
+        Args:
+            entity_id: The entity to change.
+            intent: The intent to apply.
+            target: Destination state, for intents with several possible outcomes.
+            expected_version: Fail with CONFLICT unless the entity is at this
+                version. When None, the transition applies to whatever the
+                current state is.
+
+        Returns:
+            TransitionResult.OK if the state changed, otherwise the reason it did not.
+
+        Raises:
+            KeyError: If the entity does not exist.
+        """
+        with self._locks[self._stripe(entity_id)]:
+            return self._transition(entity_id, intent, target, expected_version)[0]
+
+    def apply(self, entity_id: str, intent: Any, target: Optional[Any] = None,
+              expected_version: Optional[int] = None) -> VersionedState:
+        """
+        Applies `intent` to the entity and returns its new state and version.
+
+        Raises:
+            KeyError: If the entity does not exist.
+            StateVersionConflict: If the entity is not at `expected_version`.
+            InvalidStateTransitionError: If the transition is not allowed.
+        """
+        with self._locks[self._stripe(entity_id)]:
+            result, entry = self._transition(entity_id, intent, target, expected_version)
+        if result is not TransitionResult.OK:
+            self._raise_for(result, entity_id, intent, target, expected_version, entry)
+        return entry
+
+
+class AsyncVersionedStateStore(_VersionedStates):
+    """
+    The asyncio counterpart of VersionedStateStore, with the same semantics.
+
+    It takes no locks: every operation runs to completion on the event loop's
+    thread without awaiting (hooks and observers are synchronous), so no other
+    coroutine can interleave with a read-check-write. Use it from a single
+    event loop; share a VersionedStateStore between threads instead.
+    """
+    async def create(self, entity_id: str, state: Optional[Any] = None) -> VersionedState:
+        """
+        See VersionedStateStore.create.
+        """
+        return self._create(entity_id, state)
+
+    async def compare_and_set(self, entity_id: str, expected_version: int, new_state: Any) -> VersionedState:
+        """
+        See VersionedStateStore.compare_and_set.
+        """
+        return self._set(entity_id, expected_version, new_state)
+
+    async def try_apply(self, entity_id: str, intent: Any, target: Optional[Any] = None,
+                        expected_version: Optional[int] = None) -> TransitionResult:
+        """
+        See VersionedStateStore.try_apply.
+        """
+        return self._transition(entity_id, intent, target, expected_version)[0]
+
+    async def apply(self, entity_id: str, intent: Any, target: Optional[Any] = None,
+                    expected_version: Optional[int] = None) -> VersionedState:
+        """
+        See VersionedStateStore.apply.
+        """
+        result, entry = self._transition(entity_id, intent, target, expected_version)
+        if result is not TransitionResult.OK:
+            self._raise_for(result, entity_id, intent, target, expected_version, entry)
+        return entry